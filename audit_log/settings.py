@@ -8,6 +8,7 @@ _defaults = dict(
     ENABLED=True,
     LOGGED_ENDPOINTS_RE=re.compile(r"^/(v1|gdpr-api)/"),
     REQUEST_AUDIT_LOG_VAR="_audit_logged_object_ids",
+    REQUEST_AUDIT_LOG_OPERATION_VAR="_audit_log_operation",
     LOG_TO_LOGGER_ENABLED=False,
 )
 
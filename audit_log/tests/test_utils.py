@@ -6,6 +6,7 @@ import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
 from freezegun import freeze_time
 from resilient_logger.models import ResilientLogEntry
 from resilient_logger.sources.resilient_log_source_entry import (
@@ -21,6 +22,7 @@ from audit_log.utils import (
     add_audit_logged_object_ids,
     commit_to_audit_log,
     get_response_status,
+    set_audit_log_operation,
 )
 from kerrokantasi.tests.factories import UserFactory
 
@@ -145,6 +147,21 @@ def test_commit_to_audit_log_crud_operations(http_method, audit_operation):
     _assert_basic_log_source_data(log_source)
 
 
+@pytest.mark.django_db
+def test_commit_to_audit_log_operation_set_for_request():
+    request = RequestFactory().post("/v1/endpoint/batch/")
+    request.user = UserFactory()
+    add_audit_logged_object_ids(request, UserFactory())
+    set_audit_log_operation(request, Operation.READ)
+
+    commit_to_audit_log(request, Mock(status_code=200))
+
+    log_source = ResilientLogSourceEntry(ResilientLogEntry.objects.first())
+    assert log_source.get_document()["audit_event"]["operation"] == (
+        Operation.READ.value
+    )
+
+
 @freeze_time("2023-10-17 13:30:00+02:00")
 @pytest.mark.parametrize(
     "user_role,audit_role",
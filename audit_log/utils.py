@@ -51,6 +51,11 @@ def get_response_status(response) -> Optional[str]:
 
 
 def _get_operation_name(request) -> str:
+    operation = vars(request).get(
+        audit_logging_settings.REQUEST_AUDIT_LOG_OPERATION_VAR
+    )
+    if operation:
+        return operation
     return _OPERATION_MAPPING.get(request.method, f"Unknown: {request.method}")
 
 
@@ -145,3 +150,13 @@ def add_audit_logged_object_ids(request, instances):
             audit_logging_settings.REQUEST_AUDIT_LOG_VAR,
             audit_logged_object_ids,
         )
+
+
+def set_audit_log_operation(request, operation: Operation):
+    """Log the request as `operation` instead of the one of its HTTP method."""
+    request = getattr(request, "_request", request)
+    setattr(
+        request,
+        audit_logging_settings.REQUEST_AUDIT_LOG_OPERATION_VAR,
+        operation.value,
+    )
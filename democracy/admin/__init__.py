@@ -30,6 +30,8 @@ from democracy.admin.widgets import Select2SelectMultiple, ShortTextAreaWidget
 from democracy.enums import InitialSectionType
 from democracy.models.utils import copy_hearing
 from democracy.plugins import get_implementation
+from democracy.utils.comment_moderation import moderate_comments
+from democracy.utils.registry import section_types
 
 
 class FixedModelForm(TranslatableModelForm):
@@ -119,7 +121,7 @@ class SectionInline(NestedStackedInline, TranslatableStackedInline):
             kwargs["initial"] = _("Enter text here.")
         if not getattr(obj, "pk", None):
             if db_field.name == "type":
-                kwargs["initial"] = models.SectionType.objects.get(
+                kwargs["initial"] = section_types.get(
                     identifier=InitialSectionType.MAIN
                 )
             elif db_field.name == "content":
@@ -347,6 +349,13 @@ class CommentAdmin(VersionAdmin):
         "section__hearing__slug",
     )
     search_fields = ("section__id", "author_name", "title", "content")
+    actions = [
+        "flag_comments",
+        "unflag_comments",
+        "pin_comments",
+        "unpin_comments",
+        "restore_comments",
+    ]  # delete_selected is built_in, should not be added
     readonly_fields = (
         "reply_to",
         "author_name",
@@ -425,10 +434,37 @@ class CommentAdmin(VersionAdmin):
             )
             return format_html('<a href="{}">{}</a>', user_url, user_info)
 
+    def _moderate(self, request, queryset, operation):
+        changed = moderate_comments(queryset, operation, user=request.user)
+        self.message_user(
+            request,
+            _("%(operation)s: %(count)d comments changed.")
+            % {"operation": operation, "count": len(changed)},
+        )
+
+    @admin.action(description=_("Flag selected comments"))
+    def flag_comments(self, request, queryset):
+        self._moderate(request, queryset, "flag")
+
+    @admin.action(description=_("Unflag selected comments"))
+    def unflag_comments(self, request, queryset):
+        self._moderate(request, queryset, "unflag")
+
+    @admin.action(description=_("Pin selected comments"))
+    def pin_comments(self, request, queryset):
+        self._moderate(request, queryset, "pin")
+
+    @admin.action(description=_("Unpin selected comments"))
+    def unpin_comments(self, request, queryset):
+        self._moderate(request, queryset, "unpin")
+
+    @admin.action(description=_("Restore selected comments"))
+    def restore_comments(self, request, queryset):
+        self._moderate(request, queryset, "restore")
+
     def delete_queryset(self, request, queryset):
         # this method is called by delete_selected and can be overridden
-        for comment in queryset:
-            comment.soft_delete(user=request.user)
+        moderate_comments(queryset, "delete", user=request.user)
 
     def delete_model(self, request, obj):
         # this method is called by the admin form and can be overridden
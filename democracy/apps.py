@@ -5,3 +5,14 @@ from django.utils.translation import gettext_lazy as _
 class DemocracyAppConfig(AppConfig):
     name = "democracy"
     verbose_name = _("Participatory Democracy")
+
+    def ready(self):
+        from democracy.utils.hearing_cards import connect_hearing_card_signals
+        from democracy.utils.registry import connect_registry_signals
+        from democracy.utils.soft_delete import connect_soft_delete_signals
+        from democracy.utils.translations import connect_translation_cache_signals
+
+        connect_translation_cache_signals()
+        connect_registry_signals()
+        connect_hearing_card_signals()
+        connect_soft_delete_signals()
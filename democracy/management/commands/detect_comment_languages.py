@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from democracy.utils.language_detection import (
+    detect_pending_comment_languages,
+    queue_comments_without_language,
+)
+
+
+class Command(BaseCommand):
+    help = "Detect the languages of the comments waiting for language detection"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="First queue all the comments without a language, e.g. the "
+            "ones saved before the detection was run in the background",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of comments to process in one transaction",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and process new comments as they are saved",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait for new comments when the queue is empty with --loop",
+        )
+
+    def handle(self, *args, **options):
+        if options["backfill"]:
+            count = queue_comments_without_language()
+            self.stdout.write("Queued %d comments for language detection." % count)
+
+        total = 0
+        while True:
+            count = detect_pending_comment_languages(options["batch_size"])
+            total += count
+            if count:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write("Detected the languages of %d comments." % total)
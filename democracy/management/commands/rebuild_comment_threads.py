@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from democracy.utils.comment_threads import rebuild_comment_threads
+
+
+class Command(BaseCommand):
+    help = "Rebuild the thread roots, paths and depths of the section comments"
+
+    def handle(self, *args, **options):
+        count = rebuild_comment_threads()
+        self.stdout.write("Updated the thread positions of %d comments." % count)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from democracy.utils.hearing_cards import check_hearing_cards, update_hearing_cards
+
+
+class Command(BaseCommand):
+    help = "Rebuild or check the denormalized hearing cards of the hearing list"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare the cards to the current data and report the "
+            "hearings whose cards are missing or out of date",
+        )
+        parser.add_argument(
+            "--hearing",
+            action="append",
+            dest="hearings",
+            help="ID of a hearing whose card to rebuild, can be given many times",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            self.check_cards()
+            return
+
+        count = update_hearing_cards(options["hearings"])
+        self.stdout.write("Rebuilt %d hearing cards." % count)
+
+    def check_cards(self):
+        result = check_hearing_cards()
+        for problem, hearing_ids in result.items():
+            for hearing_id in hearing_ids:
+                self.stdout.write("%s: %s" % (problem, hearing_id))
+        if any(result.values()):
+            raise CommandError(
+                "%d missing, %d outdated and %d orphaned hearing cards. "
+                "Run rebuild_hearing_cards to fix them."
+                % tuple(len(result[key]) for key in ("missing", "outdated", "orphaned"))
+            )
+        self.stdout.write("The hearing cards are up to date.")
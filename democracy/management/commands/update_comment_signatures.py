@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from democracy.utils.comment_clusters import update_comment_signatures
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the MinHash signatures of the comments saved before the "
+        "signatures were stored"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of comments to update with one query",
+        )
+
+    def handle(self, *args, **options):
+        count = update_comment_signatures(options["batch_size"])
+        self.stdout.write("Updated the signatures of %d comments." % count)
@@ -0,0 +1,95 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0066_alter_contactpersontranslation_title_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HearingCard",
+            fields=[
+                (
+                    "hearing",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="card",
+                        serialize=False,
+                        to="democracy.hearing",
+                        verbose_name="hearing",
+                    ),
+                ),
+                (
+                    "translations",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Translations of the hearing",
+                        verbose_name="translations",
+                    ),
+                ),
+                (
+                    "main_section_id",
+                    models.CharField(
+                        blank=True,
+                        max_length=32,
+                        null=True,
+                        verbose_name="main section ID",
+                    ),
+                ),
+                (
+                    "abstract",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Translations of the abstract of the main section",
+                        verbose_name="abstract",
+                    ),
+                ),
+                (
+                    "main_image",
+                    models.JSONField(
+                        blank=True,
+                        help_text="First public image of the main section",
+                        null=True,
+                        verbose_name="main image",
+                    ),
+                ),
+                ("labels", models.JSONField(default=list, verbose_name="labels")),
+                (
+                    "organization_name",
+                    models.CharField(
+                        blank=True,
+                        max_length=255,
+                        null=True,
+                        verbose_name="organization name",
+                    ),
+                ),
+                (
+                    "project",
+                    models.JSONField(
+                        blank=True,
+                        help_text="Project of the hearing with its phases and "
+                        "their hearings",
+                        null=True,
+                        verbose_name="project",
+                    ),
+                ),
+                (
+                    "default_to_fullscreen",
+                    models.BooleanField(
+                        default=False, verbose_name="default to fullscreen"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="time of update"),
+                ),
+            ],
+            options={
+                "verbose_name": "hearing card",
+                "verbose_name_plural": "hearing cards",
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+# the thread positions of the existing comments, see rebuild_comment_threads
+BUILD_THREADS_SQL = """
+WITH RECURSIVE thread (id, root_id, path, depth) AS (
+    SELECT id, id, lpad(id::text, 10, '0'), 0 FROM democracy_sectioncomment
+    WHERE comment_id IS NULL
+    UNION ALL
+    SELECT reply.id, thread.root_id,
+        thread.path || '/' || lpad(reply.id::text, 10, '0'), thread.depth + 1
+    FROM democracy_sectioncomment reply
+    JOIN thread ON reply.comment_id = thread.id
+)
+UPDATE democracy_sectioncomment target
+SET root_id = thread.root_id, path = thread.path, depth = thread.depth
+FROM thread WHERE target.id = thread.id
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0067_hearingcard"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sectioncomment",
+            name="root",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                help_text="The first comment of the thread the comment is in",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="thread_comments",
+                to="democracy.sectioncomment",
+                verbose_name="root comment",
+            ),
+        ),
+        migrations.AddField(
+            model_name="sectioncomment",
+            name="path",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Zero-padded IDs of the comments from the root comment "
+                "to this one",
+                verbose_name="thread path",
+            ),
+        ),
+        migrations.AddField(
+            model_name="sectioncomment",
+            name="depth",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="thread depth"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sectioncomment",
+            index=models.Index(
+                fields=["path"],
+                name="sectioncomment_path_idx",
+                opclasses=["text_pattern_ops"],
+            ),
+        ),
+        migrations.RunSQL(BUILD_THREADS_SQL, migrations.RunSQL.noop),
+    ]
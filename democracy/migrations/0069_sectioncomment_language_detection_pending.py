@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0068_sectioncomment_thread_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sectioncomment",
+            name="language_detection_pending",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Whether the language of the comment is yet to be "
+                "detected by the detect_comment_languages worker",
+                verbose_name="language detection pending",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sectioncomment",
+            index=models.Index(
+                condition=models.Q(("language_detection_pending", True)),
+                fields=["id"],
+                name="sectioncomment_lang_queue_idx",
+            ),
+        ),
+    ]
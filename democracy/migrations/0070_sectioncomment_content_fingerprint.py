@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0069_sectioncomment_language_detection_pending"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sectioncomment",
+            name="content_fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Hash of the normalized content, plugin data and parent "
+                "of the comment, used to find duplicate comments",
+                max_length=64,
+                verbose_name="content fingerprint",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sectioncomment",
+            index=models.Index(
+                condition=models.Q(("content_fingerprint", ""), _negated=True),
+                fields=["content_fingerprint", "created_at"],
+                name="sectioncomment_fingerprint_idx",
+            ),
+        ),
+    ]
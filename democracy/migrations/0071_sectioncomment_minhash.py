@@ -0,0 +1,45 @@
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0070_sectioncomment_content_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sectioncomment",
+            name="minhash_signature",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.BigIntegerField(),
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="Signature of the content for finding near duplicate "
+                "comments",
+                size=None,
+                verbose_name="MinHash signature",
+            ),
+        ),
+        migrations.AddField(
+            model_name="sectioncomment",
+            name="lsh_buckets",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.BigIntegerField(),
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="Buckets of the comments whose signatures may be similar",
+                size=None,
+                verbose_name="LSH buckets",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sectioncomment",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["lsh_buckets"], name="sectioncomment_lsh_idx"
+            ),
+        ),
+    ]
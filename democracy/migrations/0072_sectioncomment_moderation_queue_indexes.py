@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0071_sectioncomment_minhash"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="sectioncomment",
+            index=models.Index(
+                condition=models.Q(("deleted", False), ("flagged_at__isnull", False)),
+                fields=["created_at", "id"],
+                name="sectioncomment_flagged_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sectioncomment",
+            index=models.Index(
+                condition=models.Q(("deleted", False), ("published", False)),
+                fields=["created_at", "id"],
+                name="sectioncomment_unpublished_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0072_sectioncomment_moderation_queue_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="sectioncomment",
+            index=models.Index(
+                fields=["modified_at", "id"], name="sectioncomment_changes_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+COUNT_REPLIES_SQL = """
+UPDATE democracy_sectioncomment target
+SET n_replies_total = counts.n_replies_total
+FROM (
+    SELECT comment.id, COUNT(reply.id) AS n_replies_total
+    FROM democracy_sectioncomment comment
+    JOIN democracy_sectioncomment reply ON reply.root_id = comment.root_id
+        AND reply.path LIKE comment.path || '/%'
+        AND NOT reply.deleted
+    WHERE comment.path != ''
+    GROUP BY comment.id
+) counts
+WHERE target.id = counts.id
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0073_sectioncomment_changes_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sectioncomment",
+            name="n_replies_total",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="number of replies in the thread below this comment",
+                verbose_name="total reply count",
+            ),
+        ),
+        migrations.RunSQL(COUNT_REPLIES_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+# The fingerprints now include the location and the replied comment. The old
+# fingerprints are cleared, and democracy_remove_dupes fills them again.
+CLEAR_FINGERPRINTS_SQL = """
+UPDATE democracy_sectioncomment
+SET content_fingerprint = ''
+WHERE content_fingerprint != ''
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0074_sectioncomment_n_replies_total"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="sectioncomment",
+            name="content_fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Hash of the normalized content, plugin data, location, "
+                "parent and replied comment of the comment, used to find duplicate "
+                "comments",
+                max_length=64,
+                verbose_name="content fingerprint",
+            ),
+        ),
+        migrations.RunSQL(CLEAR_FINGERPRINTS_SQL, migrations.RunSQL.noop),
+    ]
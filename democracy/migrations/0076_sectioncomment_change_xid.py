@@ -0,0 +1,58 @@
+from django.db import migrations, models
+
+# Every insert and update of a comment stores the ID of the writing transaction,
+# so the changes feed can tell which changes are committed for good
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION democracy_sectioncomment_set_change_xid() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER democracy_sectioncomment_change_xid_insert
+BEFORE INSERT ON democracy_sectioncomment
+FOR EACH ROW EXECUTE FUNCTION democracy_sectioncomment_set_change_xid();
+
+CREATE TRIGGER democracy_sectioncomment_change_xid_update
+BEFORE UPDATE ON democracy_sectioncomment
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION democracy_sectioncomment_set_change_xid();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER democracy_sectioncomment_change_xid_update ON democracy_sectioncomment;
+DROP TRIGGER democracy_sectioncomment_change_xid_insert ON democracy_sectioncomment;
+DROP FUNCTION democracy_sectioncomment_set_change_xid();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("democracy", "0075_sectioncomment_content_fingerprint_reply"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sectioncomment",
+            name="change_xid",
+            field=models.BigIntegerField(
+                default=0,
+                editable=False,
+                help_text="ID of the transaction that last changed the comment, "
+                "set by a database trigger for the changes feed",
+                verbose_name="change transaction ID",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="sectioncomment",
+            name="sectioncomment_changes_idx",
+        ),
+        migrations.AddIndex(
+            model_name="sectioncomment",
+            index=models.Index(
+                fields=["change_xid", "id"], name="sectioncomment_changes_idx"
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+    ]
@@ -1,4 +1,5 @@
 from democracy.models.hearing import Hearing
+from democracy.models.hearing_card import HearingCard
 from democracy.models.label import Label
 from democracy.models.organization import (
     ContactPerson,
@@ -21,6 +22,7 @@ __all__ = [
     "ContactPerson",
     "ContactPersonOrder",
     "Hearing",
+    "HearingCard",
     "Label",
     "Section",
     "SectionComment",
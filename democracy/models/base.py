@@ -3,13 +3,16 @@ from functools import lru_cache
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import ManyToOneRel
+from django.db.models import F, ManyToOneRel
+from django.dispatch import Signal
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.utils.translation import gettext_lazy as _
 from helsinki_gdpr.models import SerializableMixin
+from parler.managers import TranslatableQuerySet
 
 from democracy.enums import Commenting, CommentingMapTools
+from democracy.utils.translations import load_translations
 
 ORDERING_HELP = _(
     "The ordering position for this object. Objects with smaller numbers appear first."
@@ -20,7 +23,87 @@ def generate_id():
     return get_random_string(32)
 
 
+# Sent once after a SoftDeleteQuerySet has soft deleted or undeleted objects,
+# with `changed`, a dict of {model: [IDs of the changed objects]} covering the
+# dependents too, and `deleted`, telling whether the objects were deleted or
+# undeleted. Bulk updates don't send post_save, so the caches and counters
+# kept up to date on save are updated from this signal instead.
+soft_delete_changed = Signal()
+
+
+def _update_soft_deleted(queryset, deleted, values, changed):
+    """
+    Soft delete or undelete the objects and their dependents.
+
+    The dependents are updated before their objects, so that the undeleted
+    dependents can be matched with the deletion times of their objects.
+    """
+    model = queryset.model
+    pks = list(queryset.filter(deleted=not deleted).values_list("pk", flat=True))
+    if not pks:
+        return
+    _update_soft_deleted_dependents(model, pks, deleted, values, changed)
+    model._base_manager.filter(pk__in=pks).update(**values)
+    changed.setdefault(model, []).extend(pks)
+
+
+def _update_soft_deleted_dependents(model, pks, deleted, values, changed):
+    for name in model.soft_delete_dependents:
+        relation = model._meta.get_field(name)
+        field_name = relation.field.name
+        dependents = relation.related_model._base_manager.filter(
+            **{"%s__in" % field_name: pks}
+        )
+        if not deleted:
+            # only the dependents deleted together with their object
+            dependents = dependents.filter(deleted_at=F("%s__deleted_at" % field_name))
+        _update_soft_deleted(dependents, deleted, values, changed)
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    Queryset that soft deletes and undeletes its objects in bulk.
+
+    The objects and the dependents listed in `soft_delete_dependents` of their
+    model are updated with one update per model, and `soft_delete_changed` is
+    sent once for all of them.
+    """
+
+    def soft_delete(self, user=None):
+        """
+        :return: dict of {model: [IDs of the deleted objects]}
+        """
+        if user is not None and not user.pk:
+            user = None
+        values = {"deleted": True, "deleted_at": timezone.now(), "deleted_by": user}
+        return self._update_soft_deleted(True, values)
+
+    def undelete(self):
+        """
+        Undelete the objects and the dependents deleted together with them.
+
+        :return: dict of {model: [IDs of the undeleted objects]}
+        """
+        values = {"deleted": False, "deleted_at": None, "deleted_by": None}
+        return self._update_soft_deleted(False, values)
+
+    def _update_soft_deleted(self, deleted, values):
+        changed = {}
+        _update_soft_deleted(self, deleted, values, changed)
+        if changed:
+            soft_delete_changed.send(
+                sender=self.model, changed=changed, deleted=deleted
+            )
+        return changed
+
+
+class TranslatableSoftDeleteQuerySet(SoftDeleteQuerySet, TranslatableQuerySet):
+    pass
+
+
 class BaseModelManager(models.Manager):
+    _queryset_class = SoftDeleteQuerySet
+
     def get_queryset(self):
         return super().get_queryset().exclude(deleted=True)
 
@@ -42,6 +125,12 @@ class SerializableBaseModelManager(
 ):
     """Add serialization support needed for GDPR API to the base model manager."""
 
+    def serialize(self):
+        # use prefetched objects when there are any and load the translations of
+        # the whole list at once for the `*_with_translations` properties
+        objects = load_translations(list(self.all()))
+        return [obj.serialize() for obj in objects if hasattr(obj, "serialize")]
+
 
 class BaseModel(models.Model):
     created_at = models.DateTimeField(
@@ -97,6 +186,10 @@ class BaseModel(models.Model):
     )
     objects = BaseModelManager()
 
+    # names of the reverse relations whose objects are soft deleted and
+    # undeleted together with the object by SoftDeleteQuerySet
+    soft_delete_dependents = ()
+
     def save(self, *args, **kwargs):
         pk_type = self._meta.pk.get_internal_type()
         if pk_type == "CharField":
@@ -116,14 +209,40 @@ class BaseModel(models.Model):
         self.deleted_at = timezone.now()
         if user is not None and user.pk:
             self.deleted_by = user
+        self._update_soft_deleted_dependents(True)
         self.save(update_fields=("deleted", "deleted_at", "deleted_by"))
 
     def undelete(self):
+        self._update_soft_deleted_dependents(False)
         self.deleted = False
         self.deleted_at = None
         self.deleted_by = None
         self.save(update_fields=("deleted", "deleted_at", "deleted_by"))
 
+    def _update_soft_deleted_dependents(self, deleted):
+        """
+        Soft delete or undelete the dependents of the object in bulk.
+
+        The deleted dependents get the deletion time of the object, so that
+        they are undeleted with it.
+        """
+        if not self.soft_delete_dependents:
+            return
+        if deleted:
+            values = {
+                "deleted": True,
+                "deleted_at": self.deleted_at,
+                "deleted_by": self.deleted_by,
+            }
+        else:
+            values = {"deleted": False, "deleted_at": None, "deleted_by": None}
+        changed = {}
+        _update_soft_deleted_dependents(type(self), [self.pk], deleted, values, changed)
+        if changed:
+            soft_delete_changed.send(
+                sender=type(self), changed=changed, deleted=deleted
+            )
+
     def delete(self, **kwargs):
         raise NotImplementedError("This model does not support hard deletion")
 
@@ -1,5 +1,9 @@
+import hashlib
+import json
+
 from django.conf import settings
 from django.contrib.gis.db import models
+from django.contrib.postgres.fields import ArrayField
 from django.core.exceptions import ValidationError
 from django.db.models.signals import post_save
 from django.utils.translation import gettext_lazy as _
@@ -8,7 +12,40 @@ from langdetect import detect_langs
 from langdetect.lang_detect_exception import LangDetectException
 
 from democracy.models.base import BaseModel
-from democracy.utils.geo import get_geometry_from_geojson
+from democracy.utils.geo import geometry_needs_update, get_geometry_from_geojson
+from democracy.utils.minhash import get_lsh_buckets, get_minhash_signature
+
+
+def get_content_fingerprint(
+    parent_id, content, plugin_data="", reply_to_id=None, geojson=None
+):
+    """
+    Return the fingerprint comments with the same content in the same parent share.
+
+    The content is compared case-insensitively and ignoring differences in
+    whitespace. Replies to different comments and comments on different
+    locations get different fingerprints. Comments without content have no
+    fingerprint.
+
+    :return: hex digest, or an empty string if there is no content
+    """
+    normalized = " ".join((content or "").lower().split())
+    if not normalized:
+        return ""
+    data = "\n".join(
+        (
+            str(parent_id),
+            str(reply_to_id or ""),
+            json.dumps(geojson, sort_keys=True) if geojson else "",
+            plugin_data or "",
+            normalized,
+        )
+    )
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+# the fields the content fingerprint is computed from
+FINGERPRINT_FIELDS = {"content", "plugin_data", "comment", "geojson"}
 
 
 class BaseComment(BaseModel):
@@ -44,6 +81,41 @@ class BaseComment(BaseModel):
     language_code = models.CharField(
         verbose_name=_("language code"), blank=True, max_length=15
     )
+    content_fingerprint = models.CharField(
+        verbose_name=_("content fingerprint"),
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text=_(
+            "Hash of the normalized content, plugin data, location, parent and "
+            "replied comment of the comment, used to find duplicate comments"
+        ),
+    )
+    minhash_signature = ArrayField(
+        models.BigIntegerField(),
+        verbose_name=_("MinHash signature"),
+        default=list,
+        blank=True,
+        editable=False,
+        help_text=_("Signature of the content for finding near duplicate comments"),
+    )
+    lsh_buckets = ArrayField(
+        models.BigIntegerField(),
+        verbose_name=_("LSH buckets"),
+        default=list,
+        blank=True,
+        editable=False,
+        help_text=_("Buckets of the comments whose signatures may be similar"),
+    )
+    language_detection_pending = models.BooleanField(
+        verbose_name=_("language detection pending"),
+        default=False,
+        editable=False,
+        help_text=_(
+            "Whether the language of the comment is yet to be detected by the "
+            "detect_comment_languages worker"
+        ),
+    )
     n_votes = models.IntegerField(
         verbose_name=_("vote count"),
         help_text=_("number of votes given to this comment"),
@@ -115,8 +187,31 @@ class BaseComment(BaseModel):
         ):
             self.organization = self.created_by.admin_organizations.first()
         if not self.language_code and self.content:
-            self._detect_lang()
-        self.geometry = get_geometry_from_geojson(self.geojson)
+            if settings.LANGUAGE_DETECTION_EAGER:
+                self._detect_lang()
+            else:
+                # detected later by the detect_comment_languages worker
+                self.language_detection_pending = True
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or FINGERPRINT_FIELDS & set(update_fields):
+            self.content_fingerprint = get_content_fingerprint(
+                self.parent_id,
+                self.content,
+                self.plugin_data,
+                reply_to_id=getattr(self, "comment_id", None),
+                geojson=self.geojson,
+            )
+            self.minhash_signature = get_minhash_signature(self.content)
+            self.lsh_buckets = get_lsh_buckets(self.minhash_signature)
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "content_fingerprint",
+                    "minhash_signature",
+                    "lsh_buckets",
+                }
+        if geometry_needs_update(update_fields):
+            self.geometry = get_geometry_from_geojson(self.geojson)
         return super(BaseComment, self).save(*args, **kwargs)
 
     def recache_n_votes(self):
@@ -11,23 +11,26 @@ from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from djgeojson.fields import GeoJSONField
 from helsinki_gdpr.models import SerializableMixin
-from parler.managers import TranslatableQuerySet
 from parler.models import TranslatableModel, TranslatedFields
 
 from democracy.enums import InitialSectionType
-from democracy.models.base import SerializableBaseModelManager, StringIdBaseModel
+from democracy.models.base import (
+    SerializableBaseModelManager,
+    StringIdBaseModel,
+    TranslatableSoftDeleteQuerySet,
+)
 from democracy.models.organization import (
     ContactPerson,
     ContactPersonOrder,
     Organization,
 )
 from democracy.models.project import ProjectPhase
-from democracy.utils.geo import get_geometry_from_geojson
+from democracy.utils.geo import geometry_needs_update, get_geometry_from_geojson
 from democracy.utils.hmac_hash import get_hmac_b64_encoded
 from democracy.utils.translations import get_translations_dict
 
 
-class HearingQueryset(TranslatableQuerySet):
+class HearingQueryset(TranslatableSoftDeleteQuerySet):
     def get_by_id_or_slug(self, id_or_slug):
         return self.get(models.Q(pk=id_or_slug) | models.Q(slug=id_or_slug))
 
@@ -204,7 +207,8 @@ class Hearing(StringIdBaseModel, TranslatableModel, SerializableMixin):
             slug_field, self, self.slug, Hearing.original_manager
         )
 
-        self.geometry = get_geometry_from_geojson(self.geojson)
+        if geometry_needs_update(kwargs.get("update_fields")):
+            self.geometry = get_geometry_from_geojson(self.geojson)
 
         super().save(*args, **kwargs)
 
@@ -0,0 +1,67 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from democracy.models.hearing import Hearing
+
+
+class HearingCard(models.Model):
+    """
+    Denormalized read model of a hearing, used to render the hearing list.
+
+    Holds the data the hearing list would otherwise gather from the
+    translations, the main section and its images, the labels, the organization
+    and the project of the hearing. The cards are kept up to date by
+    `democracy.utils.hearing_cards` whenever that data is written and can be
+    rebuilt with the `rebuild_hearing_cards` management command.
+
+    Translations are stored as {language code: {field: value}} dicts, and the
+    related objects as dicts of their field values and translations.
+    """
+
+    hearing = models.OneToOneField(
+        Hearing,
+        verbose_name=_("hearing"),
+        related_name="card",
+        primary_key=True,
+        on_delete=models.CASCADE,
+    )
+    translations = models.JSONField(
+        verbose_name=_("translations"),
+        default=dict,
+        help_text=_("Translations of the hearing"),
+    )
+    main_section_id = models.CharField(
+        verbose_name=_("main section ID"), max_length=32, null=True, blank=True
+    )
+    abstract = models.JSONField(
+        verbose_name=_("abstract"),
+        default=dict,
+        help_text=_("Translations of the abstract of the main section"),
+    )
+    main_image = models.JSONField(
+        verbose_name=_("main image"),
+        null=True,
+        blank=True,
+        help_text=_("First public image of the main section"),
+    )
+    labels = models.JSONField(verbose_name=_("labels"), default=list)
+    organization_name = models.CharField(
+        verbose_name=_("organization name"), max_length=255, null=True, blank=True
+    )
+    project = models.JSONField(
+        verbose_name=_("project"),
+        null=True,
+        blank=True,
+        help_text=_("Project of the hearing with its phases and their hearings"),
+    )
+    default_to_fullscreen = models.BooleanField(
+        verbose_name=_("default to fullscreen"), default=False
+    )
+    updated_at = models.DateTimeField(verbose_name=_("time of update"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("hearing card")
+        verbose_name_plural = _("hearing cards")
+
+    def __str__(self):
+        return str(self.hearing_id)
@@ -1,9 +1,12 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from parler.managers import TranslatableQuerySet
 from parler.models import TranslatableModel, TranslatedFields
 
-from democracy.models.base import BaseModel, BaseModelManager
+from democracy.models.base import (
+    BaseModel,
+    BaseModelManager,
+    TranslatableSoftDeleteQuerySet,
+)
 
 
 class Label(BaseModel, TranslatableModel):
@@ -15,7 +18,7 @@ class Label(BaseModel, TranslatableModel):
             help_text=_("Label for categorizing and filtering hearings"),
         ),
     )
-    objects = BaseModelManager.from_queryset(TranslatableQuerySet)()
+    objects = BaseModelManager.from_queryset(TranslatableSoftDeleteQuerySet)()
 
     class Meta:
         verbose_name = _("label")
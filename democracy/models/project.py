@@ -1,9 +1,13 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from parler.managers import TranslatableQuerySet
 from parler.models import TranslatableModel, TranslatedFields
 
-from democracy.models.base import ORDERING_HELP, BaseModelManager, StringIdBaseModel
+from democracy.models.base import (
+    ORDERING_HELP,
+    BaseModelManager,
+    StringIdBaseModel,
+    TranslatableSoftDeleteQuerySet,
+)
 
 
 class Project(StringIdBaseModel, TranslatableModel):
@@ -30,7 +34,7 @@ class Project(StringIdBaseModel, TranslatableModel):
             help_text=_("Project title for grouping related hearings"),
         ),
     )
-    objects = BaseModelManager.from_queryset(TranslatableQuerySet)()
+    objects = BaseModelManager.from_queryset(TranslatableSoftDeleteQuerySet)()
 
     def __str__(self):
         return self.title or self.pk
@@ -74,7 +78,7 @@ class ProjectPhase(StringIdBaseModel, TranslatableModel):
     ordering = models.IntegerField(
         verbose_name=_("ordering"), default=1, db_index=True, help_text=ORDERING_HELP
     )
-    objects = BaseModelManager.from_queryset(TranslatableQuerySet)()
+    objects = BaseModelManager.from_queryset(TranslatableSoftDeleteQuerySet)()
 
     class Meta:
         ordering = ("ordering",)
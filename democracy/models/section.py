@@ -3,12 +3,14 @@ import re
 
 from autoslug import AutoSlugField
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Substr
 from django.urls import get_resolver
 from django.utils.translation import gettext_lazy as _
 from helsinki_gdpr.models import SerializableMixin
-from parler.managers import TranslatableQuerySet
 from parler.models import TranslatableModel, TranslatedFields
 from reversion import revisions
 
@@ -19,7 +21,9 @@ from democracy.models.base import (
     BaseModelManager,
     Commentable,
     SerializableBaseModelManager,
+    SoftDeleteQuerySet,
     StringIdBaseModel,
+    TranslatableSoftDeleteQuerySet,
 )
 from democracy.models.comment import BaseComment, recache_on_save
 from democracy.models.files import BaseFile
@@ -33,6 +37,7 @@ from democracy.models.poll import (
     poll_option_recache_on_save,
 )
 from democracy.plugins import get_implementation
+from democracy.utils.registry import section_types
 from democracy.utils.translations import get_translations_dict
 
 CLOSURE_INFO_ORDERING = -10000
@@ -44,7 +49,7 @@ INITIAL_SECTION_TYPE_IDS = set(
 logger = logging.getLogger(__name__)
 
 
-class SectionTypeQuerySet(models.QuerySet):
+class SectionTypeQuerySet(SoftDeleteQuerySet):
     def initial(self):
         return self.filter(identifier__in=INITIAL_SECTION_TYPE_IDS)
 
@@ -135,7 +140,10 @@ class Section(Commentable, StringIdBaseModel, TranslatableModel, SerializableMix
         default=False,
         help_text=_("Whether the plugin should be displayed in fullscreen mode"),
     )
-    objects = SerializableBaseModelManager.from_queryset(TranslatableQuerySet)()
+    objects = SerializableBaseModelManager.from_queryset(
+        TranslatableSoftDeleteQuerySet
+    )()
+    soft_delete_dependents = ("images", "files")
 
     class Meta:
         ordering = ["ordering"]
@@ -160,8 +168,9 @@ class Section(Commentable, StringIdBaseModel, TranslatableModel, SerializableMix
     def save(self, *args, **kwargs):
         if self.hearing_id:
             # Closure info should be the first
-            if self.type == SectionType.objects.get(
-                identifier=InitialSectionType.CLOSURE_INFO
+            if (
+                self.type_id
+                == section_types.get(identifier=InitialSectionType.CLOSURE_INFO).pk
             ):
                 self.ordering = CLOSURE_INFO_ORDERING
             elif (
@@ -258,7 +267,9 @@ class SectionImage(
             help_text=_("Alternative text for accessibility and SEO"),
         ),
     )
-    objects = SerializableBaseModelManager.from_queryset(TranslatableQuerySet)()
+    objects = SerializableBaseModelManager.from_queryset(
+        TranslatableSoftDeleteQuerySet
+    )()
 
     class Meta:
         verbose_name = _("section image")
@@ -314,7 +325,9 @@ class SectionFile(
             help_text=_("File caption or description"),
         ),
     )
-    objects = SerializableBaseModelManager.from_queryset(TranslatableQuerySet)()
+    objects = SerializableBaseModelManager.from_queryset(
+        TranslatableSoftDeleteQuerySet
+    )()
 
     class Meta:
         verbose_name = _("section file")
@@ -333,6 +346,43 @@ class SectionFile(
         return get_translations_dict(self, "caption")
 
 
+# format of the comment IDs in the thread paths, fixed width so that the paths
+# sort in thread order and prefixes only match subtrees
+THREAD_PATH_SEGMENT = "%010d"
+
+
+def recache_thread_reply_counts(paths):
+    """
+    Recompute the total reply counts of the comments above the given paths.
+
+    The counts are written with one update, without saving the comments.
+
+    :param paths: thread paths of comments whose replies were added, removed
+                  or moved
+    """
+    ancestor_ids = {
+        int(segment) for path in paths if path for segment in path.split("/")[:-1]
+    }
+    if not ancestor_ids:
+        return
+    # the replies of a comment are the comments whose paths start with its path
+    replies = (
+        SectionComment.objects.filter(
+            root_id=OuterRef("root_id"),
+            path__startswith=Concat(
+                OuterRef("path"), Value("/"), output_field=models.TextField()
+            ),
+        )
+        .order_by()
+        .values("root_id")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    SectionComment.objects.everything().filter(pk__in=ancestor_ids).exclude(
+        path=""
+    ).update(n_replies_total=Coalesce(Subquery(replies), 0))
+
+
 @revisions.register
 @recache_on_save
 class SectionComment(Commentable, BaseComment, SerializableMixin):
@@ -361,6 +411,43 @@ class SectionComment(Commentable, BaseComment, SerializableMixin):
     comment = models.ForeignKey(
         "self", related_name="comments", null=True, on_delete=models.SET_NULL
     )
+    # the position of the comment in its thread of replies, maintained on save
+    root = models.ForeignKey(
+        "self",
+        verbose_name=_("root comment"),
+        related_name="thread_comments",
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        help_text=_("The first comment of the thread the comment is in"),
+    )
+    path = models.TextField(
+        verbose_name=_("thread path"),
+        blank=True,
+        editable=False,
+        help_text=_(
+            "Zero-padded IDs of the comments from the root comment to this one"
+        ),
+    )
+    depth = models.PositiveIntegerField(
+        verbose_name=_("thread depth"), default=0, editable=False
+    )
+    n_replies_total = models.PositiveIntegerField(
+        verbose_name=_("total reply count"),
+        default=0,
+        editable=False,
+        help_text=_("number of replies in the thread below this comment"),
+    )
+    change_xid = models.BigIntegerField(
+        verbose_name=_("change transaction ID"),
+        default=0,
+        editable=False,
+        help_text=_(
+            "ID of the transaction that last changed the comment, set by a "
+            "database trigger for the changes feed"
+        ),
+    )
     title = models.CharField(verbose_name=_("title"), blank=True, max_length=255)
     content = models.TextField(verbose_name=_("content"), blank=True)
     reply_to = models.CharField(verbose_name=_("reply to"), blank=True, max_length=255)
@@ -384,20 +471,49 @@ class SectionComment(Commentable, BaseComment, SerializableMixin):
     )
 
     objects = SerializableBaseModelManager()
+    soft_delete_dependents = ("poll_answers", "images")
 
     class Meta:
         verbose_name = _("section comment")
         verbose_name_plural = _("section comments")
         ordering = ("-created_at",)
-
-    def soft_delete(self, user=None):
-        for answer in self.poll_answers.all():
-            answer.soft_delete(user=user)
-
-        for image in self.images.all():
-            image.soft_delete(user=user)
-
-        super().soft_delete(user=user)
+        indexes = [
+            # for the prefix matches of the subtrees of a thread
+            models.Index(
+                fields=["path"],
+                name="sectioncomment_path_idx",
+                opclasses=["text_pattern_ops"],
+            ),
+            # for finding duplicates, see democracy.utils.comment_duplicates
+            models.Index(
+                fields=["content_fingerprint", "created_at"],
+                name="sectioncomment_fingerprint_idx",
+                condition=~models.Q(content_fingerprint=""),
+            ),
+            # for finding the near duplicates of a comment
+            GinIndex(fields=["lsh_buckets"], name="sectioncomment_lsh_idx"),
+            # for the moderation queue, see democracy.views.moderation
+            models.Index(
+                fields=["created_at", "id"],
+                name="sectioncomment_flagged_idx",
+                condition=models.Q(flagged_at__isnull=False, deleted=False),
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                name="sectioncomment_unpublished_idx",
+                condition=models.Q(published=False, deleted=False),
+            ),
+            # for the queue of the language detection worker
+            models.Index(
+                fields=["id"],
+                name="sectioncomment_lang_queue_idx",
+                condition=models.Q(language_detection_pending=True),
+            ),
+            # for the changes feed, see CommentViewSet.changes
+            models.Index(
+                fields=["change_xid", "id"], name="sectioncomment_changes_idx"
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         # we may create a comment by referring to another comment instead of
@@ -408,17 +524,72 @@ class SectionComment(Commentable, BaseComment, SerializableMixin):
             )
         if not self.section_id:
             self.section_id = self.comment.section_id
-        if self.comment_id and self.section_id != self.comment.section_id:
+        update_fields = kwargs.get("update_fields")
+        # counter updates etc. don't need the original comment to be loaded
+        if (
+            self.comment_id
+            and (
+                update_fields is None
+                or {"comment", "comment_id", "section", "section_id"}
+                & set(update_fields)
+            )
+            and self.section_id != self.comment.section_id
+        ):
             raise Exception(
                 "Comment must belong to the same section as the original comment."
             )
         super().save(*args, **kwargs)
+        if update_fields is None or "comment" in update_fields:
+            self.update_thread_position()
+
+    def update_thread_position(self):
+        """
+        Update the root, path and depth of the comment and its replies.
+
+        The path of the comment is needed for its own path, so it is set with an
+        update after the comment has been inserted.
+        """
+        own_path = THREAD_PATH_SEGMENT % self.pk
+        if self.path:
+            # the path ends with the IDs of the parent and the comment itself
+            segments = self.path.split("/")
+            parent_id = int(segments[-2]) if len(segments) > 1 else None
+            if segments[-1] == own_path and parent_id == self.comment_id:
+                # not moved, no need to load the parent
+                return
+        parent = self.comment
+        if parent is not None and not parent.path:
+            # the thread has not been built yet, see rebuild_comment_threads
+            return
+        if parent is None:
+            root_id, path, depth = self.pk, own_path, 0
+        else:
+            root_id = parent.root_id
+            path = "%s/%s" % (parent.path, own_path)
+            depth = parent.depth + 1
+        if (self.root_id, self.path, self.depth) == (root_id, path, depth):
+            return
+
+        comments = SectionComment.objects.everything()
+        if self.path:
+            # the comment was moved, move its replies along
+            comments.filter(path__startswith=self.path + "/").update(
+                root_id=root_id,
+                path=Concat(Value(path), Substr("path", len(self.path) + 1)),
+                depth=F("depth") + (depth - self.depth),
+            )
+        comments.filter(pk=self.pk).update(root_id=root_id, path=path, depth=depth)
+        old_path = self.path
+        self.root_id, self.path, self.depth = root_id, path, depth
+        # the replies were added to the new thread and removed from the old one
+        recache_thread_reply_counts([old_path, path])
 
     def recache_parent_n_comments(self):
         # comments are now commentable but the reference field is not the parent_field
         # therefore we must also recache original comment n_comments field
         if self.comment_id:
             self.comment.recache_n_comments()
+            recache_thread_reply_counts([self.path])
         # then update the usual section and hearing n_comments fields
         return super().recache_parent_n_comments()
 
@@ -3,7 +3,7 @@ from copy import deepcopy
 from django.db import transaction
 
 from democracy.enums import InitialSectionType
-from democracy.models import SectionType
+from democracy.utils.registry import section_types
 
 
 def _copy_translations(new_obj, old_obj):
@@ -45,7 +45,7 @@ def copy_hearing(old_hearing, **kwargs):
     _copy_translations(new_hearing, old_hearing)
 
     # create new sections, section images and section polls
-    closure_info = SectionType.objects.get(identifier=InitialSectionType.CLOSURE_INFO)
+    closure_info = section_types.get(identifier=InitialSectionType.CLOSURE_INFO)
     for old_section in old_hearing.sections.exclude(type=closure_info):
         old_images = old_section.images.all()
         old_polls = old_section.polls.all()
@@ -1,5 +1,20 @@
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 
 
 class DefaultLimitPagination(LimitOffsetPagination):
     default_limit = 50
+
+
+class ModerationQueuePagination(CursorPagination):
+    """
+    Keyset pagination of the moderation queue, oldest comments first.
+
+    The pages are fetched with `created_at > <last of the previous page>`, so
+    a page costs the same however deep in the queue it is and comments
+    moderated in the meantime don't shift the following pages.
+    """
+
+    ordering = ("created_at", "id")
+    page_size = 50
+    page_size_query_param = "limit"
+    max_page_size = 500
@@ -1,5 +1,7 @@
+from democracy.renderers.fast_json import ORJSONRenderer
 from democracy.renderers.geojson import GeoJSONRenderer
 
 __all__ = [
     "GeoJSONRenderer",
+    "ORJSONRenderer",
 ]
@@ -0,0 +1,36 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding with orjson.
+
+    Produces the same documents as the compact JSONRenderer; only floats in
+    exponent notation are written differently (`1e-7` instead of `1e-07`).
+    Values orjson does not encode the same way, e.g. datetimes and lazy
+    translation strings, are passed to the DRF JSON encoder. Requests for
+    indented or ASCII-only output are rendered by JSONRenderer.
+    """
+
+    orjson_options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        if (
+            data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=self.orjson_options
+        )
+        # JSONRenderer escapes these for compatibility with JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
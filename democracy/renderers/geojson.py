@@ -4,18 +4,24 @@ from rest_framework.renderers import JSONRenderer
 class GeoJSONRenderer(JSONRenderer):
     format = "geojson"
 
+    # size of the encoded chunks yielded by `render_stream`
+    stream_buffer_size = 64 * 1024
+
     def get_paginated_response(self, data):
-        geojson = {
-            "type": "FeatureCollection",
-            "count": data["count"],
-            "next": data["next"],
-            "previous": data["previous"],
-            "features": [],
-        }
+        geojson = self.get_feature_collection(data)
+        geojson["features"] = []
         for item in data["results"]:
             geojson["features"].append(self.geojsonify(item))
         return geojson
 
+    def get_feature_collection(self, pagination=None):
+        geojson = {"type": "FeatureCollection"}
+        if pagination is not None:
+            geojson["count"] = pagination["count"]
+            geojson["next"] = pagination["next"]
+            geojson["previous"] = pagination["previous"]
+        return geojson
+
     def get_single_response(self, data):
         geojson = data.get("geojson")
         if not geojson:
@@ -51,3 +57,51 @@ class GeoJSONRenderer(JSONRenderer):
         return super().render(
             self.geojsonify(data), accepted_media_type, renderer_context
         )
+
+    def render_stream(
+        self,
+        items,
+        to_representation,
+        pagination=None,
+        accepted_media_type=None,
+        renderer_context=None,
+    ):
+        """
+        Render a FeatureCollection incrementally.
+
+        Each item is serialized with `to_representation` and encoded as a
+        feature only when it is reached, so the whole collection never has to
+        be held in memory. Yields the same document `render` would produce for
+        the serialized list or paginated data.
+
+        :param items: iterable of the objects to render as features
+        :param to_representation: callable serializing a single object
+        :param pagination: paginated response data with `count`, `next` and
+                           `previous`, or None for a plain list
+        """
+        header = super().render(
+            self.get_feature_collection(pagination),
+            accepted_media_type,
+            renderer_context,
+        )
+        # open the features array inside the encoded header object
+        yield header[: header.rindex(b"}")] + b',"features":['
+
+        buffer = []
+        buffer_size = 0
+        for index, item in enumerate(items):
+            feature = super().render(
+                self.get_single_response(to_representation(item)),
+                accepted_media_type,
+                renderer_context,
+            )
+            if index:
+                feature = b"," + feature
+            buffer.append(feature)
+            buffer_size += len(feature)
+            if buffer_size >= self.stream_buffer_size:
+                yield b"".join(buffer)
+                buffer = []
+                buffer_size = 0
+        buffer.append(b"]}")
+        yield b"".join(buffer)
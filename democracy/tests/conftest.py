@@ -28,6 +28,7 @@ from democracy.tests.utils import (
     sectionfile_base64_test_data,
     sectionimage_test_json,
 )
+from democracy.utils.registry import REGISTRIES
 from kerrokantasi.tests.conftest import *  # noqa
 
 default_comment_content = "I agree with you sir Lancelot. My favourite colour is blue"
@@ -36,6 +37,13 @@ green_comment_content = "I like green"
 default_lang_code = "en"
 
 
+@pytest.fixture(autouse=True)
+def clear_registries():
+    """Do not serve rows of the previous tests from the model registries."""
+    for registry in REGISTRIES:
+        registry.clear()
+
+
 @pytest.fixture()
 def default_organization():
     return Organization.objects.create(name="The department for squirrel welfare")
@@ -1,7 +1,15 @@
 import pytest
 
 from democracy.factories.hearing import HearingFactory
-from democracy.models import Hearing
+from democracy.factories.poll import SectionPollFactory
+from democracy.models import (
+    Hearing,
+    Section,
+    SectionComment,
+    SectionImage,
+    SectionPollAnswer,
+)
+from democracy.models.base import soft_delete_changed
 
 
 @pytest.mark.django_db
@@ -38,3 +46,49 @@ def test_unpublished():
     ).exists()  # deleted, not in unpub anymore
     assert Hearing.objects.everything(pk=hearing.pk).exists()  # but still in everything
     assert Hearing.objects.deleted(pk=hearing.pk).exists()  # and now also in deleted
+
+
+@pytest.mark.django_db
+def test_queryset_soft_delete_and_undelete(default_hearing):
+    section = default_hearing.sections.first()
+    option = SectionPollFactory(section=section, option_count=2).options.first()
+    comments = [section.comments.create(content="Comment %d" % i) for i in range(3)]
+    answer = SectionPollAnswer.objects.create(comment=comments[0], option=option)
+    n_comments = Section.objects.get(pk=section.pk).n_comments
+    ids = sorted(comment.pk for comment in comments)
+    signals = []
+
+    def receiver(sender, changed, deleted, **kwargs):
+        signals.append((sender, deleted))
+
+    soft_delete_changed.connect(receiver)
+    try:
+        changed = SectionComment.objects.filter(pk__in=ids).soft_delete()
+        assert signals == [(SectionComment, True)]
+        assert sorted(changed[SectionComment]) == ids
+        assert changed[SectionPollAnswer] == [answer.pk]
+        assert Section.objects.get(pk=section.pk).n_comments == n_comments - 3
+        option.refresh_from_db()
+        assert option.n_answers == 0
+
+        SectionComment.objects.deleted(pk__in=ids).undelete()
+        assert signals[-1] == (SectionComment, False)
+        assert SectionComment.objects.filter(pk__in=ids).count() == 3
+        assert SectionPollAnswer.objects.filter(pk=answer.pk).exists()
+        assert Section.objects.get(pk=section.pk).n_comments == n_comments
+        option.refresh_from_db()
+        assert option.n_answers == 1
+    finally:
+        soft_delete_changed.disconnect(receiver)
+
+
+@pytest.mark.django_db
+def test_soft_delete_cascades_to_dependents(default_hearing):
+    section = default_hearing.sections.first()
+    assert SectionImage.objects.filter(section=section).exists()
+
+    section.soft_delete()
+    assert not SectionImage.objects.filter(section=section).exists()
+
+    section.undelete()
+    assert SectionImage.objects.filter(section=section).exists()
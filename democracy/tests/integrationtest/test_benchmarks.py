@@ -0,0 +1,132 @@
+"""
+Benchmarks for the fast read path of the API.
+
+The benchmarks serialize prefetched instances repeatedly, so they measure the
+serialization and rendering overhead rather than the database. The assertions
+only guard against the fast path becoming slower than the regular one. Wall
+clock timings are unreliable on shared runners, so the benchmarks are only
+run on request with `pytest -m benchmark`.
+"""
+
+import timeit
+from unittest import mock
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from democracy.renderers import ORJSONRenderer
+from democracy.views.hearing import HearingViewSet
+from democracy.views.section import SectionViewSet
+from democracy.views.section_comment import SectionCommentViewSet
+from democracy.views.utils import (
+    get_compiled_serializer_class,
+    get_translation_options,
+)
+
+pytestmark = pytest.mark.benchmark
+
+# noise margin for comparing timings on busy test runners
+TOLERANCE = 1.1
+
+
+def _best_time(func):
+    return min(timeit.repeat(func, number=3, repeat=5))
+
+
+def _get_list_view(viewset_class, user, **kwargs):
+    request = Request(APIRequestFactory().get("/"))
+    request.user = user
+    return viewset_class(
+        action="list", request=request, format_kwarg=None, kwargs=kwargs
+    )
+
+
+def _benchmark_serializer(view, instances):
+    serializer_class = view.get_serializer_class()
+    compiled_serializer_class = get_compiled_serializer_class(serializer_class)
+    context = view.get_serializer_context()
+
+    def serialize(serializer_class):
+        return serializer_class(instances, many=True, context=context).data
+
+    assert serialize(compiled_serializer_class) == serialize(serializer_class)
+    original = _best_time(lambda: serialize(serializer_class))
+    compiled = _best_time(lambda: serialize(compiled_serializer_class))
+    assert compiled < original * TOLERANCE, (
+        f"{serializer_class.__name__}: compiled {compiled:.4f}s, "
+        f"original {original:.4f}s"
+    )
+
+
+@pytest.mark.django_db
+def test_benchmark_hearing_list_serializer(default_hearing, admin_user):
+    view = _get_list_view(HearingViewSet, admin_user)
+    hearings = list(view.get_queryset()) * 200
+
+    _benchmark_serializer(view, hearings)
+
+
+@pytest.mark.django_db
+def test_benchmark_hearing_list_translation_options(default_hearing, admin_user):
+    view = _get_list_view(HearingViewSet, admin_user)
+    hearings = list(view.get_queryset()) * 200
+    serializer_class = view.get_serializer_class()
+    context = view.get_serializer_context()
+
+    def serialize():
+        return serializer_class(hearings, many=True, context=context).data
+
+    expected = serialize()
+    cached = _best_time(serialize)
+    # the translation options used to be computed for every serializer instance
+    with mock.patch(
+        "democracy.views.utils.get_translation_options",
+        get_translation_options.__wrapped__,
+    ):
+        assert serialize() == expected
+        uncached = _best_time(serialize)
+    assert cached < uncached * TOLERANCE, (
+        f"cached {cached:.4f}s, computed per instance {uncached:.4f}s"
+    )
+
+
+@pytest.mark.django_db
+def test_benchmark_section_serializer(default_hearing, admin_user):
+    view = _get_list_view(SectionViewSet, admin_user, hearing_pk=default_hearing.pk)
+    sections = list(view.get_queryset()) * 100
+
+    _benchmark_serializer(view, sections)
+
+
+@pytest.mark.django_db
+def test_benchmark_section_comment_serializer(default_hearing, admin_user):
+    section = default_hearing.get_main_section()
+    view = _get_list_view(
+        SectionCommentViewSet,
+        admin_user,
+        hearing_pk=default_hearing.pk,
+        comment_parent_pk=section.pk,
+    )
+    comments = list(view.get_queryset()) * 200
+
+    _benchmark_serializer(view, comments)
+
+
+@pytest.mark.django_db
+def test_benchmark_orjson_renderer(default_hearing, admin_user):
+    section = default_hearing.get_main_section()
+    view = _get_list_view(
+        SectionCommentViewSet,
+        admin_user,
+        hearing_pk=default_hearing.pk,
+        comment_parent_pk=section.pk,
+    )
+    comments = list(view.get_queryset()) * 200
+    data = view.get_serializer(comments, many=True).data
+
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+    original = _best_time(lambda: JSONRenderer().render(data))
+    fast = _best_time(lambda: ORJSONRenderer().render(data))
+    assert fast < original * TOLERANCE, f"orjson {fast:.4f}s, json {original:.4f}s"
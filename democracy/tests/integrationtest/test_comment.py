@@ -1,10 +1,13 @@
 import datetime
+import json
 import urllib
 from copy import deepcopy
 from urllib.parse import urlparse
 
 import pytest
-from django.test.utils import override_settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from django.utils.encoding import force_str as force_text
 from django.utils.timezone import now
@@ -16,7 +19,13 @@ from democracy.enums import Commenting, InitialSectionType
 from democracy.factories.hearing import SectionCommentFactory
 from democracy.factories.poll import SectionPollFactory
 from democracy.models import Hearing, Label, Section, SectionType
-from democracy.models.section import SectionComment, SectionPoll, SectionPollAnswer
+from democracy.models.section import (
+    SectionComment,
+    SectionPoll,
+    SectionPollAnswer,
+    recache_thread_reply_counts,
+)
+from democracy.renderers import GeoJSONRenderer
 from democracy.tests.conftest import default_comment_content, default_lang_code
 from democracy.tests.utils import (
     assert_audit_log_entry,
@@ -384,6 +393,152 @@ def test_226_add_comment_to_section_detect_lang(
     assert data["language_code"] == comment_content[1]
 
 
+@pytest.mark.django_db
+def test_comment_language_detected_in_background(
+    john_doe_api_client, default_hearing, get_comments_url_and_data, settings
+):
+    settings.LANGUAGE_DETECTION_EAGER = False
+    section = default_hearing.sections.first()
+    url, data = get_comments_url_and_data(default_hearing, section)
+    comment_data = get_comment_data(section=section.pk, content="This is a comment")
+
+    data = get_data_from_response(
+        john_doe_api_client.post(url, data=comment_data), status_code=201
+    )
+    assert data["language_code"] == ""
+    comment = SectionComment.objects.get(pk=data["id"])
+    assert comment.language_detection_pending
+
+    call_command("detect_comment_languages")
+    comment.refresh_from_db()
+    assert comment.language_code == "en"
+    assert not comment.language_detection_pending
+
+
+@pytest.mark.django_db
+def test_detect_comment_languages_backfill(default_hearing):
+    section = default_hearing.sections.first()
+    comment = SectionCommentFactory(section=section, content="Tämä on kommentti")
+    undetectable = SectionCommentFactory(section=section, content="10.24")
+    # comments saved before the languages were detected
+    SectionComment.objects.everything().update(language_code="")
+
+    call_command("detect_comment_languages")
+    comment.refresh_from_db()
+    assert comment.language_code == ""
+
+    call_command("detect_comment_languages", "--backfill", "--batch-size", "1")
+    comment.refresh_from_db()
+    undetectable.refresh_from_db()
+    assert comment.language_code == "fi"
+    assert undetectable.language_code == ""
+    assert not SectionComment.objects.filter(language_detection_pending=True).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("action", ["reject", "merge"])
+def test_duplicate_comment_within_window(
+    john_doe_api_client, default_hearing, get_comments_url_and_data, settings, action
+):
+    settings.COMMENT_DUPLICATE_WINDOW = 60
+    settings.COMMENT_DUPLICATE_ACTION = action
+    section = default_hearing.sections.first()
+    url, data = get_comments_url_and_data(default_hearing, section)
+    n_comments = section.comments.count()
+
+    first = get_data_from_response(
+        john_doe_api_client.post(
+            url, data=get_comment_data(section=section.pk, content="Same  thing")
+        ),
+        status_code=201,
+    )
+    response = john_doe_api_client.post(
+        url, data=get_comment_data(section=section.pk, content="same thing ")
+    )
+
+    if action == "reject":
+        data = get_data_from_response(response, status_code=409)
+    else:
+        data = get_data_from_response(response, status_code=200)
+    assert data["id"] == first["id"]
+    assert section.comments.count() == n_comments + 1
+
+    settings.COMMENT_DUPLICATE_WINDOW = 0
+    john_doe_api_client.post(
+        url, data=get_comment_data(section=section.pk, content="same thing")
+    )
+    assert section.comments.count() == n_comments + 2
+
+
+@pytest.mark.django_db
+def test_duplicate_comment_differences(
+    api_client, john_doe_api_client, default_hearing, settings
+):
+    settings.COMMENT_DUPLICATE_WINDOW = 60
+    section = default_hearing.sections.first()
+    url = "/v1/hearing/%s/sections/%s/comments/" % (default_hearing.id, section.id)
+    option = SectionPollFactory(section=section, option_count=2).options.first()
+    n_comments = section.comments.count()
+
+    # anonymous comments are never duplicates
+    for _ in range(2):
+        response = api_client.post(url, data=get_comment_data(content="Anonymous"))
+        get_data_from_response(response, status_code=201)
+
+    # nor are comments with different answers, locations or replied comments
+    data = get_comment_data(content="Same")
+    data["answers"] = [{"question": option.poll_id, "answers": [option.id]}]
+    first = get_data_from_response(
+        john_doe_api_client.post(url, data=data, format="json"), status_code=201
+    )
+    response = john_doe_api_client.post(url, data=data, format="json")
+    assert get_data_from_response(response, status_code=409)["id"] == first["id"]
+    point = {"type": "Point", "coordinates": [24.94, 60.17]}
+    # each comment differs from the one before it in one way only
+    for data in (
+        get_comment_data(content="Same"),
+        get_comment_data(content="Same", geojson=point),
+        get_comment_data(content="Same", geojson=point, comment=first["id"]),
+    ):
+        response = john_doe_api_client.post(url, data=data, format="json")
+        get_data_from_response(response, status_code=201)
+
+    assert section.comments.count() == n_comments + 6
+
+
+@pytest.mark.django_db
+def test_remove_dupes_command(default_hearing, john_doe, jane_doe):
+    section = default_hearing.sections.first()
+    other_section = default_hearing.sections.exclude(pk=section.pk).first()
+    original = SectionCommentFactory(section=section, content="Duplicate")
+    duplicate = SectionCommentFactory(section=section, content=" duplicate")
+    late = SectionCommentFactory(section=section, content="Duplicate")
+    elsewhere = SectionCommentFactory(section=other_section, content="Duplicate")
+    original.voters.add(john_doe)
+    duplicate.voters.add(john_doe, jane_doe)
+    SectionComment.objects.filter(pk=late.pk).update(
+        created_at=original.created_at + datetime.timedelta(hours=2)
+    )
+    # comments saved before the fingerprints
+    SectionComment.objects.everything().update(content_fingerprint="")
+
+    call_command("democracy_remove_dupes", "--dry-run")
+    assert SectionComment.objects.filter(pk=duplicate.pk).exists()
+
+    call_command("democracy_remove_dupes", "--yes-i-know-what-im-doing")
+    remaining = set(
+        SectionComment.objects.filter(
+            pk__in=[original.pk, duplicate.pk, late.pk, elsewhere.pk]
+        ).values_list("pk", flat=True)
+    )
+    assert remaining == {original.pk, late.pk, elsewhere.pk}
+    original.refresh_from_db()
+    assert set(original.voters.all()) == {john_doe, jane_doe}
+    assert original.n_votes == 2
+    section.refresh_from_db()
+    assert section.n_comments == section.comments.count()
+
+
 @pytest.mark.django_db
 def test_56_add_comment_to_section_test_geojson(
     john_doe_api_client, default_hearing, get_comments_url_and_data
@@ -2022,3 +2177,450 @@ def test_comment_ids_are_audit_logged_on_list(
         comments.values_list("pk", flat=True),
         operation=Operation.READ,
     )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("endpoint", ["nested", "root"])
+def test_comment_list_geojson_is_streamed(
+    john_doe_api_client, default_hearing, endpoint
+):
+    section = default_hearing.get_main_section()
+    if endpoint == "nested":
+        url = "/v1/hearing/%s/sections/%s/comments/" % (default_hearing.id, section.id)
+        params = {}
+    else:
+        url = root_list_url
+        params = {"section": section.id}
+    json_data = get_data_from_response(john_doe_api_client.get(url, params))
+
+    response = john_doe_api_client.get(url, dict(params, format="geojson"))
+
+    assert response.streaming
+    geojson_data = get_data_from_response(response)
+    assert geojson_data == json.loads(GeoJSONRenderer().render(json_data))
+    assert {feature["id"] for feature in geojson_data["features"]} == set(
+        section.comments.values_list("pk", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_comment_ids_are_audit_logged_on_streamed_geojson_list(
+    john_doe_api_client, default_hearing, audit_log_configure
+):
+    section = default_hearing.get_main_section()
+    url = "/v1/hearing/%s/sections/%s/comments/" % (default_hearing.id, section.id)
+
+    response = john_doe_api_client.get(url, {"format": "geojson"})
+    get_data_from_response(response)
+
+    assert_audit_log_entry(
+        url,
+        section.comments.values_list("pk", flat=True),
+        operation=Operation.READ,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("endpoint", ["nested", "root"])
+def test_comment_list_sparse_fieldsets(john_doe_api_client, default_hearing, endpoint):
+    section = default_hearing.get_main_section()
+    if endpoint == "nested":
+        url = "/v1/hearing/%s/sections/%s/comments/" % (default_hearing.id, section.id)
+        params = {}
+    else:
+        url = root_list_url
+        params = {"section": section.id}
+
+    data = get_data_from_response(
+        john_doe_api_client.get(url, dict(params, fields="id,content"))
+    )
+    comments = data["results"] if "results" in data else data
+    assert len(comments) == section.comments.count()
+    assert all(set(comment) == {"id", "content"} for comment in comments)
+
+    data = get_data_from_response(
+        john_doe_api_client.get(url, dict(params, omit="answers,can_edit,comments"))
+    )
+    comments = data["results"] if "results" in data else data
+    assert all("answers" not in comment for comment in comments)
+    assert all("can_edit" not in comment for comment in comments)
+    assert all("comments" not in comment for comment in comments)
+    assert all("content" in comment for comment in comments)
+
+
+@pytest.mark.django_db
+def test_comment_retrieve_sparse_fieldsets(john_doe_api_client, default_hearing):
+    comment = default_hearing.get_main_section().comments.first()
+
+    data = get_data_from_response(
+        john_doe_api_client.get(
+            "%s%s/" % (root_list_url, comment.pk), {"fields": "id,n_votes"}
+        )
+    )
+
+    assert data == {"id": comment.pk, "n_votes": comment.n_votes}
+
+
+@pytest.mark.django_db
+def test_comment_list_sparse_fieldsets_skip_prefetches(
+    john_doe_api_client, hearing_with_comments_on_comments
+):
+    url = reverse("comment-list")
+
+    with CaptureQueriesContext(connection) as full_queries:
+        get_data_from_response(john_doe_api_client.get(url))
+    with CaptureQueriesContext(connection) as sparse_queries:
+        get_data_from_response(john_doe_api_client.get(url, {"fields": "id,content"}))
+
+    assert len(sparse_queries) < len(full_queries)
+
+
+@pytest.mark.django_db
+def test_comment_batch(api_client, default_hearing):
+    first, second, unpublished = default_hearing.get_main_section().comments.all()
+    unpublished.published = False
+    unpublished.save()
+    ids = [second.pk, first.pk, unpublished.pk, "nonexistent", "9" * 20]
+
+    data = get_data_from_response(
+        api_client.post(reverse("comment-batch"), {"ids": ids}, format="json")
+    )
+
+    assert [comment["id"] for comment in data["results"]] == [second.pk, first.pk]
+    assert data["missing"] == [str(unpublished.pk), "nonexistent", "9" * 20]
+    # author names are not shown for comments picked from anywhere
+    assert all(comment["author_name"] is None for comment in data["results"])
+
+
+@pytest.mark.django_db
+def test_comment_id_in_filter(api_client, default_hearing):
+    first, second, _ = default_hearing.get_main_section().comments.all()
+
+    data = get_data_from_response(
+        api_client.get(root_list_url, {"id__in": "%s,%s" % (first.pk, second.pk)})
+    )
+
+    assert {comment["id"] for comment in data["results"]} == {first.pk, second.pk}
+
+
+# the changes of a transaction are returned after it has committed
+@pytest.mark.django_db(transaction=True)
+@override_settings(COMMENT_CHANGES_LIMIT=2)
+def test_comment_changes(api_client, john_doe_api_client, default_hearing):
+    first, second, third = default_hearing.get_main_section().comments.order_by(
+        "change_xid", "id"
+    )
+    url = reverse("comment-changes")
+
+    data = get_data_from_response(api_client.get(url))
+    assert [comment["id"] for comment in data["results"]] == [first.pk, second.pk]
+    assert data["more"] is True
+    # author names are not shown for comments picked from anywhere
+    assert all(comment["author_name"] is None for comment in data["results"])
+
+    data = get_data_from_response(api_client.get(url, {"since": data["cursor"]}))
+    assert [comment["id"] for comment in data["results"]] == [third.pk]
+    assert data["more"] is False
+    cursor = data["cursor"]
+
+    data = get_data_from_response(api_client.get(url, {"since": cursor}))
+    assert data == {"results": [], "cursor": cursor, "more": False}
+
+    # votes and deletions are changes too
+    john_doe_api_client.post("/v1/comment/%s/vote/" % first.pk)
+    second.soft_delete()
+    data = get_data_from_response(
+        api_client.get(url, {"since": cursor, "hearing": default_hearing.pk})
+    )
+    assert [comment["id"] for comment in data["results"]] == [first.pk, second.pk]
+    assert data["results"][0]["n_votes"] == 1
+    assert data["results"][1]["deleted"] is True
+    assert data["results"][0]["author_name"] is not None
+    cursor = data["cursor"]
+
+    # a change is held back while an older transaction is still running
+    with transaction.atomic():
+        third.soft_delete()
+        data = get_data_from_response(api_client.get(url, {"since": cursor}))
+        assert data["results"] == []
+    data = get_data_from_response(api_client.get(url, {"since": cursor}))
+    assert [comment["id"] for comment in data["results"]] == [third.pk]
+
+    response = api_client.get(url, {"since": "invalid"})
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def comment_thread(hearing_with_comments_on_comments):
+    section = hearing_with_comments_on_comments.get_main_section()
+    root = section.comments.get(comment__isnull=True)
+    first_reply, second_reply = root.comments.order_by("created_at")
+    nested_reply = first_reply.comments.create(content="Nested reply", section=section)
+    return root, first_reply, second_reply, nested_reply
+
+
+@pytest.mark.django_db
+def test_comment_thread(api_client, comment_thread):
+    root, first_reply, second_reply, nested_reply = comment_thread
+    url = reverse("comment-thread", kwargs={"pk": root.pk})
+
+    data = get_data_from_response(api_client.get(url))
+
+    assert data["id"] == root.pk
+    assert data["depth"] == 0
+    assert [c["id"] for c in data["replies"]] == [first_reply.pk, second_reply.pk]
+    assert [c["id"] for c in data["replies"][0]["replies"]] == [nested_reply.pk]
+    assert data["replies"][0]["replies"][0]["depth"] == 2
+
+    data = get_data_from_response(api_client.get(url, {"flat": "true", "depth": 1}))
+
+    assert [(c["id"], c["depth"]) for c in data] == [
+        (root.pk, 0),
+        (first_reply.pk, 1),
+        (second_reply.pk, 1),
+    ]
+
+
+@pytest.mark.django_db
+def test_comment_thread_without_path(api_client, comment_thread):
+    root, first_reply, second_reply, nested_reply = comment_thread
+    # e.g. a comment written before the thread positions were filled
+    SectionComment.objects.filter(pk=first_reply.pk).update(root=None, path="", depth=0)
+    url = reverse("comment-thread", kwargs={"pk": first_reply.pk})
+
+    data = get_data_from_response(api_client.get(url))
+
+    assert data["id"] == first_reply.pk
+    assert data["depth"] == 0
+    assert data["replies"] == []
+
+
+@pytest.mark.django_db
+def test_comment_thread_leaves_out_unpublished_replies(api_client, comment_thread):
+    root, first_reply, second_reply, nested_reply = comment_thread
+    first_reply.published = False
+    first_reply.save()
+
+    data = get_data_from_response(
+        api_client.get(
+            reverse("comment-thread", kwargs={"pk": root.pk}), {"flat": "true"}
+        )
+    )
+
+    assert [c["id"] for c in data] == [root.pk, second_reply.pk]
+
+
+@pytest.mark.django_db
+def test_comment_list_threaded(api_client, comment_thread):
+    root, first_reply, second_reply, nested_reply = comment_thread
+    url = "/v1/hearing/%s/sections/%s/comments/" % (
+        root.section.hearing_id,
+        root.section_id,
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        data = get_data_from_response(api_client.get(url, {"threaded": "true"}))
+    for _x in range(3):
+        nested_reply = nested_reply.comments.create(
+            content="Nested reply", section=root.section
+        )
+    with CaptureQueriesContext(connection) as deeper_queries:
+        deeper_data = get_data_from_response(
+            api_client.get(url, {"threaded": "true", "flat": "true"})
+        )
+
+    assert [c["id"] for c in data] == [root.pk]
+    assert len(data[0]["replies"]) == 2
+    assert len(deeper_data) == 7
+    assert [c["depth"] for c in deeper_data] == [0, 1, 2, 3, 4, 5, 1]
+    assert len(deeper_queries) == len(queries)
+
+
+@pytest.mark.django_db
+def test_comment_list_threaded_geojson_is_flat(api_client, comment_thread):
+    root = comment_thread[0]
+    url = "/v1/hearing/%s/sections/%s/comments/" % (
+        root.section.hearing_id,
+        root.section_id,
+    )
+
+    data = get_data_from_response(
+        api_client.get(url, {"threaded": "true", "format": "geojson"})
+    )
+
+    assert data["type"] == "FeatureCollection"
+    assert {feature["id"] for feature in data["features"]} == {
+        comment.pk for comment in comment_thread
+    }
+
+
+@pytest.mark.django_db
+def test_comment_thread_positions(comment_thread):
+    root, first_reply, second_reply, nested_reply = comment_thread
+
+    assert (root.root_id, root.depth) == (root.pk, 0)
+    assert (nested_reply.root_id, nested_reply.depth) == (root.pk, 2)
+    assert nested_reply.path == "%010d/%010d/%010d" % (
+        root.pk,
+        first_reply.pk,
+        nested_reply.pk,
+    )
+    thread = SectionComment.objects.filter(root=root).order_by("path")
+    assert list(thread) == [root, first_reply, nested_reply, second_reply]
+
+
+@pytest.mark.django_db
+def test_comment_thread_positions_follow_moved_comment(comment_thread):
+    root, first_reply, second_reply, nested_reply = comment_thread
+
+    first_reply.comment = second_reply
+    first_reply.save()
+
+    nested_reply.refresh_from_db()
+    assert nested_reply.depth == 3
+    assert nested_reply.path.startswith(second_reply.path + "/")
+
+
+@pytest.mark.django_db
+def test_comment_thread_reply_totals(comment_thread):
+    root, first_reply, second_reply, nested_reply = comment_thread
+
+    def reply_totals():
+        return [
+            SectionComment.objects.get(pk=comment.pk).n_replies_total
+            for comment in (root, first_reply, second_reply)
+        ]
+
+    assert reply_totals() == [3, 1, 0]
+
+    # the counts of all the ancestors are written at once, without saving them
+    SectionComment.objects.everything().update(n_replies_total=0)
+    with CaptureQueriesContext(connection) as queries:
+        recache_thread_reply_counts([nested_reply.path])
+    assert len(queries) == 1
+    assert reply_totals() == [3, 1, 0]
+
+    second_reply.comment = first_reply
+    second_reply.save()
+    assert reply_totals() == [3, 2, 0]
+
+    nested_reply.soft_delete()
+    assert reply_totals() == [2, 1, 0]
+
+    SectionComment.objects.filter(pk=second_reply.pk).soft_delete()
+    assert reply_totals() == [1, 0, 0]
+
+    SectionComment.objects.everything().filter(
+        pk__in=[nested_reply.pk, second_reply.pk]
+    ).undelete()
+    assert reply_totals() == [3, 2, 0]
+
+
+@pytest.mark.django_db
+def test_rebuild_comment_threads_command(comment_thread, capsys):
+    root, first_reply, second_reply, nested_reply = comment_thread
+    SectionComment.objects.everything().update(
+        root=None, path="", depth=0, n_replies_total=0
+    )
+
+    call_command("rebuild_comment_threads")
+
+    assert "4 comments" in capsys.readouterr().out
+    nested_reply.refresh_from_db()
+    assert (nested_reply.root_id, nested_reply.depth) == (root.pk, 2)
+    root.refresh_from_db()
+    assert root.n_replies_total == 3
+
+
+@pytest.mark.django_db
+def test_moderation_queue(
+    api_client, john_doe_api_client, john_smith_api_client, default_hearing
+):
+    section = default_hearing.sections.first()
+    flagged = section.comments.create(content="Flagged", flagged_at=now())
+    unpublished = section.comments.create(content="Unpublished", published=False)
+    section.comments.create(content="Fine")
+    deleted = section.comments.create(content="Deleted", flagged_at=now())
+    deleted.soft_delete()
+    url = "/v1/moderation/queue/"
+
+    data = get_data_from_response(john_smith_api_client.get(url))
+    assert [c["id"] for c in data["results"]] == [flagged.pk, unpublished.pk]
+    assert data["results"][0]["flagged"] is True
+    assert data["results"][0]["hearing"] == default_hearing.pk
+
+    flagged_data = get_data_from_response(
+        john_smith_api_client.get(url, {"status": "flagged"})
+    )
+    assert [c["id"] for c in flagged_data["results"]] == [flagged.pk]
+
+    first_page = get_data_from_response(john_smith_api_client.get(url, {"limit": 1}))
+    assert [c["id"] for c in first_page["results"]] == [flagged.pk]
+    second_page = get_data_from_response(john_smith_api_client.get(first_page["next"]))
+    assert [c["id"] for c in second_page["results"]] == [unpublished.pk]
+    assert second_page["next"] is None
+
+    assert get_data_from_response(john_doe_api_client.get(url))["results"] == []
+    assert api_client.get(url).status_code in (401, 403)
+
+
+@pytest.mark.django_db
+def test_moderation_queue_ids_are_audit_logged(
+    john_smith_api_client, default_hearing, audit_log_configure
+):
+    section = default_hearing.sections.first()
+    flagged = section.comments.create(content="Flagged", flagged_at=now())
+    unpublished = section.comments.create(content="Unpublished", published=False)
+    url = "/v1/moderation/queue/"
+
+    john_smith_api_client.get(url)
+
+    assert_audit_log_entry(url, [flagged.pk, unpublished.pk], operation=Operation.READ)
+
+
+@pytest.mark.django_db
+def test_bulk_moderation(john_doe_api_client, john_smith_api_client, default_hearing):
+    section = default_hearing.sections.first()
+    option = SectionPollFactory(section=section, option_count=2).options.first()
+    spam = [section.comments.create(content="Spam %d" % i) for i in range(3)]
+    SectionPollAnswer.objects.create(comment=spam[0], option=option)
+    n_comments = Section.objects.get(pk=section.pk).n_comments
+    url = "/v1/moderation/comments/"
+    ids = [comment.pk for comment in spam]
+
+    response = john_doe_api_client.post(
+        url, {"operation": "delete", "ids": ids}, format="json"
+    )
+    assert get_data_from_response(response)["ids"] == []
+
+    response = john_smith_api_client.post(
+        url, {"operation": "delete", "ids": ids}, format="json"
+    )
+    assert sorted(get_data_from_response(response)["ids"]) == ids
+    assert not SectionComment.objects.filter(pk__in=ids).exists()
+    assert Section.objects.get(pk=section.pk).n_comments == n_comments - 3
+    option.refresh_from_db()
+    assert option.n_answers == 0
+    assert Version.objects.get_for_object(spam[0]).count() == 1
+
+    response = john_smith_api_client.post(
+        url,
+        {"operation": "restore", "filter": {"section": section.pk}},
+        format="json",
+    )
+    assert sorted(get_data_from_response(response)["ids"]) == ids
+    assert Section.objects.get(pk=section.pk).n_comments == n_comments
+    assert SectionPollAnswer.objects.filter(comment=spam[0]).exists()
+    option.refresh_from_db()
+    assert option.n_answers == 1
+
+    response = john_smith_api_client.post(
+        url, {"operation": "flag", "ids": ids[:2]}, format="json"
+    )
+    assert sorted(get_data_from_response(response)["ids"]) == ids[:2]
+    assert SectionComment.objects.filter(flagged_at__isnull=False).count() == 2
+
+    response = john_smith_api_client.post(
+        url, {"operation": "pin", "filter": {}}, format="json"
+    )
+    assert response.status_code == 400
@@ -61,3 +61,31 @@ def test_admin_editing_creates_revision(admin_client, default_hearing):
     versions = Version.objects.get_for_object(comment)
     assert len(versions) == 1
     assert versions[0].field_dict["content"] == expected_content
+
+
+@pytest.mark.django_db
+def test_comment_admin_bulk_actions(admin_client, default_hearing):
+    comments = list(default_hearing.get_main_section().comments.all())
+    ids = [comment.id for comment in comments]
+    url = "/admin/democracy/sectioncomment/?deleted__exact=0"
+
+    response = admin_client.post(
+        url, {"action": "flag_comments", "_selected_action": ids}
+    )
+    assert response.status_code == 302
+    assert SectionComment.objects.filter(
+        id__in=ids, flagged_at__isnull=False
+    ).count() == len(ids)
+
+    response = admin_client.post(
+        url, {"action": "delete_selected", "_selected_action": ids, "post": "yes"}
+    )
+    assert response.status_code == 302
+    assert not SectionComment.objects.filter(id__in=ids).exists()
+
+    response = admin_client.post(
+        "/admin/democracy/sectioncomment/?deleted__exact=1",
+        {"action": "restore_comments", "_selected_action": ids},
+    )
+    assert response.status_code == 302
+    assert SectionComment.objects.filter(id__in=ids).count() == len(ids)
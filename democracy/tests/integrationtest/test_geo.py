@@ -0,0 +1,33 @@
+from unittest import mock
+
+import pytest
+
+from democracy.factories.hearing import SectionCommentFactory
+from democracy.utils import geo
+from democracy.views.utils import GeoJSONField
+
+
+@pytest.mark.django_db
+def test_comment_save_reuses_validated_geometry(default_hearing, geojson_feature):
+    value = GeoJSONField().to_internal_value(geojson_feature)
+    comment = SectionCommentFactory.build(
+        section=default_hearing.sections.first(), geojson=value
+    )
+
+    with mock.patch.object(geo, "GEOSGeometry") as geos_geometry:
+        comment.save()
+    geos_geometry.assert_not_called()
+
+    comment.refresh_from_db()
+    assert comment.geometry.equals(value.geometry)
+
+
+@pytest.mark.django_db
+def test_comment_counter_save_skips_geometry(default_hearing, geojson_feature):
+    comment = SectionCommentFactory(
+        section=default_hearing.sections.first(), geojson=geojson_feature
+    )
+
+    with mock.patch.object(geo, "GEOSGeometry") as geos_geometry:
+        comment.save(update_fields=("n_votes",))
+    geos_geometry.assert_not_called()
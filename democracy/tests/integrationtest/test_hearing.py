@@ -3,13 +3,17 @@ import json
 from copy import deepcopy
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.encoding import force_str as force_text
 from django.utils.timezone import now
 
 from audit_log.enums import Operation
 from democracy.enums import InitialSectionType
+from democracy.factories.hearing import SectionFactory
 from democracy.factories.organization import OrganizationFactory
+from democracy.factories.poll import SectionPollFactory
 from democracy.models import (
     ContactPerson,
     Hearing,
@@ -23,12 +27,15 @@ from democracy.models import (
     SectionType,
 )
 from democracy.models.utils import copy_hearing
+from democracy.renderers import GeoJSONRenderer
 from democracy.tests.conftest import default_lang_code
 from democracy.tests.utils import (
     FILES,
     assert_audit_log_entry,
     assert_common_keys_equal,
     assert_datetime_fuzzy_equal,
+    create_default_files,
+    create_default_images,
     file_to_bytesio,
     get_data_from_response,
     get_hearing_detail_url,
@@ -769,6 +776,226 @@ def test_hearing_geojson_geometry_only(
     assert map_data["results"][0]["geojson"] == geojson_geometry
 
 
+@pytest.mark.django_db
+def test_hearing_list_geojson_is_streamed(api_client, default_hearing, geojson_feature):
+    default_hearing.geojson = geojson_feature
+    default_hearing.save()
+    json_data = get_data_from_response(
+        api_client.get(list_endpoint, {"include": "geojson"})
+    )
+
+    response = api_client.get(list_endpoint, {"format": "geojson"})
+
+    assert response.streaming
+    geojson_data = get_data_from_response(response)
+    assert geojson_data == json.loads(GeoJSONRenderer().render(json_data))
+    assert geojson_data["count"] == 1
+    assert geojson_data["features"][0]["id"] == default_hearing.pk
+    assert_common_keys_equal(
+        geojson_data["features"][0]["geometry"], geojson_feature["geometry"]
+    )
+
+
+@pytest.mark.django_db
+def test_hearing_lang_returns_single_language(api_client, default_hearing):
+    default_hearing.set_current_language("fi")
+    default_hearing.title = "Oletuskuuleminen"
+    default_hearing.save()
+    detail_url = get_hearing_detail_url(default_hearing.id)
+
+    data = get_data_from_response(api_client.get(detail_url, {"lang": "fi"}))
+    assert data["title"] == {"fi": "Oletuskuuleminen"}
+    assert set(data["abstract"]) <= {"fi"}
+
+    data = get_data_from_response(api_client.get(detail_url, {"lang": "sv,en"}))
+    assert data["title"] == {"en": "Default test hearing One"}
+    assert list(data["abstract"]) == ["en"]
+    assert all(set(section["title"]) <= {"en"} for section in data["sections"])
+
+    data = get_data_from_response(api_client.get(list_endpoint, {"lang": "sv"}))
+    assert data["results"][0]["title"] == {}
+
+
+@pytest.mark.django_db
+def test_hearing_lang_must_be_supported(api_client, default_hearing):
+    response = api_client.get(list_endpoint, {"lang": "xx"})
+
+    data = get_data_from_response(response, status_code=400)
+    assert "lang" in data
+
+
+@pytest.mark.django_db
+def test_hearing_sparse_fieldsets(api_client, default_hearing):
+    data = get_data_from_response(api_client.get(list_endpoint, {"fields": "id,title"}))
+    assert data["count"] == 1
+    assert set(data["results"][0]) == {"id", "title"}
+
+    data = get_data_from_response(
+        api_client.get(get_hearing_detail_url(default_hearing.id), {"omit": "sections"})
+    )
+    assert "sections" not in data
+    assert data["id"] == default_hearing.id
+
+
+@pytest.mark.django_db
+def test_hearing_sparse_fieldsets_keep_geojson_fields(
+    api_client, default_hearing, geojson_feature
+):
+    default_hearing.geojson = geojson_feature
+    default_hearing.save()
+
+    data = get_data_from_response(
+        api_client.get(
+            list_endpoint, {"format": "geojson", "fields": "title", "omit": "geojson"}
+        )
+    )
+
+    feature = data["features"][0]
+    assert feature["id"] == default_hearing.pk
+    assert feature["geometry"]
+    assert "title" in feature["properties"]
+    assert "abstract" not in feature["properties"]
+
+
+@pytest.mark.django_db
+def test_hearing_list_sparse_fieldsets_skip_prefetches(api_client, default_hearing):
+    with CaptureQueriesContext(connection) as full_queries:
+        get_data_from_response(api_client.get(list_endpoint))
+    with CaptureQueriesContext(connection) as sparse_queries:
+        get_data_from_response(api_client.get(list_endpoint, {"fields": "id,slug"}))
+
+    assert len(sparse_queries) < len(full_queries)
+
+
+@pytest.mark.django_db
+def test_hearing_batch(api_client, default_hearing, hearing_without_comments):
+    hearing_without_comments.published = False
+    hearing_without_comments.save()
+    ids = [default_hearing.slug, hearing_without_comments.pk, "nonexistent"]
+
+    data = get_data_from_response(
+        api_client.post(reverse("hearing-batch"), {"ids": ids}, format="json")
+    )
+
+    assert [hearing["id"] for hearing in data["results"]] == [default_hearing.pk]
+    assert data["missing"] == ids[1:]
+    expected = get_data_from_response(api_client.get(list_endpoint))["results"][0]
+    assert data["results"][0] == expected
+
+
+@pytest.mark.django_db
+def test_hearing_batch_id_limit(api_client, default_hearing, settings):
+    settings.BATCH_MAX_IDS = 2
+    url = reverse("hearing-batch")
+
+    response = api_client.post(url, {"ids": ["a", "b", "c"]}, format="json")
+    assert response.status_code == 400
+    response = api_client.post(url, {"ids": []}, format="json")
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_hearing_id_in_filter(api_client, default_hearing, hearing_without_comments):
+    data = get_data_from_response(
+        api_client.get(
+            list_endpoint, {"id__in": "%s,nonexistent" % default_hearing.slug}
+        )
+    )
+
+    assert [hearing["id"] for hearing in data["results"]] == [default_hearing.pk]
+
+
+@pytest.mark.django_db
+def test_hearing_detail_include(
+    john_doe_api_client, john_doe, default_hearing, settings
+):
+    settings.HEARING_INCLUDE_COMMENT_LIMIT = 2
+    main_section = default_hearing.get_main_section()
+    voted_comment = main_section.comments.first()
+    voted_comment.voters.add(john_doe)
+    default_hearing.followers.add(john_doe)
+
+    data = get_data_from_response(
+        john_doe_api_client.get(
+            get_hearing_detail_url(default_hearing.id),
+            {
+                "include": "sections.comments,contact_persons,user_state",
+                "fields": "id",
+            },
+        )
+    )
+
+    assert set(data) == {"id", "contact_persons", "sections", "included"}
+    section_comments = data["included"]["section_comments"]
+    assert set(section_comments) == {section["id"] for section in data["sections"]}
+    page = section_comments[main_section.pk]
+    assert page["count"] == 3
+    assert len(page["results"]) == 2
+    assert "offset=2" in page["next"]
+    assert data["included"]["user_state"] == {
+        "followed": True,
+        "voted_section_comments": [voted_comment.pk],
+        "answered_questions": [],
+    }
+
+
+@pytest.mark.django_db
+def test_hearing_detail_include_comments_query_count(api_client, default_hearing):
+    url = get_hearing_detail_url(default_hearing.id)
+    params = {"include": "sections.comments"}
+
+    with CaptureQueriesContext(connection) as small_queries:
+        get_data_from_response(api_client.get(url, params))
+    for _x in range(3):
+        SectionFactory(
+            hearing=default_hearing,
+            type=SectionType.objects.get(identifier=InitialSectionType.SCENARIO),
+        )
+    with CaptureQueriesContext(connection) as large_queries:
+        data = get_data_from_response(api_client.get(url, params))
+
+    assert len(data["included"]["section_comments"]) == 6
+    assert len(large_queries) == len(small_queries)
+
+
+@pytest.mark.django_db
+def test_hearing_detail_query_count_does_not_grow(api_client, default_hearing):
+    url = get_hearing_detail_url(default_hearing.id)
+    SectionPollFactory(section=default_hearing.get_main_section())
+
+    with CaptureQueriesContext(connection) as small_queries:
+        small_data = get_data_from_response(api_client.get(url))
+
+    for section in default_hearing.sections.all():
+        SectionPollFactory(section=section, option_count=4)
+    for _x in range(3):
+        section = SectionFactory(
+            hearing=default_hearing,
+            type=SectionType.objects.get(identifier=InitialSectionType.SCENARIO),
+            create_random_comments=False,
+        )
+        SectionPollFactory(section=section)
+        create_default_images(section)
+        create_default_files(section)
+
+    with CaptureQueriesContext(connection) as large_queries:
+        large_data = get_data_from_response(api_client.get(url))
+
+    assert len(large_data["sections"]) == len(small_data["sections"]) + 3
+    assert large_data["main_image"] == small_data["main_image"]
+    assert large_data["abstract"] == small_data["abstract"]
+    assert len(small_queries) == len(large_queries), (
+        f"Query count grew from {len(small_queries)} to {len(large_queries)}."
+    )
+    # the main section is picked from the sections of the hearing
+    section_queries = [
+        query
+        for query in large_queries.captured_queries
+        if 'FROM "democracy_section"' in query["sql"]
+    ]
+    assert len(section_queries) == 1
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "geometry_fixture_name",
@@ -2370,3 +2597,50 @@ def test_hearing_id_is_audit_logged_on_delete(
     assert_audit_log_entry(
         detail_url, [data["id"]], count=2, operation=Operation.DELETE
     )
+
+
+@pytest.mark.django_db
+def test_hearing_comment_clusters(
+    john_smith_api_client, john_doe_api_client, default_hearing
+):
+    sections = list(default_hearing.sections.all())
+    campaign = "Please keep the park as it is, the old trees are important to us all"
+    copies = [
+        sections[0].comments.create(content=campaign),
+        sections[1].comments.create(content=campaign.upper() + "!"),
+        sections[0].comments.create(content=campaign + " and the kids"),
+    ]
+    other = sections[0].comments.create(content="Build the new library downtown")
+    url = reverse("hearing-comment-clusters", kwargs={"pk": default_hearing.pk})
+    assert url == "/v1/hearing/%s/comments/clusters/" % default_hearing.pk
+
+    get_data_from_response(john_doe_api_client.get(url), status_code=403)
+    data = get_data_from_response(john_smith_api_client.get(url))
+
+    clusters = [
+        [comment["id"] for comment in cluster["comments"]]
+        for cluster in data["clusters"]
+    ]
+    cluster_ids = [comment.pk for comment in copies]
+    assert cluster_ids in clusters
+    assert not any(other.pk in cluster for cluster in clusters)
+
+    data = get_data_from_response(
+        john_smith_api_client.get(url, {"comment": copies[1].pk})
+    )
+    assert [c["id"] for c in data["clusters"][0]["comments"]] == cluster_ids
+    data = get_data_from_response(john_smith_api_client.get(url, {"comment": other.pk}))
+    assert data["clusters"] == []
+
+
+@pytest.mark.django_db
+def test_comment_signature_updated_with_content(default_hearing):
+    section = default_hearing.sections.first()
+    comment = section.comments.create(content="The first version of the text")
+    buckets = comment.lsh_buckets
+
+    comment.content = "Something else entirely, written again"
+    comment.save(update_fields=["content"])
+    comment.refresh_from_db()
+
+    assert comment.lsh_buckets and comment.lsh_buckets != buckets
@@ -0,0 +1,131 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from democracy.models import Hearing, HearingCard
+from democracy.tests.utils import get_data_from_response
+from democracy.utils.hearing_cards import check_hearing_cards, update_hearing_cards
+
+list_endpoint = reverse("hearing-list")
+
+
+@pytest.fixture
+def hearing_with_card(default_hearing, default_label, settings):
+    default_hearing.labels.add(default_label)
+    settings.HEARING_CARDS = True
+    update_hearing_cards()
+    return default_hearing
+
+
+def _get_list(client, settings, use_cards, params=None):
+    settings.HEARING_CARDS = use_cards
+    return get_data_from_response(client.get(list_endpoint, params or {}))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{}, {"lang": "fi,en"}, {"include": "geojson"}])
+def test_hearing_list_from_cards_matches_database(
+    api_client, john_doe_api_client, hearing_with_card, settings, params
+):
+    for client in (api_client, john_doe_api_client):
+        expected = _get_list(client, settings, False, params)
+        data = _get_list(client, settings, True, params)
+
+        assert data == expected
+        assert data["results"][0]["labels"]
+        assert data["results"][0]["main_image"]
+        assert data["results"][0]["project"]["phases"]
+
+
+@pytest.mark.django_db
+def test_hearing_list_from_cards_lists_visible_phase_hearings(
+    api_client, john_smith_api_client, hearing_with_card, settings
+):
+    Hearing.objects.create(
+        title="Unpublished hearing in the same phase",
+        slug="unpublished-phase-hearing",
+        published=False,
+        organization=hearing_with_card.organization,
+        project_phase=hearing_with_card.project_phase,
+    )
+    update_hearing_cards()
+
+    for client, n_phase_hearings in ((api_client, 1), (john_smith_api_client, 2)):
+        expected = _get_list(client, settings, False)
+        data = _get_list(client, settings, True)
+
+        assert data == expected
+        phase = next(
+            phase
+            for phase in data["results"][-1]["project"]["phases"]
+            if phase["id"] == hearing_with_card.project_phase_id
+        )
+        assert len(phase["hearings"]) == n_phase_hearings
+
+
+@pytest.mark.django_db
+def test_hearing_list_from_cards_does_not_query_related_data(
+    api_client, hearing_with_card
+):
+    with CaptureQueriesContext(connection) as queries:
+        get_data_from_response(api_client.get(list_endpoint))
+
+    related_tables = ("section", "label", "project", "organization")
+    related_queries = [
+        query["sql"]
+        for query in queries.captured_queries
+        if "_translation" in query["sql"]
+        or any('"democracy_%s' % table in query["sql"] for table in related_tables)
+    ]
+    assert related_queries == []
+
+
+@pytest.mark.django_db
+def test_hearing_cards_are_updated_on_write(
+    hearing_with_card, default_label, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        hearing_with_card.title = "Updated title"
+        hearing_with_card.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        default_label.label = "Updated label"
+        default_label.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        image = hearing_with_card.get_main_section().images.first()
+        image.soft_delete()
+
+    card = HearingCard.objects.get(pk=hearing_with_card.pk)
+    assert card.translations["en"]["title"] == "Updated title"
+    assert card.labels[0]["translations"]["en"]["label"] == "Updated label"
+    assert card.main_image["id"] != image.pk
+    assert check_hearing_cards() == {"missing": [], "outdated": [], "orphaned": []}
+
+
+@pytest.mark.django_db
+def test_hearing_cards_are_removed_with_hearing(
+    hearing_with_card, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        hearing_with_card.soft_delete()
+
+    assert not HearingCard.objects.filter(pk=hearing_with_card.pk).exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_hearing_cards_command(default_hearing, capsys):
+    with pytest.raises(CommandError):
+        call_command("rebuild_hearing_cards", "--check")
+    assert "missing: %s" % default_hearing.pk in capsys.readouterr().out
+
+    call_command("rebuild_hearing_cards")
+    call_command("rebuild_hearing_cards", "--check")
+
+    # a write the cards were not updated for
+    default_hearing.slug = "changed-slug"
+    default_hearing.save()
+    with pytest.raises(CommandError):
+        call_command("rebuild_hearing_cards", "--check")
+    assert "outdated: %s" % default_hearing.pk in capsys.readouterr().out
@@ -1,10 +1,14 @@
 import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from audit_log.enums import Operation
 from democracy.models import Label
 from democracy.tests.conftest import default_lang_code
 from democracy.tests.utils import assert_audit_log_entry, get_data_from_response
+from democracy.utils.translations import _get_translation_cache_key
 
 
 @pytest.fixture
@@ -28,6 +32,20 @@ def test_get_label_list_check_fields(api_client, random_label):
     assert label_data["label"][default_lang_code] == random_label.label
 
 
+@pytest.mark.django_db
+def test_get_label_list_in_one_language(api_client, random_label):
+    other_lang_code = "fi" if default_lang_code != "fi" else "sv"
+    url = reverse("label-list")
+
+    data = get_data_from_response(
+        api_client.get(url, {"lang": "%s,%s" % (other_lang_code, default_lang_code)})
+    )
+    assert data["results"][0]["label"] == {default_lang_code: random_label.label}
+
+    data = get_data_from_response(api_client.get(url, {"lang": other_lang_code}))
+    assert data["results"][0]["label"] == {}
+
+
 @pytest.mark.django_db
 def test_cannot_post_label_without_authentication(api_client, valid_label_json):
     response = api_client.post(
@@ -88,3 +106,72 @@ def test_label_id_is_audit_logged_on_create(
     data = get_data_from_response(response, status_code=201)
 
     assert_audit_log_entry(url, [data["id"]], operation=Operation.CREATE)
+
+
+@pytest.fixture
+def cached_label_translations(settings):
+    settings.TRANSLATION_CACHE_MODELS = ["democracy.Label"]
+    caches[settings.TRANSLATION_CACHE_ALIAS].clear()
+    yield
+    caches[settings.TRANSLATION_CACHE_ALIAS].clear()
+
+
+def _count_translation_queries(queries):
+    table = Label._parler_meta.root_model._meta.db_table
+    return sum(table in query["sql"] for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_label_translations_are_cached(
+    api_client, random_label, cached_label_translations
+):
+    url = reverse("label-list")
+    expected = get_data_from_response(api_client.get(url))
+
+    with CaptureQueriesContext(connection) as queries:
+        data = get_data_from_response(api_client.get(url))
+
+    assert data == expected
+    assert _count_translation_queries(queries) == 0
+
+
+@pytest.mark.django_db
+def test_cached_label_translations_are_invalidated_on_save(
+    api_client, random_label, cached_label_translations
+):
+    url = reverse("label-detail", kwargs={"pk": random_label.pk})
+    get_data_from_response(api_client.get(url))
+
+    label = Label.objects.get(pk=random_label.pk)
+    label.set_current_language(default_lang_code)
+    label.label = "Updated label"
+    label.save()
+
+    data = get_data_from_response(api_client.get(url))
+    assert data["label"][default_lang_code] == "Updated label"
+
+
+@pytest.mark.django_db
+def test_cached_label_translations_are_invalidated_on_commit(
+    api_client,
+    random_label,
+    cached_label_translations,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("label-detail", kwargs={"pk": random_label.pk})
+    get_data_from_response(api_client.get(url))
+    cache = caches[settings.TRANSLATION_CACHE_ALIAS]
+    key = _get_translation_cache_key(Label, random_label.pk)
+    old_rows = cache.get(key)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        label = Label.objects.get(pk=random_label.pk)
+        label.set_current_language(default_lang_code)
+        label.label = "Updated label"
+        label.save()
+        # a concurrent request caches the committed rows before the commit
+        cache.set(key, old_rows)
+
+    data = get_data_from_response(api_client.get(url))
+    assert data["label"][default_lang_code] == "Updated label"
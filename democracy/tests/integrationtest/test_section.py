@@ -1,6 +1,8 @@
 import datetime
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.encoding import force_str as force_text
 from django.utils.timezone import now
 
@@ -444,3 +446,40 @@ def test_hearing_visibility(john_smith_api_client, default_hearing):
     response = john_smith_api_client.get("/v1/section/")
     response_data = get_results_from_response(response)
     assert len(response_data) > 1
+
+
+def _with_query(url, query):
+    return "%s%s%s" % (url, "&" if "?" in url else "?", query)
+
+
+@pytest.mark.django_db
+def test_section_list_sparse_fieldsets(api_client, default_hearing, get_sections_url):
+    url = get_sections_url(default_hearing)
+
+    sections = get_results_from_response(
+        api_client.get(_with_query(url, "fields=id,title"))
+    )
+    assert sections
+    assert all(set(section) == {"id", "title"} for section in sections)
+
+    sections = get_results_from_response(
+        api_client.get(_with_query(url, "omit=images,questions"))
+    )
+    assert sections
+    assert all("images" not in section for section in sections)
+    assert all("questions" not in section for section in sections)
+    assert all("files" in section for section in sections)
+
+
+@pytest.mark.django_db
+def test_section_list_sparse_fieldsets_skip_prefetches(
+    api_client, default_hearing, get_sections_url
+):
+    url = get_sections_url(default_hearing)
+
+    with CaptureQueriesContext(connection) as full_queries:
+        get_data_from_response(api_client.get(url))
+    with CaptureQueriesContext(connection) as sparse_queries:
+        get_data_from_response(api_client.get(_with_query(url, "fields=id")))
+
+    assert len(sparse_queries) < len(full_queries)
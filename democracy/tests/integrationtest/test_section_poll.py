@@ -3,13 +3,16 @@ from copy import deepcopy
 from sys import platform
 
 import pytest
+from django.conf import settings
+from django.core.cache import caches
 from django.db import connection
 from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from democracy.enums import Commenting
+from democracy.factories.hearing import HearingFactory, SectionCommentFactory
 from democracy.factories.poll import SectionPollFactory
-from democracy.models import SectionPoll
+from democracy.models import SectionPoll, SectionPollAnswer
 from democracy.tests.integrationtest.test_comment import get_comment_data
 from democracy.tests.utils import get_data_from_response
 
@@ -676,3 +679,269 @@ def test_answers_appear_in_user_data(john_doe_api_client, default_hearing):
     )
     response = john_doe_api_client.get("/v1/users/")
     assert poll.pk in response.data[0]["answered_questions"]
+
+
+def _get_answers_data(polls, options_per_poll):
+    return [
+        {
+            "question": poll.id,
+            "type": poll.type,
+            "answers": [option.id for option in poll.options.all()[:options_per_poll]],
+        }
+        for poll in polls
+    ]
+
+
+@pytest.mark.django_db
+def test_post_section_poll_answers_num_queries(john_doe_api_client, default_hearing):
+    """Saving poll answers must not cause queries per poll or per option."""
+    section = default_hearing.sections.first()
+    url = "/v1/hearing/%s/sections/%s/comments/" % (default_hearing.id, section.id)
+    polls = [
+        SectionPollFactory(
+            section=section, option_count=4, type=SectionPoll.TYPE_MULTIPLE_CHOICE
+        )
+        for _x in range(4)
+    ]
+
+    query_counts = []
+    # a user can answer a poll only once, so each post answers different polls
+    for answered_polls, options_per_poll in ((polls[:1], 1), (polls[1:], 3)):
+        data = get_comment_data()
+        data["answers"] = _get_answers_data(answered_polls, options_per_poll)
+        with CaptureQueriesContext(connection) as ctx:
+            response = john_doe_api_client.post(url, data=data)
+            assert response.status_code == 201
+        query_counts.append(len(ctx))
+    assert query_counts[0] == query_counts[1]
+
+    for poll, options_per_poll in zip(polls, (1, 3, 3, 3)):
+        poll.refresh_from_db()
+        assert poll.n_answers == 1
+        options = list(poll.options.all())
+        assert sum(option.n_answers for option in options) == options_per_poll
+        for option in options:
+            n_answers = option.n_answers
+            option.recache_n_answers()
+            assert option.n_answers == n_answers
+
+
+@pytest.mark.django_db
+def test_patch_section_poll_answers_num_queries(john_doe_api_client, default_hearing):
+    section = default_hearing.sections.first()
+    url = "/v1/hearing/%s/sections/%s/comments/" % (default_hearing.id, section.id)
+    polls = [
+        SectionPollFactory(
+            section=section, option_count=4, type=SectionPoll.TYPE_MULTIPLE_CHOICE
+        )
+        for _x in range(4)
+    ]
+    data = get_comment_data()
+    data["answers"] = _get_answers_data(polls, 2)
+    response = john_doe_api_client.post(url, data=data)
+    assert response.status_code == 201
+    comment_url = "%s%s/" % (url, response.data["id"])
+
+    query_counts = []
+    for poll_count, options_per_poll in ((1, 3), (4, 4)):
+        data = dict(response.data)
+        data["answers"] = _get_answers_data(polls[:poll_count], options_per_poll)
+        with CaptureQueriesContext(connection) as ctx:
+            response = john_doe_api_client.patch(comment_url, data=data)
+            assert response.status_code == 200
+        query_counts.append(len(ctx))
+    assert query_counts[0] == query_counts[1]
+
+    for poll in polls:
+        poll.refresh_from_db()
+        assert poll.n_answers == 1
+        for option in poll.options.all():
+            assert option.n_answers == 1
+
+
+@pytest.mark.django_db
+def test_poll_answer_counts_match_recount(john_doe_api_client, default_hearing):
+    section = default_hearing.sections.first()
+    url = "/v1/hearing/%s/sections/%s/comments/" % (default_hearing.id, section.id)
+    poll = SectionPollFactory(
+        section=section, option_count=3, type=SectionPoll.TYPE_MULTIPLE_CHOICE
+    )
+    option1, option2, option3 = poll.options.all()
+
+    data = get_comment_data()
+    data["answers"] = [{"question": poll.id, "answers": [option1.id, option2.id]}]
+    response = john_doe_api_client.post(url, data=data)
+    assert response.status_code == 201
+    data = response.data
+    for option_ids in ([option2.id, option3.id], [], [option1.id]):
+        data["answers"] = [{"question": poll.id, "answers": option_ids}]
+        response = john_doe_api_client.patch("%s%s/" % (url, data["id"]), data=data)
+        assert response.status_code == 200
+
+    counts = [option.n_answers for option in poll.options.all()]
+    poll.refresh_from_db()
+    n_answers = poll.n_answers
+    for option in poll.options.all():
+        option.recache_n_answers()
+    poll.recache_n_answers()
+    assert counts == [1, 0, 0]
+    assert [option.n_answers for option in poll.options.all()] == counts
+    assert poll.n_answers == n_answers == 1
+
+
+@pytest.mark.django_db
+def test_get_hearing_poll_results(john_doe_api_client, api_client, default_hearing):
+    section = default_hearing.sections.first()
+    poll = SectionPollFactory(
+        section=section, option_count=3, type=SectionPoll.TYPE_SINGLE_CHOICE
+    )
+    option = poll.options.first()
+    data = get_comment_data()
+    data["answers"] = [{"question": poll.id, "answers": [option.id]}]
+    john_doe_api_client.post(
+        "/v1/hearing/%s/sections/%s/comments/" % (default_hearing.id, section.id),
+        data=data,
+    )
+    url = reverse("hearing-poll-results", kwargs={"pk": default_hearing.id})
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(url)
+    data = get_data_from_response(response)
+
+    assert "max-age=" in response["Cache-Control"]
+    assert data["hearing"] == default_hearing.id
+    assert data["polls"] == [
+        {
+            "id": poll.id,
+            "section": section.id,
+            "type": SectionPoll.TYPE_SINGLE_CHOICE,
+            "n_answers": 1,
+            "options": [
+                {"id": o.id, "n_answers": int(o == option)} for o in poll.options.all()
+            ],
+        }
+    ]
+    assert not any(
+        "democracy_sectionpollanswer" in query["sql"] for query in ctx.captured_queries
+    )
+
+
+@pytest.fixture
+def crosstab_polls(john_doe, default_hearing):
+    caches[settings.POLL_CROSSTAB_CACHE_ALIAS].clear()
+    section = default_hearing.sections.first()
+    polls = [
+        SectionPollFactory(
+            section=section, option_count=2, type=SectionPoll.TYPE_SINGLE_CHOICE
+        )
+        for _x in range(2)
+    ]
+    first_options = list(polls[0].options.all())
+    second_options = list(polls[1].options.all())
+    # the answered options of the comments and their authors
+    for options, user in (
+        ([first_options[0], second_options[0]], None),
+        ([first_options[0], second_options[1]], john_doe),
+        ([first_options[1]], None),
+    ):
+        comment = SectionCommentFactory(section=section, created_by=user)
+        for option in options:
+            SectionPollAnswer.objects.create(comment=comment, option=option)
+    return polls
+
+
+@pytest.mark.django_db
+def test_hearing_poll_crosstab_by_poll(api_client, default_hearing, crosstab_polls):
+    first_poll, second_poll = crosstab_polls
+    first_options = list(first_poll.options.all())
+    second_options = list(second_poll.options.all())
+    url = reverse("hearing-poll-crosstab", kwargs={"pk": default_hearing.id})
+
+    data = get_data_from_response(
+        api_client.get(url, {"poll": first_poll.id, "by": "poll:%s" % second_poll.id})
+    )
+
+    assert data["by"] == "poll:%s" % second_poll.id
+    assert data["results"] == [
+        {
+            "poll": first_poll.id,
+            "option": first_options[0].id,
+            "value": second_options[0].id,
+            "count": 1,
+        },
+        {
+            "poll": first_poll.id,
+            "option": first_options[0].id,
+            "value": second_options[1].id,
+            "count": 1,
+        },
+    ]
+
+
+@pytest.mark.django_db
+def test_section_poll_crosstab_by_comment_attribute(
+    api_client, default_hearing, crosstab_polls
+):
+    first_poll, second_poll = crosstab_polls
+    section = first_poll.section
+    url = reverse(
+        "sections-poll-crosstab",
+        kwargs={"hearing_pk": default_hearing.id, "pk": section.id},
+    )
+
+    with CaptureQueriesContext(connection) as ctx:
+        data = get_data_from_response(
+            api_client.get(url, {"poll": first_poll.id, "by": "registered"})
+        )
+    counts = {(row["option"], row["value"]): row["count"] for row in data["results"]}
+    first_options = list(first_poll.options.all())
+    assert counts == {
+        (first_options[0].id, False): 1,
+        (first_options[0].id, True): 1,
+        (first_options[1].id, False): 1,
+    }
+    crosstab_queries = [
+        query for query in ctx.captured_queries if "sectionpollanswer" in query["sql"]
+    ]
+    assert len(crosstab_queries) == 1
+
+    # served from the cache
+    with CaptureQueriesContext(connection) as ctx:
+        get_data_from_response(
+            api_client.get(url, {"poll": first_poll.id, "by": "registered"})
+        )
+    assert not any("sectionpollanswer" in q["sql"] for q in ctx.captured_queries)
+
+    data = get_data_from_response(
+        api_client.get(url, {"created_at__gt": "2100-01-01T00:00:00Z"})
+    )
+    assert data == {"by": None, "results": []}
+
+
+@pytest.mark.django_db
+def test_poll_crosstab_leaves_out_unpublished_comments(
+    api_client, default_hearing, crosstab_polls
+):
+    first_poll = crosstab_polls[0]
+    first_option = first_poll.options.first()
+    comment = SectionCommentFactory(section=first_poll.section, published=False)
+    SectionPollAnswer.objects.create(comment=comment, option=first_option)
+    url = reverse("hearing-poll-crosstab", kwargs={"pk": default_hearing.id})
+
+    data = get_data_from_response(api_client.get(url, {"poll": first_poll.id}))
+
+    counts = {row["option"]: row["count"] for row in data["results"]}
+    assert counts[first_option.id] == 2
+
+
+@pytest.mark.django_db
+def test_poll_crosstab_invalid_parameters(api_client, default_hearing, crosstab_polls):
+    url = reverse("hearing-poll-crosstab", kwargs={"pk": default_hearing.id})
+    other_poll = SectionPollFactory(section=HearingFactory().sections.first())
+
+    for params in (
+        {"by": "author_name"},
+        {"by": "poll:%s" % other_poll.id},
+        {"poll": other_poll.id},
+    ):
+        get_data_from_response(api_client.get(url, params), status_code=400)
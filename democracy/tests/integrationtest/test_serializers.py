@@ -1,8 +1,27 @@
+from unittest import mock
+
 import pytest
+from rest_framework.renderers import JSONRenderer
 
 from democracy.enums import InitialSectionType
 from democracy.models import SectionType
+from democracy.renderers import ORJSONRenderer
+from democracy.tests.utils import get_data_from_response
 from democracy.views.section import SectionSerializer
+from democracy.views.section_comment import SectionCommentSerializer
+from democracy.views.utils import (
+    CompiledSerializerMixin,
+    get_compiled_serializer_class,
+    get_translation_options,
+)
+
+list_urls = [
+    "/v1/hearing/",
+    "/v1/hearing/{hearing}/sections/",
+    "/v1/section/",
+    "/v1/hearing/{hearing}/sections/{section}/comments/",
+    "/v1/comment/",
+]
 
 
 @pytest.mark.django_db
@@ -12,3 +31,73 @@ def test_section_serializer(random_hearing):
     data = SectionSerializer(instance=section).data
     assert data["type"] == InitialSectionType.PART
     assert "published" not in data
+
+
+@pytest.mark.django_db
+def test_translation_options_do_not_mutate_meta(random_hearing):
+    section = random_hearing.sections.first()
+    meta_fields = list(SectionSerializer.Meta.fields)
+
+    data = SectionSerializer(instance=section).data
+
+    assert SectionSerializer.Meta.fields == meta_fields
+    assert not hasattr(SectionSerializer.Meta, "translated_fields")
+    assert not hasattr(SectionSerializer.Meta, "translation_lang")
+    translated_fields, translation_lang = get_translation_options(SectionSerializer)
+    assert translated_fields == ("title", "abstract", "content")
+    assert set(translation_lang) == {"en", "fi", "sv"}
+    assert all(isinstance(data[field], dict) for field in translated_fields)
+
+
+def test_compiled_serializer_class():
+    compiled_class = get_compiled_serializer_class(SectionCommentSerializer)
+
+    assert issubclass(compiled_class, SectionCommentSerializer)
+    assert issubclass(compiled_class, CompiledSerializerMixin)
+    assert get_compiled_serializer_class(SectionCommentSerializer) is compiled_class
+    # the serializer's own to_representation must still wrap the compiled one
+    assert compiled_class.__mro__.index(
+        SectionCommentSerializer
+    ) < compiled_class.__mro__.index(CompiledSerializerMixin)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", list_urls)
+@pytest.mark.parametrize("client", ["api_client", "admin_api_client"])
+def test_compiled_serializers_output_parity(
+    request, settings, default_hearing, hearing_with_comments_on_comments, url, client
+):
+    api_client = request.getfixturevalue(client)
+    url = url.format(
+        hearing=default_hearing.pk, section=default_hearing.get_main_section().pk
+    )
+    settings.COMPILED_READ_SERIALIZERS = False
+    expected = get_data_from_response(api_client.get(url))
+
+    settings.COMPILED_READ_SERIALIZERS = True
+    with mock.patch.object(
+        CompiledSerializerMixin,
+        "to_representation",
+        autospec=True,
+        side_effect=CompiledSerializerMixin.to_representation,
+    ) as compiled_to_representation:
+        data = get_data_from_response(api_client.get(url))
+
+    assert compiled_to_representation.called
+    assert data == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", list_urls)
+def test_orjson_renderer_output_parity(
+    admin_api_client, default_hearing, hearing_with_comments_on_comments, url
+):
+    url = url.format(
+        hearing=default_hearing.pk, section=default_hearing.get_main_section().pk
+    )
+    response = admin_api_client.get(url)
+    assert response.status_code == 200
+
+    assert ORJSONRenderer().render(response.data) == JSONRenderer().render(
+        response.data
+    )
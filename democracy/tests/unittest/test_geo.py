@@ -0,0 +1,96 @@
+import json
+import math
+import timeit
+from unittest import mock
+
+import pytest
+from django.contrib.gis.geos import GeometryCollection, GEOSGeometry
+
+from democracy.utils import geo
+from democracy.utils.geo import (
+    ValidatedGeoJSON,
+    get_geometry_from_geojson,
+    parse_geojson_geometry,
+)
+from democracy.views.utils import GeoJSONField
+
+
+def _big_polygon(center_x, center_y, n_vertices=2000, radius=0.01):
+    ring = [
+        [
+            center_x + radius * math.cos(2 * math.pi * i / n_vertices),
+            center_y + radius * math.sin(2 * math.pi * i / n_vertices),
+        ]
+        for i in range(n_vertices)
+    ]
+    ring.append(ring[0])
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+@pytest.fixture
+def big_featurecollection():
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"name": "Area %d" % i},
+                "geometry": _big_polygon(24.9 + i * 0.02, 60.17),
+            }
+            for i in range(50)
+        ],
+    }
+
+
+def _parse_per_feature(geojson):
+    """The previous implementation, encoding every feature separately."""
+    gc = GeometryCollection()
+    for feature in geojson["features"]:
+        gc.append(GEOSGeometry(json.dumps(feature["geometry"])))
+    return gc
+
+
+def test_parse_featurecollection_matches_per_feature_parsing(big_featurecollection):
+    expected = _parse_per_feature(big_featurecollection)
+
+    gc = parse_geojson_geometry(big_featurecollection)
+
+    assert isinstance(gc, GeometryCollection)
+    assert len(gc) == len(expected) == 50
+    for geometry, expected_geometry in zip(gc, expected):
+        assert geometry.equals_exact(expected_geometry)
+
+
+def test_parse_featurecollection_encodes_once(big_featurecollection):
+    with mock.patch.object(geo.json, "dumps", wraps=json.dumps) as dumps:
+        parse_geojson_geometry(big_featurecollection)
+    assert dumps.call_count == 1
+
+
+@pytest.mark.benchmark
+def test_parse_big_featurecollection_benchmark(big_featurecollection):
+    per_feature = min(
+        timeit.repeat(
+            lambda: _parse_per_feature(big_featurecollection), number=3, repeat=3
+        )
+    )
+    single_parse = min(
+        timeit.repeat(
+            lambda: parse_geojson_geometry(big_featurecollection), number=3, repeat=3
+        )
+    )
+    # generous margin to keep the benchmark stable on busy test runners
+    assert single_parse < per_feature * 2, (
+        f"single parse took {single_parse:.4f}s, per-feature parse {per_feature:.4f}s"
+    )
+
+
+def test_geojson_field_carries_parsed_geometry(big_featurecollection):
+    value = GeoJSONField().to_internal_value(big_featurecollection)
+
+    assert isinstance(value, ValidatedGeoJSON)
+    assert value == big_featurecollection
+    assert len(value.geometry) == 50
+    with mock.patch.object(geo, "GEOSGeometry") as geos_geometry:
+        assert get_geometry_from_geojson(value) is value.geometry
+    geos_geometry.assert_not_called()
@@ -0,0 +1,83 @@
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from democracy.enums import InitialSectionType
+from democracy.models import Label, Organization, SectionType
+from democracy.utils import registry
+
+
+@pytest.mark.django_db
+def test_registry_lookups_do_not_query():
+    closure_info = SectionType.objects.get(identifier=InitialSectionType.CLOSURE_INFO)
+    registry.section_types.get(identifier=InitialSectionType.MAIN)
+
+    with CaptureQueriesContext(connection) as queries:
+        by_identifier = registry.section_types.get(
+            identifier=InitialSectionType.CLOSURE_INFO
+        )
+        by_pk = registry.section_types.get(pk=str(closure_info.pk))
+
+    assert len(queries) == 0
+    assert by_identifier == by_pk == closure_info
+
+
+@pytest.mark.django_db
+def test_registry_serves_label_translations():
+    label = Label.objects.create(label="Traffic")
+    registry.labels.get(pk=label.pk)
+
+    with CaptureQueriesContext(connection) as queries:
+        cached = registry.labels.get(pk=label.pk)
+        assert cached.label == "Traffic"
+
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_registry_is_reloaded_on_write():
+    label = Label.objects.create(label="Traffic")
+    assert registry.labels.get(pk=label.pk).label == "Traffic"
+
+    label.label = "Transport"
+    label.save()
+
+    assert registry.labels.get(pk=label.pk).label == "Transport"
+
+    label.soft_delete()
+
+    with pytest.raises(Label.DoesNotExist):
+        registry.labels.get(pk=label.pk)
+
+
+@pytest.mark.django_db
+def test_registry_is_reloaded_on_version_change():
+    organization = Organization.objects.create(name="Parks")
+    registry.organizations.get(name="Parks")
+    # a write that the signals do not see, followed by a version update made
+    # by another process
+    Organization.objects.filter(pk=organization.pk).update(name="Parks and gardens")
+    caches["default"].set(registry.organizations._get_version_key(), "other", None)
+
+    with pytest.raises(Organization.DoesNotExist):
+        registry.organizations.get(name="Parks")
+    assert registry.organizations.get(name="Parks and gardens") == organization
+
+
+@pytest.mark.django_db
+def test_registry_reloads_on_miss():
+    registry.section_types.get(identifier=InitialSectionType.MAIN)
+    # created without the signals, e.g. by a process that could not update
+    # the version
+    SectionType.objects.bulk_create(
+        [SectionType(identifier="faq", name_singular="faq", name_plural="faqs")]
+    )
+
+    assert registry.section_types.get(identifier="faq").name_plural == "faqs"
+
+
+@pytest.mark.django_db
+def test_registry_invalid_pk():
+    with pytest.raises(ValueError):
+        registry.labels.get(pk="not a number")
@@ -0,0 +1,45 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from democracy.models import Section
+from democracy.utils.translations import get_translations_dict, load_translations
+
+
+@pytest.mark.django_db
+def test_get_translations_dict_loads_translations_once(default_hearing):
+    section = Section.objects.get(pk=default_hearing.get_main_section().pk)
+
+    with CaptureQueriesContext(connection) as queries:
+        title = get_translations_dict(section, "title")
+        abstract = get_translations_dict(section, "abstract")
+        content = get_translations_dict(section, "content")
+
+    assert len(queries) == 1
+    assert abstract["en"] == "Section 1 abstract"
+    assert set(title) == set(abstract) == set(content) == {"fi", "sv", "en"}
+    assert abstract["fi"] == abstract["sv"] == ""
+
+
+@pytest.mark.django_db
+def test_get_translations_dict_uses_prefetched_translations(default_hearing):
+    sections = list(default_hearing.sections.prefetch_related("translations"))
+
+    with CaptureQueriesContext(connection) as queries:
+        abstracts = [get_translations_dict(s, "abstract")["en"] for s in sections]
+
+    assert len(queries) == 0
+    assert abstracts == ["Section %d abstract" % x for x in range(1, 4)]
+
+
+@pytest.mark.django_db
+def test_load_translations_batches_per_model(default_hearing):
+    sections = list(Section.objects.filter(hearing=default_hearing))
+    hearing = type(default_hearing).objects.get(pk=default_hearing.pk)
+
+    with CaptureQueriesContext(connection) as queries:
+        load_translations(sections + [hearing])
+        titles = [get_translations_dict(obj, "title") for obj in sections + [hearing]]
+
+    assert len(queries) == 2
+    assert titles[-1]["en"] == default_hearing.title
@@ -169,6 +169,8 @@ def get_data_from_response(response, status_code=200):
                 status_code,
             )
         )
+    if response.streaming:
+        return json.loads(b"".join(response.streaming_content).decode("utf-8"))
     return json.loads(response.content.decode("utf-8"))
 
 
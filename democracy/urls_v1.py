@@ -2,12 +2,14 @@ from django.urls import include, path, re_path
 from rest_framework_nested import routers
 
 from democracy.views import (
+    CommentModerationViewSet,
     CommentViewSet,
     ContactPersonViewSet,
     FileViewSet,
     HearingViewSet,
     ImageViewSet,
     LabelViewSet,
+    ModerationQueueViewSet,
     OrganizationViewSet,
     ProjectViewSet,
     RootSectionViewSet,
@@ -28,6 +30,12 @@ router.register(r"contact_person", ContactPersonViewSet, basename="contact_perso
 router.register(r"project", ProjectViewSet, basename="project")
 router.register(r"file", FileViewSet, basename="file")
 router.register(r"organization", OrganizationViewSet, basename="organization")
+router.register(
+    r"moderation/queue", ModerationQueueViewSet, basename="moderation-queue"
+)
+router.register(
+    r"moderation/comments", CommentModerationViewSet, basename="moderation-comments"
+)
 
 hearing_child_router = routers.NestedSimpleRouter(router, r"hearing", lookup="hearing")
 hearing_child_router.register(r"sections", SectionViewSet, basename="sections")
@@ -0,0 +1,110 @@
+"""
+Near-duplicate clusters of section comments.
+
+The comments store MinHash signatures and LSH buckets of their content (see
+`democracy.utils.minhash`), which are updated whenever the content is saved.
+Comments sharing a bucket are compared by their signatures, and the comments
+similar enough are grouped into clusters, so a hearing is clustered in about
+linear time in the number of its comments.
+"""
+
+from democracy.models import SectionComment
+from democracy.utils.minhash import (
+    estimate_similarity,
+    get_lsh_buckets,
+    get_minhash_signature,
+)
+
+
+def get_near_duplicate_clusters(comments, threshold):
+    """
+    Group the comments into clusters of near duplicates.
+
+    :param comments: queryset of the comments to cluster
+    :param threshold: estimated Jaccard similarity from which comments are
+                      near duplicates
+    :return: lists of comment IDs, the largest clusters first; comments without
+             near duplicates are left out
+    """
+    signatures = {}
+    first_in_bucket = {}
+    cluster_of = {}
+
+    def find(pk):
+        root = pk
+        while cluster_of.get(root, root) != root:
+            root = cluster_of[root]
+        # point the comments on the way straight to the root
+        while pk != root:
+            cluster_of[pk], pk = root, cluster_of[pk]
+        return root
+
+    for pk, signature, buckets in comments.exclude(lsh_buckets=[]).values_list(
+        "pk", "minhash_signature", "lsh_buckets"
+    ):
+        signatures[pk] = signature
+        for bucket in buckets:
+            first = first_in_bucket.setdefault(bucket, pk)
+            if first == pk:
+                continue
+            first_cluster, cluster = find(first), find(pk)
+            if (
+                first_cluster != cluster
+                and estimate_similarity(signatures[first], signature) >= threshold
+            ):
+                cluster_of[cluster] = first_cluster
+
+    clusters = {}
+    for pk in signatures:
+        clusters.setdefault(find(pk), []).append(pk)
+    return sorted(
+        (sorted(cluster) for cluster in clusters.values() if len(cluster) > 1),
+        key=lambda cluster: (-len(cluster), cluster[0]),
+    )
+
+
+def find_near_duplicates(comments, comment, threshold):
+    """
+    Return the IDs of the near duplicates of the comment among the comments.
+
+    Only the comments sharing an LSH bucket with the comment are read.
+    """
+    if not comment.lsh_buckets:
+        return []
+    signature = comment.minhash_signature
+    return [
+        pk
+        for pk, other in comments.filter(lsh_buckets__overlap=comment.lsh_buckets)
+        .exclude(pk=comment.pk)
+        .order_by("pk")
+        .values_list("pk", "minhash_signature")
+        if estimate_similarity(signature, other) >= threshold
+    ]
+
+
+def update_comment_signatures(batch_size):
+    """
+    Set the signatures of the comments saved before signatures were stored.
+
+    :return: number of updated comments
+    """
+    total = 0
+    last_pk = 0
+    while True:
+        comments = list(
+            SectionComment.objects.everything()
+            .filter(minhash_signature=[], pk__gt=last_pk)
+            .exclude(content="")
+            .only("pk", "content")
+            .order_by("pk")[:batch_size]
+        )
+        if not comments:
+            return total
+        for comment in comments:
+            comment.minhash_signature = get_minhash_signature(comment.content)
+            comment.lsh_buckets = get_lsh_buckets(comment.minhash_signature)
+        SectionComment.objects.bulk_update(
+            comments, ["minhash_signature", "lsh_buckets"]
+        )
+        total += len(comments)
+        last_pk = comments[-1].pk
@@ -0,0 +1,185 @@
+"""
+Finding and removing duplicate section comments.
+
+Comments store a fingerprint of their normalized content, plugin data, location,
+parent and the comment they reply to in `content_fingerprint` (see
+`get_content_fingerprint`), so duplicates are found with an index lookup instead
+of comparing the contents.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import FirstValue, RowNumber
+from django.utils import timezone
+
+from democracy.models import SectionComment
+from democracy.models.comment import get_content_fingerprint
+
+
+def find_duplicate_comment(model, fingerprint, user, window, option_ids=None):
+    """
+    Return the first comment with the fingerprint written in the last `window` seconds.
+
+    Only the comments of the same user count as duplicates. Anonymous users
+    can't be told apart, so their comments are never duplicates.
+
+    The fingerprint is locked until the end of the transaction, so this must be
+    called in the transaction creating the new comment. Concurrent requests
+    creating the same comment then wait for each other, and the later one finds
+    the comment the earlier one created.
+
+    :param model: the comment model
+    :param fingerprint: fingerprint of the new comment
+    :param user: the user writing the new comment
+    :param window: seconds within which a comment is a duplicate
+    :param option_ids: set of the IDs of the poll options the new comment
+                       answers, or None if the comments have no poll answers
+    :return: the duplicated comment or None
+    """
+    if not (fingerprint and window > 0 and user.is_authenticated):
+        return None
+    lock_comment_fingerprint(fingerprint)
+    comments = model.objects.filter(
+        content_fingerprint=fingerprint,
+        created_by=user,
+        created_at__gte=timezone.now() - timedelta(seconds=window),
+    ).order_by("created_at")
+    if option_ids is None:
+        return comments.first()
+    for comment in comments.prefetch_related("poll_answers"):
+        if {answer.option_id for answer in comment.poll_answers.all()} == option_ids:
+            return comment
+    return None
+
+
+def lock_comment_fingerprint(fingerprint):
+    """
+    Take a transaction-level advisory lock on the fingerprint.
+    """
+    # the first 60 bits of the hash fit in the bigint key of the lock
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [int(fingerprint[:15], 16)])
+
+
+def fill_content_fingerprints(batch_size):
+    """
+    Set the fingerprints of the comments saved before fingerprints were stored.
+
+    :return: number of updated comments
+    """
+    total = 0
+    last_pk = 0
+    while True:
+        comments = list(
+            SectionComment.objects.everything()
+            .filter(content_fingerprint="", pk__gt=last_pk)
+            .exclude(content="")
+            .only("pk", "section_id", "comment_id", "content", "plugin_data", "geojson")
+            .order_by("pk")[:batch_size]
+        )
+        if not comments:
+            return total
+        for comment in comments:
+            comment.content_fingerprint = get_content_fingerprint(
+                comment.section_id,
+                comment.content,
+                comment.plugin_data,
+                reply_to_id=comment.comment_id,
+                geojson=comment.geojson,
+            )
+        # comments whose content is only whitespace have no fingerprint
+        filled = [comment for comment in comments if comment.content_fingerprint]
+        SectionComment.objects.bulk_update(filled, ["content_fingerprint"])
+        total += len(filled)
+        last_pk = comments[-1].pk
+
+
+def get_duplicate_comments(window):
+    """
+    Return the duplicate comments and the comments they duplicate.
+
+    A comment is a duplicate of the first comment with the same fingerprint if
+    it was written at most `window` seconds after it.
+
+    :return: queryset of the duplicates, annotated with the ID of the first
+             comment as `original_id`
+    """
+    partition = {
+        "partition_by": F("content_fingerprint"),
+        "order_by": ("created_at", "pk"),
+    }
+    return (
+        SectionComment.objects.exclude(content_fingerprint="")
+        .annotate(
+            position=Window(RowNumber(), **partition),
+            original_id=Window(FirstValue("pk"), **partition),
+            original_created_at=Window(FirstValue("created_at"), **partition),
+        )
+        .filter(
+            position__gt=1,
+            created_at__lte=F("original_created_at") + timedelta(seconds=window),
+        )
+    )
+
+
+def remove_duplicate_comments(window, batch_size):
+    """
+    Soft-delete the duplicate comments, moving their votes to the originals.
+
+    The duplicates are removed in batches, each in its own transaction, so an
+    interrupted run can be resumed by running it again.
+
+    :return: number of removed comments
+    """
+    total = 0
+    while True:
+        with transaction.atomic():
+            duplicates = dict(
+                get_duplicate_comments(window)
+                .order_by("pk")
+                .values_list("pk", "original_id")[:batch_size]
+            )
+            if not duplicates:
+                return total
+            _remove_duplicates(duplicates)
+        total += len(duplicates)
+
+
+def _remove_duplicates(duplicates):
+    """
+    :param duplicates: dict of {duplicate comment ID: original comment ID}
+    """
+    duplicate_ids = list(duplicates)
+    original_ids = set(duplicates.values())
+
+    # move the votes, each voter voting for the original only once
+    voters = SectionComment.voters.through
+    voters.objects.bulk_create(
+        [
+            voters(sectioncomment_id=duplicates[comment_id], user_id=user_id)
+            for comment_id, user_id in voters.objects.filter(
+                sectioncomment_id__in=duplicate_ids
+            ).values_list("sectioncomment_id", "user_id")
+        ],
+        ignore_conflicts=True,
+    )
+    unregistered_votes = Counter()
+    for comment_id, n_votes in (
+        SectionComment.objects.everything()
+        .filter(pk__in=duplicate_ids, n_unregistered_votes__gt=0)
+        .values_list("pk", "n_unregistered_votes")
+    ):
+        unregistered_votes[duplicates[comment_id]] += n_votes
+    for original_id, n_votes in unregistered_votes.items():
+        SectionComment.objects.everything().filter(pk=original_id).update(
+            n_unregistered_votes=F("n_unregistered_votes") + n_votes
+        )
+
+    # soft-delete the duplicates with their answers and images
+    SectionComment.objects.filter(pk__in=duplicate_ids).soft_delete()
+
+    for original in SectionComment.objects.everything().filter(pk__in=original_ids):
+        original.recache_n_votes()
@@ -0,0 +1,78 @@
+"""
+Moderating many section comments at once.
+
+The operations are applied with one update per model instead of saving the
+comments one by one. Comments are deleted and restored with
+SoftDeleteQuerySet, which updates the counters once for the whole batch.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+from reversion import revisions
+
+from democracy.models import SectionComment
+
+MODERATION_OPERATIONS = ("flag", "unflag", "pin", "unpin", "delete", "restore")
+
+
+def _get_changes(operation, user, now):
+    """
+    Return the filter of the comments the operation changes and the changes.
+    """
+    return {
+        "flag": ({"flagged_at__isnull": True}, {"flagged_at": now, "flagged_by": user}),
+        "unflag": (
+            {"flagged_at__isnull": False},
+            {"flagged_at": None, "flagged_by": None},
+        ),
+        "pin": ({"pinned": False}, {"pinned": True}),
+        "unpin": ({"pinned": True}, {"pinned": False}),
+        "delete": ({"deleted": False}, {}),
+        "restore": ({"deleted": True}, {}),
+    }[operation]
+
+
+def moderate_comments(comments, operation, user=None):
+    """
+    Apply a moderation operation to the comments.
+
+    The changes are recorded as a single revision. Deleting a comment deletes
+    its poll answers and images as well, and restoring it restores them.
+
+    :param comments: queryset of section comments, deleted ones included
+    :param operation: one of MODERATION_OPERATIONS
+    :param user: the moderator
+    :return: list of the comments the operation changed
+    """
+    if operation not in MODERATION_OPERATIONS:
+        raise ValueError("Unknown moderation operation: %s" % operation)
+    if user is not None and not user.pk:
+        user = None
+    now = timezone.now()
+    condition, changes = _get_changes(operation, user, now)
+
+    with transaction.atomic(), revisions.create_revision():
+        # the comments are locked through a subquery, as the given queryset
+        # may be distinct or join the nullable side of an outer join
+        comment_ids = list(
+            SectionComment.objects.everything()
+            .filter(pk__in=comments.filter(**condition).values("pk"))
+            .select_for_update()
+            .values_list("pk", flat=True)
+        )
+        if not comment_ids:
+            return []
+        changed = SectionComment.objects.everything().filter(pk__in=comment_ids)
+        if operation == "delete":
+            changed.soft_delete(user=user)
+        elif operation == "restore":
+            changed.undelete()
+        changed.update(modified_at=now, **changes)
+
+        changed = list(changed)
+        for comment in changed:
+            revisions.add_to_revision(comment)
+        if user is not None:
+            revisions.set_user(user)
+        revisions.set_comment("Comments moderated: %s (%d)" % (operation, len(changed)))
+    return changed
@@ -0,0 +1,144 @@
+"""
+Loading of comment threads, i.e. comments with all their replies.
+
+Replies refer to the comment they reply to with the `comment` field. Each
+comment also stores its position in its thread: the first comment of the
+thread in `root`, the IDs of the comments from the root to the comment in
+`path` and its `depth`, which are maintained by `SectionComment.save`. A
+thread or a part of it is loaded with one indexed query and arranged into a
+tree in Python, and the replies below a comment are counted with a prefix
+query on the paths into `n_replies_total`.
+"""
+
+from django.db import connection
+from django.db.models import Q
+
+from democracy.models import SectionComment
+
+REBUILD_THREADS_SQL = """
+WITH RECURSIVE thread (id, root_id, path, depth) AS (
+    SELECT id, id, lpad(id::text, 10, '0'), 0 FROM {table}
+    WHERE comment_id IS NULL
+    UNION ALL
+    SELECT reply.id, thread.root_id,
+        thread.path || '/' || lpad(reply.id::text, 10, '0'), thread.depth + 1
+    FROM {table} reply
+    JOIN thread ON reply.comment_id = thread.id
+)
+UPDATE {table} target
+SET root_id = thread.root_id, path = thread.path, depth = thread.depth
+FROM thread
+WHERE target.id = thread.id AND (
+    target.root_id IS DISTINCT FROM thread.root_id
+    OR target.path != thread.path
+    OR target.depth != thread.depth
+)
+"""
+
+
+# the replies of a comment are the comments whose paths start with its path
+RECOUNT_REPLIES_SQL = """
+UPDATE {table} target
+SET n_replies_total = counts.n_replies_total
+FROM (
+    SELECT comment.id, COUNT(reply.id) AS n_replies_total
+    FROM {table} comment
+    LEFT JOIN {table} reply ON reply.root_id = comment.root_id
+        AND reply.path LIKE comment.path || '/%'
+        AND NOT reply.deleted
+    WHERE comment.path != ''
+    GROUP BY comment.id
+) counts
+WHERE target.id = counts.id AND target.n_replies_total != counts.n_replies_total
+"""
+
+
+def rebuild_comment_threads():
+    """
+    Set the thread positions of all the comments from their `comment` fields.
+
+    The total reply counts of the comments are recomputed as well.
+
+    :return: the number of comments whose position was changed
+    """
+    table = SectionComment._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(REBUILD_THREADS_SQL.format(table=table))
+        n_changed = cursor.rowcount
+        cursor.execute(RECOUNT_REPLIES_SQL.format(table=table))
+    return n_changed
+
+
+def filter_comment_threads(queryset, roots, max_depth, max_comments):
+    """
+    Filter the queryset to the comments of the threads starting from `roots`.
+
+    The replies are taken down to `max_depth` levels below the given comments,
+    and the threads are cut to `max_comments` comments in total, leaving out
+    the deepest and newest replies first. Comments whose thread position is
+    not set, e.g. ones inserted without `save()`, are taken without replies.
+
+    :param queryset: queryset of comments
+    :param roots: the first comments of the threads
+    :param max_depth: number of reply levels to load
+    :param max_comments: maximum number of comments in all the threads
+    """
+    root_ids = [root.pk for root in roots if root.path and root.depth == 0]
+    condition = Q(root_id__in=root_ids, depth__lte=max_depth) | Q(
+        pk__in=[root.pk for root in roots if not root.path]
+    )
+    for root in roots:
+        if root.path and root.depth > 0:
+            # a thread starting from a reply is the subtree of the reply
+            condition |= Q(
+                path__startswith=root.path, depth__lte=root.depth + max_depth
+            )
+    thread_ids = (
+        queryset.filter(condition)
+        .order_by("depth", "created_at", "pk")
+        .values("pk")[:max_comments]
+    )
+    return queryset.filter(pk__in=thread_ids)
+
+
+def arrange_comment_threads(comments, root_ids):
+    """
+    Arrange comments into threads.
+
+    Sets `thread_depth` and the list of `thread_replies` to each comment. The
+    replies are in the order they were written in. Comments whose parent is not
+    among the comments are left out.
+
+    :param comments: the comments of the threads
+    :param root_ids: IDs of the first comments of the threads, in order
+    :return: list of the first comments of the threads
+    """
+    replies = {}
+    for comment in sorted(comments, key=lambda c: (c.created_at, c.pk)):
+        comment.thread_replies = []
+        replies.setdefault(comment.comment_id, []).append(comment)
+    by_id = {comment.pk: comment for comment in comments}
+    roots = [by_id[root_id] for root_id in root_ids if root_id in by_id]
+
+    level = roots
+    depth = 0
+    while level:
+        next_level = []
+        for comment in level:
+            comment.thread_depth = depth
+            comment.thread_replies = replies.get(comment.pk, [])
+            next_level.extend(comment.thread_replies)
+        level = next_level
+        depth += 1
+    return roots
+
+
+def flatten_comment_threads(roots):
+    """Return the comments of the threads in depth-first order."""
+    flat = []
+    stack = list(reversed(roots))
+    while stack:
+        comment = stack.pop()
+        flat.append(comment)
+        stack.extend(reversed(comment.thread_replies))
+    return flat
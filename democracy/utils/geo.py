@@ -3,18 +3,63 @@ import json
 from django.contrib.gis.geos import GeometryCollection, GEOSGeometry
 
 
-def get_geometry_from_geojson(geojson):
-    gc = GeometryCollection()
-    if geojson is None:
-        return None
+class ValidatedGeoJSON(dict):
+    """
+    GeoJSON data that has already been parsed into a GEOS GeometryCollection.
+
+    Returned by the API GeoJSON field so that the geometry parsed during
+    validation can be reused when the model is saved instead of parsing the
+    same data again.
+    """
+
+    def __init__(self, data, geometry):
+        super().__init__(data)
+        self.geometry = geometry
+
+
+def parse_geojson_geometry(geojson):
+    """
+    Parse GeoJSON data into a GEOS GeometryCollection.
+
+    Feature geometries of a FeatureCollection are gathered into a single
+    GeoJSON GeometryCollection, so the whole input is encoded and parsed only
+    once regardless of the number of features.
+
+    :param geojson: GeoJSON data (Feature, FeatureCollection or geometry)
+    :return: GeometryCollection containing the geometries
+    :rtype: GeometryCollection
+    """
     geometry_data = geojson.get("geometry", None) or geojson
 
     if geometry_data.get("features"):
-        for feature in geometry_data.get("features"):
-            feature_geometry = feature.get("geometry")
-            feature_geos = GEOSGeometry(json.dumps(feature_geometry))
-            gc.append(feature_geos)
-    else:
-        geometry = GEOSGeometry(json.dumps(geometry_data))
-        gc.append(geometry)
+        collection = {
+            "type": "GeometryCollection",
+            "geometries": [
+                feature.get("geometry") for feature in geometry_data["features"]
+            ],
+        }
+        return GEOSGeometry(json.dumps(collection))
+
+    gc = GeometryCollection()
+    gc.append(GEOSGeometry(json.dumps(geometry_data)))
     return gc
+
+
+def get_geometry_from_geojson(geojson):
+    if geojson is None:
+        return None
+    if isinstance(geojson, ValidatedGeoJSON):
+        return geojson.geometry
+    return parse_geojson_geometry(geojson)
+
+
+def geometry_needs_update(update_fields):
+    """
+    Whether a model save with the given `update_fields` writes the geometry.
+
+    Saves that only touch e.g. cached counters do not need the geometry to be
+    derived from the GeoJSON data again.
+    """
+    if update_fields is None:
+        return True
+    return "geojson" in update_fields or "geometry" in update_fields
@@ -0,0 +1,483 @@
+"""
+Maintenance of the HearingCard read model of the hearing list.
+
+The cards are built from the same data the hearing list serializer uses and
+turned back into the model instances it reads when the list is served, so the
+output does not change. Writes to the data update the cards of the affected
+hearings after the transaction has been committed.
+"""
+
+import threading
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.utils import timezone
+
+from democracy.enums import InitialSectionType
+from democracy.models import (
+    Hearing,
+    HearingCard,
+    Label,
+    Organization,
+    Project,
+    ProjectPhase,
+    Section,
+    SectionImage,
+)
+from democracy.models.base import soft_delete_changed
+from democracy.utils.translations import set_prefetched_objects
+
+CARD_FIELDS = (
+    "translations",
+    "main_section_id",
+    "abstract",
+    "main_image",
+    "labels",
+    "organization_name",
+    "project",
+    "default_to_fullscreen",
+)
+
+# lookups from Hearing to the models the cards are built from
+CARD_SOURCE_LOOKUPS = {
+    Hearing: "pk",
+    Section: "sections",
+    SectionImage: "sections__images",
+    Label: "labels",
+    Organization: "organization",
+    Project: "project_phase__project",
+    # all the hearings of a project list the hearings of its phases
+    ProjectPhase: "project_phase__project__phases",
+}
+
+# saves that only update these fields do not change the cards
+COUNTER_FIELDS = {"n_comments"}
+
+_pending = threading.local()
+
+
+def _get_translations(obj, fields=None):
+    translations = sorted(obj.translations.all(), key=lambda t: t.language_code)
+    fields = fields or obj._parler_meta.get_all_fields()
+    return {
+        translation.language_code: {
+            field: getattr(translation, field) for field in fields
+        }
+        for translation in translations
+    }
+
+
+def _set_translations(obj, translations):
+    translation_model = obj._parler_meta.root_model
+    set_prefetched_objects(
+        obj,
+        "translations",
+        [
+            translation_model(master_id=obj.pk, language_code=language_code, **values)
+            for language_code, values in translations.items()
+        ],
+    )
+
+
+def get_card_queryset(hearings):
+    """
+    Select and prefetch everything the cards of `hearings` are built from.
+    """
+    return hearings.select_related(
+        "organization", "project_phase__project"
+    ).prefetch_related(
+        "translations",
+        Prefetch("labels", Label.objects.prefetch_related("translations")),
+        Prefetch(
+            "sections",
+            Section.objects.filter(
+                type__identifier=InitialSectionType.MAIN
+            ).prefetch_related(
+                "translations",
+                Prefetch(
+                    "images",
+                    SectionImage.objects.public().prefetch_related("translations"),
+                ),
+            ),
+            to_attr="main_section_list",
+        ),
+        "project_phase__project__translations",
+        Prefetch(
+            "project_phase__project__phases",
+            ProjectPhase.objects.prefetch_related(
+                "translations",
+                Prefetch(
+                    "hearings",
+                    Hearing.objects.with_unpublished().order_by("created_at", "pk"),
+                ),
+            ),
+        ),
+    )
+
+
+def _build_main_image(section):
+    images = list(section.images.all())
+    if not images:
+        return None
+    image = images[0]
+    return {
+        "id": image.pk,
+        "image": image.image.name,
+        "width": image.width,
+        "height": image.height,
+        "translations": _get_translations(image),
+    }
+
+
+def _build_project(project):
+    return {
+        "id": project.pk,
+        "translations": _get_translations(project),
+        "phases": [
+            {
+                "id": phase.pk,
+                "ordering": phase.ordering,
+                "translations": _get_translations(phase),
+                "hearings": [
+                    {
+                        "id": hearing.pk,
+                        "slug": hearing.slug,
+                        "published": hearing.published,
+                        "open_at": hearing.open_at.isoformat(),
+                        "organization_id": hearing.organization_id,
+                    }
+                    for hearing in phase.hearings.all()
+                ],
+            }
+            for phase in project.phases.all()
+        ],
+    }
+
+
+def build_hearing_card(hearing):
+    """
+    Build the card of a hearing fetched with `get_card_queryset`.
+
+    :rtype: HearingCard
+    """
+    main_sections = hearing.main_section_list
+    main_section = main_sections[0] if main_sections else None
+    project_phase = hearing.project_phase
+    return HearingCard(
+        hearing=hearing,
+        translations=_get_translations(hearing),
+        main_section_id=main_section.pk if main_section else None,
+        abstract=(
+            _get_translations(main_section, ["abstract"]) if main_section else {}
+        ),
+        main_image=_build_main_image(main_section) if main_section else None,
+        labels=[
+            {"id": label.pk, "translations": _get_translations(label)}
+            for label in sorted(hearing.labels.all(), key=lambda label: label.pk)
+        ],
+        organization_name=(
+            hearing.organization.name if hearing.organization_id else None
+        ),
+        project=_build_project(project_phase.project) if project_phase else None,
+        default_to_fullscreen=(
+            main_section.plugin_fullscreen if main_section else False
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def _save_cards(cards):
+    if cards:
+        HearingCard.objects.bulk_create(
+            cards,
+            update_conflicts=True,
+            unique_fields=["hearing"],
+            update_fields=CARD_FIELDS + ("updated_at",),
+        )
+
+
+def update_hearing_cards(hearing_ids=None, chunk_size=500):
+    """
+    Build and save the cards of the given hearings, or of all hearings.
+
+    Cards of deleted hearings are removed.
+
+    :param hearing_ids: IDs of the hearings, or None for all hearings
+    :return: Number of the saved cards
+    """
+    hearings = Hearing.objects.with_unpublished()
+    stale_cards = HearingCard.objects.exclude(hearing__deleted=False)
+    if hearing_ids is not None:
+        hearing_ids = set(hearing_ids)
+        hearings = hearings.filter(pk__in=hearing_ids)
+        stale_cards = stale_cards.filter(pk__in=hearing_ids)
+
+    count = 0
+    cards = []
+    for hearing in get_card_queryset(hearings).iterator(chunk_size=chunk_size):
+        cards.append(build_hearing_card(hearing))
+        if len(cards) >= chunk_size:
+            _save_cards(cards)
+            count += len(cards)
+            cards = []
+    _save_cards(cards)
+    stale_cards.delete()
+    return count + len(cards)
+
+
+def check_hearing_cards(chunk_size=500):
+    """
+    Compare the saved cards to cards built from the current data.
+
+    :return: dict of the IDs of the hearings with a "missing" or an "outdated"
+             card, and of the "orphaned" cards of deleted hearings
+    """
+    result = {"missing": [], "outdated": [], "orphaned": []}
+    hearings = get_card_queryset(
+        Hearing.objects.with_unpublished().select_related("card")
+    )
+    for hearing in hearings.iterator(chunk_size=chunk_size):
+        card = getattr(hearing, "card", None)
+        if card is None:
+            result["missing"].append(hearing.pk)
+            continue
+        expected = build_hearing_card(hearing)
+        if any(
+            getattr(card, field) != getattr(expected, field) for field in CARD_FIELDS
+        ):
+            result["outdated"].append(hearing.pk)
+    result["orphaned"] = list(
+        HearingCard.objects.filter(hearing__deleted=True).values_list("pk", flat=True)
+    )
+    return result
+
+
+def get_card_phase_hearing_ids(cards):
+    """
+    Return the IDs of the hearings listed in the project phases of the cards.
+
+    Whether the hearings are visible depends on the user, so the cards list
+    them all and the visible ones are picked with `filter_by_hearing_visible`
+    when the cards are served.
+    """
+    return {
+        hearing["id"]
+        for card in cards
+        if card.project is not None
+        for phase in card.project["phases"]
+        for hearing in phase["hearings"]
+    }
+
+
+def _restore_project(card_project, visible_hearing_ids):
+    project = Project(pk=card_project["id"])
+    _set_translations(project, card_project["translations"])
+    phases = []
+    for card_phase in card_project["phases"]:
+        phase = ProjectPhase(
+            pk=card_phase["id"], project=project, ordering=card_phase["ordering"]
+        )
+        _set_translations(phase, card_phase["translations"])
+        set_prefetched_objects(
+            phase,
+            "hearings",
+            [
+                Hearing(pk=hearing["id"], slug=hearing["slug"])
+                for hearing in card_phase["hearings"]
+                if hearing["id"] in visible_hearing_ids
+            ],
+        )
+        phases.append(phase)
+    set_prefetched_objects(project, "phases", phases)
+    return project
+
+
+def restore_hearing_card(hearing, card, visible_hearing_ids):
+    """
+    Set the data of the card to the hearing as if it had been fetched with
+    the prefetches of the hearing list.
+
+    :param hearing: The hearing
+    :param card: The card of the hearing
+    :param visible_hearing_ids: IDs of the hearings the user may see, the
+                                project phases list only these
+    """
+    _set_translations(hearing, card.translations)
+
+    labels = []
+    for card_label in card.labels:
+        label = Label(pk=card_label["id"])
+        _set_translations(label, card_label["translations"])
+        labels.append(label)
+    set_prefetched_objects(hearing, "labels", labels)
+
+    main_sections = []
+    if card.main_section_id is not None:
+        section = Section(
+            pk=card.main_section_id,
+            hearing=hearing,
+            plugin_fullscreen=card.default_to_fullscreen,
+        )
+        _set_translations(section, card.abstract)
+        images = []
+        if card.main_image is not None:
+            image = SectionImage(
+                pk=card.main_image["id"],
+                section=section,
+                image=card.main_image["image"],
+                width=card.main_image["width"],
+                height=card.main_image["height"],
+                published=True,
+            )
+            _set_translations(image, card.main_image["translations"])
+            images.append(image)
+        set_prefetched_objects(section, "images", images)
+        main_sections.append(section)
+    hearing.main_section_list = main_sections
+
+    if hearing.organization_id is not None:
+        hearing.organization = Organization(
+            pk=hearing.organization_id, name=card.organization_name
+        )
+    if hearing.project_phase_id is not None and card.project is not None:
+        hearing.project_phase = ProjectPhase(
+            pk=hearing.project_phase_id,
+            project=_restore_project(card.project, visible_hearing_ids),
+        )
+
+
+def _get_pending():
+    if not hasattr(_pending, "lookups"):
+        _pending.lookups = defaultdict(set)
+    return _pending.lookups
+
+
+def _update_pending_hearing_cards():
+    lookups = _get_pending()
+    if not lookups:
+        return
+    q = reduce(or_, (Q(**{"%s__in" % lookup: pks}) for lookup, pks in lookups.items()))
+    lookups.clear()
+    hearing_ids = set(
+        Hearing.original_manager.filter(q).values_list("pk", flat=True).distinct()
+    )
+    if hearing_ids:
+        update_hearing_cards(hearing_ids)
+
+
+def schedule_hearing_card_update(model, pks):
+    """
+    Update the cards of the hearings related to the given rows once the
+    current transaction has been committed.
+
+    :param model: One of the models in CARD_SOURCE_LOOKUPS
+    :param pks: Primary keys of the changed rows
+    """
+    if not settings.HEARING_CARDS:
+        return
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    _get_pending()[CARD_SOURCE_LOOKUPS[model]].update(pks)
+    # the first callback run updates the cards of everything pending
+    transaction.on_commit(_update_pending_hearing_cards)
+
+
+def _is_counter_update(update_fields):
+    return bool(update_fields) and set(update_fields) <= COUNTER_FIELDS
+
+
+def _remember_project_phase(sender, instance, update_fields=None, **kwargs):
+    # the hearings of the previous project no longer list this hearing
+    if not settings.HEARING_CARDS or _is_counter_update(update_fields):
+        return
+    if instance.pk:
+        instance._card_previous_project_phase_id = (
+            Hearing.original_manager.filter(pk=instance.pk)
+            .values_list("project_phase_id", flat=True)
+            .first()
+        )
+
+
+def _hearing_saved(sender, instance, update_fields=None, **kwargs):
+    if _is_counter_update(update_fields):
+        return
+    schedule_hearing_card_update(Hearing, [instance.pk])
+    schedule_hearing_card_update(
+        ProjectPhase,
+        [
+            instance.project_phase_id,
+            getattr(instance, "_card_previous_project_phase_id", None),
+        ],
+    )
+
+
+def _source_changed(sender, instance, update_fields=None, **kwargs):
+    if not _is_counter_update(update_fields):
+        schedule_hearing_card_update(sender, [instance.pk])
+
+
+def _translation_changed(sender, instance, **kwargs):
+    model = instance._meta.get_field("master").related_model
+    schedule_hearing_card_update(model, [instance.master_id])
+
+
+def _hearing_labels_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            schedule_hearing_card_update(Hearing, [instance.pk])
+    elif action in ("post_add", "post_remove"):
+        schedule_hearing_card_update(Hearing, pk_set)
+    elif action == "pre_clear" and settings.HEARING_CARDS:
+        schedule_hearing_card_update(
+            Hearing, instance.hearing_set.values_list("pk", flat=True)
+        )
+
+
+def _soft_delete_changed(sender, changed, **kwargs):
+    for model, pks in changed.items():
+        if model in CARD_SOURCE_LOOKUPS:
+            schedule_hearing_card_update(model, pks)
+
+
+def connect_hearing_card_signals():
+    """
+    Update the hearing cards whenever the data they are built from changes.
+    """
+    pre_save.connect(
+        _remember_project_phase,
+        sender=Hearing,
+        dispatch_uid="hearing_card_remember_project_phase",
+    )
+    post_save.connect(
+        _hearing_saved, sender=Hearing, dispatch_uid="hearing_card_hearing_saved"
+    )
+    m2m_changed.connect(
+        _hearing_labels_changed,
+        sender=Hearing.labels.through,
+        dispatch_uid="hearing_card_labels_changed",
+    )
+    soft_delete_changed.connect(
+        _soft_delete_changed, dispatch_uid="hearing_card_soft_delete_changed"
+    )
+    for model in CARD_SOURCE_LOOKUPS:
+        if model is not Hearing:
+            dispatch_uid = "hearing_card_source_changed_%s" % model._meta.label
+            post_save.connect(_source_changed, sender=model, dispatch_uid=dispatch_uid)
+            post_delete.connect(
+                _source_changed, sender=model, dispatch_uid=dispatch_uid
+            )
+        if hasattr(model, "_parler_meta"):
+            dispatch_uid = "hearing_card_translation_changed_%s" % model._meta.label
+            for meta in model._parler_meta:
+                post_save.connect(
+                    _translation_changed, sender=meta.model, dispatch_uid=dispatch_uid
+                )
+                post_delete.connect(
+                    _translation_changed, sender=meta.model, dispatch_uid=dispatch_uid
+                )
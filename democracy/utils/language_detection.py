@@ -0,0 +1,57 @@
+"""
+Background detection of the languages of section comments.
+
+When LANGUAGE_DETECTION_EAGER is turned off, saving a comment without a
+language only marks it pending with `language_detection_pending`, and the
+languages of the pending comments are detected in batches by the
+detect_comment_languages management command. The pending comments work as a
+queue: a batch is locked with SKIP LOCKED, so several workers can process the
+queue at the same time.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+
+from democracy.models import SectionComment
+
+
+def detect_pending_comment_languages(batch_size):
+    """
+    Detect the languages of a batch of pending comments.
+
+    :param batch_size: maximum number of comments to process
+    :return: number of processed comments
+    """
+    with transaction.atomic():
+        comments = list(
+            SectionComment.objects.everything()
+            .filter(language_detection_pending=True)
+            .select_for_update(skip_locked=True)
+            .only("pk", "content", "language_code")
+            .order_by("pk")[:batch_size]
+        )
+        for comment in comments:
+            if not comment.language_code and comment.content:
+                comment._detect_lang()
+            comment.language_detection_pending = False
+        SectionComment.objects.bulk_update(
+            comments, ["language_code", "language_detection_pending"]
+        )
+    return len(comments)
+
+
+def queue_comments_without_language():
+    """
+    Mark the comments without a detected language pending detection.
+
+    Used to backfill the languages of the comments saved before the detection,
+    including the ones whose language could not be detected before.
+
+    :return: number of queued comments
+    """
+    return (
+        SectionComment.objects.everything()
+        .filter(language_code="", language_detection_pending=False)
+        .filter(~Q(content=""))
+        .update(language_detection_pending=True)
+    )
@@ -0,0 +1,79 @@
+"""
+MinHash signatures and locality-sensitive hashing of comment texts.
+
+The text is split into overlapping word shingles, and the signature holds the
+smallest hash of the shingles under each of MINHASH_PERMUTATIONS hash
+functions. The share of equal values in two signatures estimates the Jaccard
+similarity of the shingle sets. The signature is split into LSH_BANDS bands,
+each hashed into a bucket; texts sharing a bucket are candidates for near
+duplicates, which finds pairs with similarity above about 0.5 with high
+probability without comparing all the pairs.
+"""
+
+import hashlib
+import random
+
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+
+_PRIME = (1 << 61) - 1
+_random = random.Random(4242)
+# the hash functions, h(x) = (a * x + b) mod prime
+_PERMUTATIONS = [
+    (_random.randrange(1, _PRIME), _random.randrange(0, _PRIME))
+    for _x in range(MINHASH_PERMUTATIONS)
+]
+
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def get_shingles(text):
+    """
+    Return the hashes of the word shingles of the text.
+
+    The text is compared case-insensitively, ignoring punctuation and
+    differences in whitespace.
+    """
+    words = "".join(c if c.isalnum() else " " for c in (text or "").lower()).split()
+    if not words:
+        return set()
+    count = max(len(words) - SHINGLE_SIZE + 1, 1)
+    return {
+        _hash64(" ".join(words[i : i + SHINGLE_SIZE]).encode()) for i in range(count)
+    }
+
+
+def get_minhash_signature(text):
+    """
+    Return the MinHash signature of the text, or an empty list for no words.
+    """
+    shingles = get_shingles(text)
+    if not shingles:
+        return []
+    return [min((a * x + b) % _PRIME for x in shingles) for a, b in _PERMUTATIONS]
+
+
+def get_lsh_buckets(signature):
+    """
+    Return the LSH buckets of the signature, one per band.
+
+    The band number is hashed into the bucket, so buckets of different bands
+    never collide. The buckets are signed 64-bit integers.
+    """
+    buckets = []
+    for band in range(LSH_BANDS if signature else 0):
+        rows = signature[band * LSH_ROWS : (band + 1) * LSH_ROWS]
+        data = ",".join(map(str, (band, *rows))).encode()
+        buckets.append(_hash64(data) - (1 << 63))
+    return buckets
+
+
+def estimate_similarity(signature, other):
+    """Return the estimated Jaccard similarity of the texts of two signatures."""
+    if not (signature and other):
+        return 0.0
+    return sum(x == y for x, y in zip(signature, other)) / len(signature)
@@ -0,0 +1,216 @@
+"""
+Saving of the poll answers given with section comments.
+
+The answers of a comment are given as a list of
+{"question": poll ID, "answers": [option IDs]} dicts. All the polls and options
+the answers refer to are loaded with one query and validated in memory, the
+new answers are inserted with one query and the answer counts of the options
+and polls are incremented with one update each.
+"""
+
+from collections import Counter
+
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import ValidationError
+
+from democracy.models import SectionPoll, SectionPollAnswer, SectionPollOption
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_answer_option_ids(answers):
+    """
+    Return the set of the IDs of the options chosen in the answers.
+    """
+    return {_to_int(option_id) for answer in answers for option_id in answer["answers"]}
+
+
+def _load_options(answers):
+    poll_ids = {_to_int(answer["question"]) for answer in answers} - {None}
+    options = SectionPollOption.objects.filter(poll__in=poll_ids).select_related("poll")
+    polls = {}
+    options_by_poll = {}
+    for option in options:
+        polls[option.poll_id] = option.poll
+        options_by_poll.setdefault(option.poll_id, {})[option.pk] = option
+    return polls, options_by_poll
+
+
+def _validate_answers(answers, polls, options_by_poll, user=None):
+    """
+    Check the answers and return them as (poll ID, [options]) tuples.
+
+    :param user: the user to check has not answered the polls before, or None
+    """
+    for answer in answers:
+        poll = polls.get(_to_int(answer["question"]))
+        if (
+            len(answer["answers"]) > 1
+            and poll is not None
+            and poll.type == SectionPoll.TYPE_SINGLE_CHOICE
+        ):
+            raise ValidationError(
+                {"answers": [_("A single choice poll may not have several answers.")]}
+            )
+
+    if user is not None and user.is_authenticated:
+        # Authenticated users can only have one answer per poll.
+        answered_poll_ids = {
+            _to_int(answer["question"]) for answer in answers if answer["answers"]
+        } - {None}
+        if (
+            answered_poll_ids
+            and SectionPollAnswer.objects.filter(
+                option__poll__in=answered_poll_ids, comment__created_by=user
+            ).exists()
+        ):
+            raise ValidationError({"answers": [_("You have already voted.")]})
+
+    validated = []
+    for answer in answers:
+        poll_id = _to_int(answer["question"])
+        poll_options = options_by_poll.get(poll_id, {})
+        options = []
+        for option_id in answer["answers"]:
+            option = poll_options.get(_to_int(option_id))
+            if option is None:
+                raise ValidationError(
+                    {
+                        "option": [
+                            _(
+                                'Invalid id "{id}" - option does not exist in this poll.'  # noqa: E501
+                            ).format(id=option_id)
+                        ]
+                    }
+                )
+            options.append(option)
+        validated.append((poll_id, options))
+    return validated
+
+
+def _add_to_counts(model, deltas):
+    """
+    Add the deltas to the `n_answers` of the objects with one update.
+
+    :param model: the poll or poll option model
+    :param deltas: dict of {object ID: number to add}
+    """
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    model.objects.everything().filter(pk__in=deltas).update(
+        n_answers=F("n_answers")
+        + Case(
+            *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+            default=Value(0),
+        )
+    )
+
+
+def update_answer_counts(option_deltas, new_poll_ids):
+    """
+    Update the answer counts of the options and polls.
+
+    The option counts are the numbers of answers given with the options and the
+    poll counts the numbers of comments that have answered the polls. The
+    counts are updated with database-side additions, so concurrent answers are
+    counted correctly.
+
+    :param option_deltas: Counter of {option ID: change in its answers}
+    :param new_poll_ids: IDs of the polls answered by a comment for the first time
+    """
+    _add_to_counts(SectionPollOption, option_deltas)
+    _add_to_counts(SectionPoll, Counter(new_poll_ids))
+
+
+def create_poll_answers(comment, answers, user=None):
+    """
+    Save the poll answers of a new comment.
+
+    :param comment: the comment
+    :param answers: the answers given with the comment
+    :param user: the user who gave the answers, checked to not have answered
+                 the polls before
+    """
+    if not answers:
+        return
+    polls, options_by_poll = _load_options(answers)
+    validated = _validate_answers(answers, polls, options_by_poll, user=user)
+
+    new_answers = [
+        SectionPollAnswer(comment=comment, option=option)
+        for _poll_id, options in validated
+        for option in options
+    ]
+    SectionPollAnswer.objects.bulk_create(new_answers)
+    update_answer_counts(
+        Counter(answer.option_id for answer in new_answers),
+        {
+            poll_id
+            for poll_id, options in validated
+            if options and not polls[poll_id].deleted
+        },
+    )
+
+
+def update_poll_answers(comment, answers):
+    """
+    Replace the poll answers of an edited comment.
+
+    The answers to the polls in `answers` are replaced with the given ones; the
+    answers to the other polls are kept.
+    """
+    if not answers:
+        return
+    polls, options_by_poll = _load_options(answers)
+    validated = _validate_answers(answers, polls, options_by_poll)
+
+    poll_ids = {poll_id for poll_id, _options in validated}
+    existing_option_ids = Counter()
+    answered_poll_ids = set()
+    # the removed answers stay counted in the polls, see SectionPoll.recache_n_answers
+    for option_id, poll_id, deleted in (
+        SectionPollAnswer.objects.everything()
+        .filter(comment=comment, option__poll__in=poll_ids)
+        .values_list("option_id", "option__poll_id", "deleted")
+    ):
+        answered_poll_ids.add(poll_id)
+        if not deleted:
+            existing_option_ids[option_id] += 1
+
+    options = {
+        option.pk: option for _poll_id, options in validated for option in options
+    }
+    new_answers = [
+        SectionPollAnswer(comment=comment, option=option)
+        for option in options.values()
+        if option.pk not in existing_option_ids
+    ]
+    removed_option_ids = set(existing_option_ids) - set(options)
+
+    SectionPollAnswer.objects.bulk_create(new_answers)
+    if removed_option_ids:
+        SectionPollAnswer.objects.filter(
+            comment=comment, option__in=removed_option_ids
+        ).update(deleted=True, deleted_at=timezone.now())
+
+    option_deltas = Counter(answer.option_id for answer in new_answers)
+    option_deltas.subtract(
+        {option_id: existing_option_ids[option_id] for option_id in removed_option_ids}
+    )
+    update_answer_counts(
+        option_deltas,
+        {
+            answer.option.poll_id
+            for answer in new_answers
+            if answer.option.poll_id not in answered_poll_ids
+            and not polls[answer.option.poll_id].deleted
+        },
+    )
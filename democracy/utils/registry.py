@@ -0,0 +1,179 @@
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.crypto import get_random_string
+
+
+class ModelRegistry:
+    """
+    In-process registry of the rows of a small, rarely changing table.
+
+    All rows are loaded with one query and served from memory by `get`. Every
+    process keeps its own copy, which is reloaded when the version token of the
+    registry in the shared cache changes. The token is replaced whenever a row
+    of the model is saved or deleted, so writes in any process are noticed by
+    the others at the next lookup. Changes the signals cannot see, e.g.
+    queryset updates, are picked up after MODEL_REGISTRY_MAX_AGE seconds.
+
+    The returned instances are shared and must be treated as read-only.
+    """
+
+    def __init__(self, model_label, lookup_fields=(), prefetch=()):
+        """
+        :param model_label: Label of the model, e.g. "democracy.SectionType"
+        :param lookup_fields: Unique fields the rows can be looked up by in
+                              addition to the primary key
+        :param prefetch: Relations to prefetch for the rows
+        """
+        self.model_label = model_label
+        self.lookup_fields = ("pk", *lookup_fields)
+        self.prefetch = prefetch
+        # (version, loaded at, {lookup field: {value: instance}})
+        self._state = None
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def _get_cache(self):
+        return caches[settings.MODEL_REGISTRY_CACHE_ALIAS]
+
+    def _get_version_key(self):
+        return "registry:%s:version" % self.model._meta.label_lower
+
+    def _get_version(self):
+        cache = self._get_cache()
+        key = self._get_version_key()
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, get_random_string(12), None)
+            version = cache.get(key)
+        return version
+
+    def bump_version(self):
+        """
+        Make every process reload the registry at its next lookup.
+        """
+        self._get_cache().set(self._get_version_key(), get_random_string(12), None)
+        self.clear()
+
+    def clear(self):
+        """
+        Make this process reload the registry at its next lookup.
+        """
+        self._state = None
+
+    def _load(self, version):
+        rows = {field: {} for field in self.lookup_fields}
+        for obj in self.model._default_manager.prefetch_related(*self.prefetch):
+            for field in self.lookup_fields:
+                rows[field][getattr(obj, field)] = obj
+        self._state = (version, time.monotonic(), rows)
+        return rows
+
+    def _get_rows(self):
+        version = self._get_version()
+        state = self._state
+        if (
+            state is None
+            or state[0] != version
+            or time.monotonic() - state[1] > settings.MODEL_REGISTRY_MAX_AGE
+        ):
+            return self._load(version), True
+        return state[2], False
+
+    def _to_python(self, field_name, value):
+        opts = self.model._meta
+        field = opts.pk if field_name == "pk" else opts.get_field(field_name)
+        try:
+            return field.to_python(value)
+        except ValidationError as e:
+            # the same error a queryset lookup with an invalid value gives
+            raise ValueError(
+                "Field '%s' expected a %s but got %r."
+                % (field.name, field.get_internal_type(), value)
+            ) from e
+
+    def get(self, **kwargs):
+        """
+        Return the row matching the single lookup given as a keyword argument.
+
+        Values missing from the registry are looked up again after reloading
+        the registry, so rows added by a process whose version update was not
+        seen are found as well.
+
+        :raises DoesNotExist: when there is no matching row
+        :raises ValueError: when the value is invalid for the lookup field
+        """
+        ((field_name, value),) = kwargs.items()
+        if field_name not in self.lookup_fields:
+            raise KeyError("%s is not a lookup field of the registry" % field_name)
+        value = self._to_python(field_name, value)
+        rows, loaded = self._get_rows()
+        obj = rows[field_name].get(value)
+        if obj is None and not loaded:
+            obj = self._load(self._get_version())[field_name].get(value)
+        if obj is None:
+            raise self.model.DoesNotExist(
+                "%s matching query does not exist." % self.model._meta.object_name
+            )
+        return obj
+
+
+section_types = ModelRegistry("democracy.SectionType", lookup_fields=("identifier",))
+labels = ModelRegistry("democracy.Label", prefetch=("translations",))
+organizations = ModelRegistry("democracy.Organization", lookup_fields=("name",))
+
+REGISTRIES = (section_types, labels, organizations)
+
+
+def _get_registry_senders(registry):
+    model = registry.model
+    senders = [model]
+    if hasattr(model, "_parler_meta"):
+        senders.extend(meta.model for meta in model._parler_meta)
+    return senders
+
+
+def connect_registry_signals():
+    """
+    Update the registry versions whenever a registered row or one of its
+    translations is saved or deleted, e.g. in the admin or through the API,
+    or when registered rows are soft deleted in bulk.
+
+    The version is updated right away and once more after the transaction has
+    been committed, so that other processes do not keep rows they reloaded
+    before the commit.
+    """
+    # imported here, as the models use the registries
+    from democracy.models.base import soft_delete_changed
+
+    for registry in REGISTRIES:
+
+        def bump_version(sender, registry=registry, **kwargs):
+            registry.bump_version()
+            transaction.on_commit(registry.bump_version)
+
+        for sender in _get_registry_senders(registry):
+            dispatch_uid = "bump_registry_version_%s" % sender._meta.label
+            post_save.connect(
+                bump_version, sender=sender, weak=False, dispatch_uid=dispatch_uid
+            )
+            post_delete.connect(
+                bump_version, sender=sender, weak=False, dispatch_uid=dispatch_uid
+            )
+
+        def bump_soft_deleted(sender, changed, registry=registry, **kwargs):
+            if registry.model in changed:
+                bump_version(sender)
+
+        soft_delete_changed.connect(
+            bump_soft_deleted,
+            weak=False,
+            dispatch_uid="bump_registry_version_soft_deleted_%s" % registry.model_label,
+        )
@@ -0,0 +1,78 @@
+"""
+Keeping the counters up to date when objects are soft deleted in bulk.
+
+SoftDeleteQuerySet updates the rows without saving them, so the counters that
+are recomputed on save are updated from its `soft_delete_changed` signal:
+once per bulk update, for all the changed objects together.
+"""
+
+from django.db.models import Count
+
+from democracy.models import (
+    Hearing,
+    Section,
+    SectionComment,
+    SectionPollAnswer,
+)
+from democracy.models.base import soft_delete_changed
+from democracy.models.section import recache_thread_reply_counts
+from democracy.utils.poll_answers import update_answer_counts
+
+
+def recache_comment_counts(comments):
+    """
+    Recompute the comment counts of the sections and threads of the comments.
+
+    :param comments: queryset of comments, deleted ones included
+    """
+    section_ids = set(comments.values_list("section_id", flat=True))
+    parent_ids = set(
+        comments.exclude(comment=None).values_list("comment_id", flat=True)
+    )
+    for parent in SectionComment.objects.everything().filter(pk__in=parent_ids):
+        parent.recache_n_comments()
+    recache_thread_reply_counts(
+        comments.exclude(comment=None).values_list("path", flat=True)
+    )
+    for section in Section.objects.everything().filter(pk__in=section_ids):
+        section.recache_n_comments()
+
+
+def _recache_answer_counts(answer_ids, deleted):
+    answer_counts = (
+        SectionPollAnswer.objects.everything()
+        .filter(pk__in=answer_ids)
+        .values("option_id")
+        .annotate(count=Count("pk"))
+        .values_list("option_id", "count")
+    )
+    sign = -1 if deleted else 1
+    # the deleted answers stay counted in the polls, see SectionPoll.recache_n_answers
+    update_answer_counts(
+        {option_id: sign * count for option_id, count in answer_counts}, set()
+    )
+
+
+def _recache_counters(sender, changed, deleted, **kwargs):
+    if changed.get(SectionPollAnswer):
+        _recache_answer_counts(changed[SectionPollAnswer], deleted)
+    if changed.get(SectionComment):
+        recache_comment_counts(
+            SectionComment.objects.everything().filter(pk__in=changed[SectionComment])
+        )
+    if changed.get(Section):
+        for hearing in Hearing.objects.everything().filter(
+            pk__in=Section.objects.everything()
+            .filter(pk__in=changed[Section])
+            .values("hearing_id")
+        ):
+            hearing.recache_n_comments()
+
+
+def connect_soft_delete_signals():
+    """
+    Update the counters whenever objects are soft deleted or undeleted in bulk.
+    """
+    soft_delete_changed.connect(
+        _recache_counters, dispatch_uid="soft_delete_recache_counters"
+    )
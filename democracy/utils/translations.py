@@ -1,18 +1,172 @@
+from collections import defaultdict
+
+from django.apps import apps
 from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.db.models.signals import post_delete, post_save
+
+
+def is_translation_cached(model):
+    """
+    Whether the translations of `model` are kept in the shared translation cache.
+
+    The cached models are listed in the TRANSLATION_CACHE_MODELS setting.
+    """
+    return model._meta.label in settings.TRANSLATION_CACHE_MODELS
+
+
+def _get_translation_cache():
+    return caches[settings.TRANSLATION_CACHE_ALIAS]
+
+
+def _get_translation_cache_key(model, pk):
+    return "translations:%s:%s" % (model._meta.label_lower, pk)
+
+
+def set_prefetched_objects(obj, name, objects):
+    """
+    Set the related objects of `obj` as if they were prefetched.
+
+    Leaves behind the same structure as `prefetch_related(name)`, so the
+    objects are returned by e.g. `obj.<name>.all()` without queries.
+
+    :param obj: The model instance
+    :param name: Name of the many-to-many or reverse foreign key relation
+    :param objects: List of the related objects
+    """
+    queryset = getattr(obj, name).get_queryset()
+    queryset._result_cache = objects
+    queryset._prefetch_done = True
+    if not hasattr(obj, "_prefetched_objects_cache"):
+        obj._prefetched_objects_cache = {}
+    obj._prefetched_objects_cache[name] = queryset
+
+
+def _load_cached_translations(model, objects):
+    """
+    Set the translations of `objects` from the translation cache.
+
+    Translations missing from the cache are loaded from the database and
+    stored in the cache.
+
+    :return: The objects whose translations were not in the cache
+    """
+    cache = _get_translation_cache()
+    translation_model = model._parler_meta.root_model
+    field_names = [field.attname for field in translation_model._meta.concrete_fields]
+    keys = {obj: _get_translation_cache_key(model, obj.pk) for obj in objects}
+    cached_rows = cache.get_many(keys.values())
+
+    missing = []
+    for obj, key in keys.items():
+        if key not in cached_rows:
+            missing.append(obj)
+            continue
+        set_prefetched_objects(
+            obj,
+            "translations",
+            [
+                translation_model.from_db(obj._state.db, field_names, row)
+                for row in cached_rows[key]
+            ],
+        )
+
+    if missing:
+        prefetch_related_objects(missing, "translations")
+        cache.set_many(
+            {
+                keys[obj]: [
+                    tuple(getattr(translation, name) for name in field_names)
+                    for translation in obj.translations.all()
+                ]
+                for obj in missing
+            },
+            settings.TRANSLATION_CACHE_TIMEOUT,
+        )
+    return missing
+
+
+def invalidate_cached_translations(model, pk):
+    """
+    Remove the translations of a model instance from the translation cache.
+    """
+    _get_translation_cache().delete(_get_translation_cache_key(model, pk))
+
+
+def _invalidate_translation(sender, instance, **kwargs):
+    model = instance._meta.get_field("master").related_model
+    if is_translation_cached(model):
+        pk = instance.master_id
+        invalidate_cached_translations(model, pk)
+        # concurrent requests may have cached the old rows before the commit
+        transaction.on_commit(lambda: invalidate_cached_translations(model, pk))
+
+
+def connect_translation_cache_signals():
+    """
+    Invalidate the cached translations whenever a translation is saved or
+    deleted, e.g. in `save_translations`.
+    """
+    for model in apps.get_models():
+        if not hasattr(model, "_parler_meta"):
+            continue
+        for meta in model._parler_meta:
+            dispatch_uid = "invalidate_cached_translations_%s" % meta.model._meta.label
+            post_save.connect(
+                _invalidate_translation, sender=meta.model, dispatch_uid=dispatch_uid
+            )
+            post_delete.connect(
+                _invalidate_translation, sender=meta.model, dispatch_uid=dispatch_uid
+            )
+
+
+def load_translations(objects):
+    """
+    Load the translations of the given model instances in one query per model.
+
+    Instances whose translations have already been prefetched and instances of
+    untranslated models are left as they are. Translations of the models in the
+    shared translation cache are read from the cache when possible. The loaded
+    translations are stored the same way as with
+    `prefetch_related("translations")`, so parler and `get_translations_dict`
+    use them without further queries.
+
+    :param objects: Iterable of model instances
+    :return: The given objects
+    """
+    objects_by_model = defaultdict(list)
+    for obj in objects:
+        if not hasattr(obj, "_parler_meta") or obj.pk is None:
+            continue
+        if "translations" in getattr(obj, "_prefetched_objects_cache", {}):
+            continue
+        objects_by_model[type(obj)].append(obj)
+    for model, model_objects in objects_by_model.items():
+        if is_translation_cached(model):
+            _load_cached_translations(model, model_objects)
+        else:
+            prefetch_related_objects(model_objects, "translations")
+    return objects
 
 
 def get_translations_dict(obj, field_name):
     """
     Returns a dict of translations for a given field of a model instance.
 
+    Prefetched translations are used when present, otherwise all translations
+    of the instance are loaded at once and reused by the following calls.
+
     :param obj: The model instance
     :param field_name: The name of the field
     :return: A dict with language codes as keys and translations as values
     """
-
+    load_translations([obj])
+    translations = {
+        translation.language_code: translation for translation in obj.translations.all()
+    }
     return {
-        lang_code: getattr(
-            obj.translations.filter(language_code=lang_code).first(), field_name, ""
-        )
+        lang_code: getattr(translations.get(lang_code), field_name, "")
         for lang_code, _ in settings.LANGUAGES
     }
@@ -1,6 +1,10 @@
 from democracy.views.contact_person import ContactPersonViewSet
 from democracy.views.hearing import HearingViewSet
 from democracy.views.label import LabelViewSet
+from democracy.views.moderation import (
+    CommentModerationViewSet,
+    ModerationQueueViewSet,
+)
 from democracy.views.organization import OrganizationViewSet
 from democracy.views.project import ProjectViewSet
 from democracy.views.section import (
@@ -14,12 +18,14 @@ from democracy.views.section_comment import CommentViewSet, SectionCommentViewSe
 from democracy.views.user import UserDataViewSet
 
 __all__ = [
+    "CommentModerationViewSet",
     "CommentViewSet",
     "ContactPersonViewSet",
     "FileViewSet",
     "HearingViewSet",
     "ImageViewSet",
     "LabelViewSet",
+    "ModerationQueueViewSet",
     "OrganizationViewSet",
     "ProjectViewSet",
     "RootSectionViewSet",
@@ -1,11 +1,22 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import StreamingHttpResponse
 from django.urls import reverse
-from rest_framework import serializers
+from django.utils.functional import cached_property
+from rest_framework import permissions, serializers
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from audit_log.enums import Operation
+from audit_log.utils import add_audit_logged_object_ids, set_audit_log_operation
+from audit_log.views import AuditLogApiView
 from democracy.models.base import BaseModel
 from democracy.models.files import BaseFile
 from democracy.models.images import BaseImage
+from democracy.renderers import GeoJSONRenderer
+from democracy.views.utils import get_compiled_serializer_class, get_include_list
 
 
 class UserFieldSerializer(serializers.ModelSerializer):
@@ -101,3 +112,191 @@ class AdminsSeeUnpublishedMixin(object):
     def _get_user_from_request_or_context(self):
         if hasattr(self, "request"):  # pragma: no branch
             return getattr(self.request, "user", None)
+
+
+class GeoJSONStreamingMixin(object):
+    """
+    Stream GeoJSON list responses one feature at a time.
+
+    When the GeoJSON renderer is selected, the list is rendered from a queryset
+    iterator with `GeoJSONRenderer.render_stream` instead of serializing the
+    whole list first, so memory use does not grow with the size of the result
+    and the first bytes are sent right away.
+    """
+
+    geojson_stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, GeoJSONRenderer):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = None
+        if self.paginator is not None:
+            page = self.paginator.paginate_queryset(queryset, request, view=self)
+
+        if page is not None:
+            items = page
+            pagination = self.get_paginated_response([]).data
+        else:
+            items = queryset.iterator(chunk_size=self.geojson_stream_chunk_size)
+            pagination = None
+
+        if isinstance(self, AuditLogApiView):
+            # log the ids up front, the audit log is committed before the
+            # response body is consumed
+            add_audit_logged_object_ids(
+                request,
+                page
+                if page is not None
+                else queryset.select_related(None).prefetch_related(None).only("pk"),
+            )
+
+        serializer = self.get_serializer(many=True)
+        return StreamingHttpResponse(
+            renderer.render_stream(
+                items,
+                serializer.child.to_representation,
+                pagination=pagination,
+                accepted_media_type=request.accepted_media_type,
+                renderer_context=self.get_renderer_context(),
+            ),
+            content_type=renderer.media_type,
+        )
+
+
+class CompiledListSerializerMixin(object):
+    """
+    Serialize list responses with a compiled serializer.
+
+    Enabled with the COMPILED_READ_SERIALIZERS setting. The output is the same,
+    see `CompiledSerializerMixin`.
+    """
+
+    def get_serializer_class(self):
+        serializer_class = super().get_serializer_class()
+        if (
+            self.action in ("list", "batch")
+            and settings.COMPILED_READ_SERIALIZERS
+            and not getattr(self, "swagger_fake_view", False)
+        ):
+            return get_compiled_serializer_class(serializer_class)
+        return serializer_class
+
+
+def _parse_field_list(value):
+    return {field.strip() for field in (value or "").split(",") if field.strip()}
+
+
+class SparseFieldsetMixin(object):
+    """
+    Support `?fields=` and `?omit=` for choosing the returned fields.
+
+    Both take a comma separated list of top level field names; `fields` lists
+    the fields to return and `omit` the ones to leave out. The other fields are
+    removed from the serializer, and views skip selecting and prefetching the
+    data of fields that are not returned with `is_field_requested`.
+    """
+
+    sparse_fieldset_actions = ("list", "retrieve", "batch")
+
+    @cached_property
+    def _sparse_fieldset(self):
+        if self.action not in self.sparse_fieldset_actions:
+            return None, set()
+        query_params = self.request.query_params
+        fields = _parse_field_list(query_params.get("fields"))
+        omit = _parse_field_list(query_params.get("omit"))
+        # included data is returned even if its field is not listed
+        included_fields = {
+            name.split(".")[0] for name in get_include_list(self.request)
+        }
+        fields = fields and fields | included_fields
+        renderer = getattr(self.request, "accepted_renderer", None)
+        if isinstance(renderer, GeoJSONRenderer):
+            # the GeoJSON features are built from these
+            geojson_fields = {"id", "geojson"}
+            fields = fields and fields | geojson_fields
+            omit -= geojson_fields
+        return fields or None, omit
+
+    def is_field_requested(self, field_name):
+        fields, omit = self._sparse_fieldset
+        if fields is not None and field_name not in fields:
+            return False
+        return field_name not in omit
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.action in self.sparse_fieldset_actions:
+            fields = getattr(serializer, "child", serializer).fields
+            for field_name in list(fields):
+                if not self.is_field_requested(field_name):
+                    del fields[field_name]
+        return serializer
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+
+    def validate_ids(self, ids):
+        max_ids = settings.BATCH_MAX_IDS
+        if len(ids) > max_ids:
+            raise serializers.ValidationError(
+                "At most %d IDs can be fetched at once." % max_ids
+            )
+        # keep the order of the first occurrences
+        return list(dict.fromkeys(ids))
+
+
+class BatchRetrieveMixin(object):
+    """
+    Add a `batch` action returning the objects with the given IDs in one request.
+
+    The objects are looked up from the queryset of the view, so they are
+    filtered and prefetched like the list, and serialized with the list
+    serializer. The results are in the order of the IDs, and the IDs that match
+    no visible object are returned in `missing` instead of failing the request.
+    """
+
+    def filter_batch_queryset(self, queryset, ids):
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for key in ids:
+            try:
+                pk = pk_field.to_python(key)
+                # e.g. integers out of the range of the database column
+                pk_field.run_validators(pk)
+            except DjangoValidationError:
+                continue
+            pks.append(pk)
+        return queryset.filter(pk__in=pks)
+
+    def get_batch_keys(self, obj):
+        """Return the IDs `obj` can be requested with."""
+        return (str(obj.pk),)
+
+    @action(detail=False, methods=["post"], permission_classes=[permissions.AllowAny])
+    def batch(self, request, *args, **kwargs):
+        batch_serializer = BatchRequestSerializer(data=request.data)
+        batch_serializer.is_valid(raise_exception=True)
+        ids = batch_serializer.validated_data["ids"]
+
+        found = {}
+        for obj in self.filter_batch_queryset(self.get_queryset(), ids):
+            for key in self.get_batch_keys(obj):
+                found[key] = obj
+        objects = [found[key] for key in ids if key in found]
+        if isinstance(self, AuditLogApiView):
+            add_audit_logged_object_ids(request, objects)
+            # the IDs are posted but nothing is created
+            set_audit_log_operation(request, Operation.READ)
+
+        serializer = self.get_serializer(objects, many=True)
+        return Response(
+            {
+                "results": serializer.data,
+                "missing": [key for key in ids if key not in found],
+            }
+        )
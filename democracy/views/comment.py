@@ -1,6 +1,8 @@
 import django_filters
 import reversion
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.db.models import Prefetch
 from django.utils import timezone
 from django.utils.encoding import force_str as force_text
@@ -12,11 +14,18 @@ from reversion.views import RevisionMixin
 
 from audit_log.utils import add_audit_logged_object_ids
 from audit_log.views import AuditLogApiView
-from democracy.models.comment import BaseComment
+from democracy.models.comment import BaseComment, get_content_fingerprint
 from democracy.renderers import GeoJSONRenderer
-from democracy.views.base import AdminsSeeUnpublishedMixin, CreatedBySerializer
+from democracy.utils.comment_duplicates import find_duplicate_comment
+from democracy.views.base import (
+    AdminsSeeUnpublishedMixin,
+    CompiledListSerializerMixin,
+    CreatedBySerializer,
+    GeoJSONStreamingMixin,
+    SparseFieldsetMixin,
+)
 from democracy.views.openapi import RESPONSE_WITH_STATUS
-from democracy.views.utils import GeoJSONField
+from democracy.views.utils import GeoJSONField, get_include_list
 
 COMMENT_FIELDS = [
     "id",
@@ -51,7 +60,7 @@ class BaseCommentSerializer(CreatedBySerializer, serializers.ModelSerializer):
         r = super().to_representation(instance)
         request = self.context.get("request", None)
         if request:
-            if request.GET.get("include", None) == "plugin_data":
+            if "plugin_data" in get_include_list(request):
                 r["plugin_data"] = instance.plugin_data
         return r
 
@@ -84,8 +93,48 @@ class BaseCommentFilterSet(django_filters.rest_framework.FilterSet):
         ]
 
 
+def select_and_prefetch_comment_data(queryset, is_requested):
+    """
+    Select and prefetch the related data of the comment fields that are returned.
+
+    :param queryset: queryset of comments
+    :param is_requested: function telling whether a field is returned
+    """
+    if any(map(is_requested, ("creator_email", "can_edit", "can_delete"))):
+        queryset = queryset.select_related("created_by")
+    if is_requested("organization"):
+        queryset = queryset.select_related("organization")
+    if any(map(is_requested, ("can_edit", "can_delete", "hearing", "hearing_data"))):
+        queryset = queryset.select_related("section").prefetch_related(
+            "section__hearing",
+            "section__hearing__translations",
+            "section__translations",
+        )
+    if is_requested("comments"):
+        queryset = queryset.prefetch_related(
+            Prefetch(
+                "comments", queryset.model.objects.everything().only("pk", "comment")
+            )
+        )
+    if is_requested("images"):
+        queryset = queryset.prefetch_related("images")
+    if is_requested("answers"):
+        queryset = queryset.prefetch_related(
+            "poll_answers",
+            "poll_answers__option",
+            "poll_answers__option__poll",
+        )
+    return queryset
+
+
 class BaseCommentViewSet(
-    AdminsSeeUnpublishedMixin, RevisionMixin, AuditLogApiView, viewsets.ModelViewSet
+    GeoJSONStreamingMixin,
+    SparseFieldsetMixin,
+    CompiledListSerializerMixin,
+    AdminsSeeUnpublishedMixin,
+    RevisionMixin,
+    AuditLogApiView,
+    viewsets.ModelViewSet,
 ):
     """
     Base viewset for comments.
@@ -101,9 +150,10 @@ class BaseCommentViewSet(
     ]
 
     def get_serializer(self, *args, **kwargs):
-        serializer_class = (
-            kwargs.pop("serializer_class", None) or self.get_serializer_class()
-        )
+        serializer_class = kwargs.pop("serializer_class", None)
+        if serializer_class is None:
+            # the read serializer, pruned by SparseFieldsetMixin
+            return super().get_serializer(*args, **kwargs)
         context = kwargs["context"] = self.get_serializer_context()
         if (
             serializer_class is self.edit_serializer_class and "data" in kwargs
@@ -132,20 +182,10 @@ class BaseCommentViewSet(
         return context
 
     def apply_select_and_prefetch(self, queryset):
-        return queryset.select_related(
-            "created_by",
-            "organization",
-            "section",
-        ).prefetch_related(
-            Prefetch("comments", self.model.objects.everything().only("pk", "comment")),
-            "images",
-            "poll_answers",
-            "poll_answers__option",
-            "poll_answers__option__poll",
-            "section__hearing",
-            "section__hearing__translations",
-            "section__translations",
-        )
+        """
+        Select and prefetch the related data of the returned fields.
+        """
+        return select_and_prefetch_comment_data(queryset, self.is_field_requested)
 
     def get_queryset(self):
         """
@@ -214,17 +254,66 @@ class BaseCommentViewSet(
             serializer_class=self.edit_serializer_class, data=request.data
         )
         serializer.is_valid(raise_exception=True)
-        save_kwargs = {}
-        if self.request.user.is_authenticated:
-            save_kwargs["created_by"] = self.request.user
-        comment = serializer.save(**save_kwargs)
-        add_audit_logged_object_ids(self.request, serializer.instance)
-        reversion.set_comment("Comment created")
-        # and another for the response
-        serializer = self.get_serializer(instance=comment)
-        self.create_related(request, instance=comment)
+        # the duplicate check locks the fingerprint until the comment is created
+        with transaction.atomic():
+            duplicate = self.get_duplicate_comment(serializer.validated_data)
+            if duplicate is not None:
+                return self.duplicate_comment_response(duplicate)
+            save_kwargs = {}
+            if self.request.user.is_authenticated:
+                save_kwargs["created_by"] = self.request.user
+            comment = serializer.save(**save_kwargs)
+            add_audit_logged_object_ids(self.request, serializer.instance)
+            reversion.set_comment("Comment created")
+            # and another for the response
+            serializer = self.get_serializer(instance=comment)
+            self.create_related(request, instance=comment)
         return response.Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    def get_duplicate_comment(self, validated_data):
+        """
+        Return the comment a new comment would duplicate, if any.
+
+        A comment duplicates a comment of the same user with the same content,
+        location and answers in the same parent and reply thread written in the
+        last COMMENT_DUPLICATE_WINDOW seconds.
+        """
+        model = self.edit_serializer_class.Meta.model
+        parent = validated_data.get(model.parent_field)
+        if parent is None:
+            return None
+        fingerprint = get_content_fingerprint(
+            parent.pk,
+            validated_data.get("content"),
+            validated_data.get("plugin_data"),
+            reply_to_id=getattr(validated_data.get("comment"), "pk", None),
+            geojson=validated_data.get("geojson"),
+        )
+        return find_duplicate_comment(
+            model,
+            fingerprint,
+            self.request.user,
+            settings.COMMENT_DUPLICATE_WINDOW,
+            option_ids=self.get_answer_option_ids(),
+        )
+
+    def get_answer_option_ids(self):
+        """
+        Return the IDs of the poll options the new comment answers, if any.
+        """
+        return None
+
+    def duplicate_comment_response(self, duplicate):
+        if settings.COMMENT_DUPLICATE_ACTION == "merge":
+            # the new comment is taken to be a resubmission of the earlier one
+            add_audit_logged_object_ids(self.request, duplicate)
+            serializer = self.get_serializer(instance=duplicate)
+            return response.Response(serializer.data, status=status.HTTP_200_OK)
+        return response.Response(
+            {"status": "Duplicate comment.", "id": duplicate.pk},
+            status=status.HTTP_409_CONFLICT,
+        )
+
     def update(self, request, *args, **kwargs):
         resp = self._check_may_comment(request)
         if resp:
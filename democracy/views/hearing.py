@@ -2,9 +2,12 @@ from collections import defaultdict
 
 import django_filters
 from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
 from django.db import transaction
 from django.db.models import Prefetch, Q
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.functional import cached_property
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     OpenApiParameter,
@@ -30,20 +33,53 @@ from democracy.models import (
     Project,
     ProjectPhase,
     Section,
+    SectionComment,
+    SectionFile,
+    SectionImage,
     SectionPoll,
     SectionPollOption,
 )
 from democracy.pagination import DefaultLimitPagination
 from democracy.renderers import GeoJSONRenderer
-from democracy.views.base import AdminsSeeUnpublishedMixin
+from democracy.utils import registry
+from democracy.utils.comment_clusters import (
+    find_near_duplicates,
+    get_near_duplicate_clusters,
+)
+from democracy.utils.hearing_cards import (
+    get_card_phase_hearing_ids,
+    restore_hearing_card,
+)
+from democracy.views.base import (
+    AdminsSeeUnpublishedMixin,
+    BatchRequestSerializer,
+    BatchRetrieveMixin,
+    CompiledListSerializerMixin,
+    GeoJSONStreamingMixin,
+    SparseFieldsetMixin,
+)
 from democracy.views.contact_person import ContactPersonSerializer
+from democracy.views.hearing_include import get_hearing_includes
 from democracy.views.hearing_report import HearingReport
 from democracy.views.label import LabelSerializer
 from democracy.views.openapi import (
     BBOX_PARAM,
+    COMMENT_CLUSTERS_PARAMS,
+    COMMENT_CLUSTERS_RESPONSE,
     HEARING_ORDERING_PARAM,
     INCLUDE_PARAM,
+    LANG_PARAM,
+    POLL_CROSSTAB_PARAMS,
+    POLL_CROSSTAB_RESPONSE,
+    POLL_RESULTS_RESPONSE,
     RESPONSE_WITH_STATUS,
+    SPARSE_FIELDSET_PARAMS,
+    batch_response,
+)
+from democracy.views.poll_results import (
+    PollCrosstabQuerySerializer,
+    get_hearing_poll_results,
+    get_poll_crosstab,
 )
 from democracy.views.project import (
     ProjectCreateUpdateSerializer,
@@ -65,9 +101,20 @@ from democracy.views.utils import (
     NestedPKRelatedField,
     TranslatableSerializer,
     filter_by_hearing_visible,
+    get_compiled_serializer_class,
+    get_include_list,
+    get_translation_languages,
     get_translation_list,
+    pick_translation,
+    prefetch_translations,
+    translations_prefetch,
 )
 
+# actions serializing a single hearing with HearingSerializer
+HEARING_DETAIL_ACTIONS = ("retrieve", "report", "report_pptx")
+# actions serializing hearings with HearingListSerializer
+HEARING_LIST_ACTIONS = ("list", "batch")
+
 
 class HearingFilterSet(django_filters.rest_framework.FilterSet):
     open_at_lte = django_filters.IsoDateTimeFilter(
@@ -105,6 +152,11 @@ class HearingFilterSet(django_filters.rest_framework.FilterSet):
         method="filter_created_by",
         help_text="Filter by creator ('me' for current user or organization name)",
     )
+    id__in = django_filters.Filter(
+        method="filter_id_in",
+        widget=django_filters.widgets.CSVWidget,
+        help_text="Filter by hearing ID or slug (comma-separated for multiple)",
+    )
 
     def filter_following(self, queryset, name, value):
         if value and self.request.user.is_authenticated:
@@ -134,11 +186,14 @@ class HearingFilterSet(django_filters.rest_framework.FilterSet):
 
         try:
             # Filter by organization name if organization exists.
-            organization = Organization.objects.get(name=value)
+            organization = registry.organizations.get(name=value)
             return queryset.filter(organization=organization)
         except Organization.DoesNotExist:
             return queryset
 
+    def filter_id_in(self, queryset, name, value):
+        return queryset.filter(Q(pk__in=value) | Q(slug__in=value))
+
     class Meta:
         model = Hearing
         fields = ["published", "open_at_lte", "open_at_gt", "title", "label"]
@@ -149,6 +204,7 @@ class HearingCreateUpdateSerializer(
 ):
     labels = NestedPKRelatedField(
         queryset=Label.objects.all(),
+        registry=registry.labels,
         many=True,
         expanded=True,
         serializer=LabelSerializer,
@@ -355,10 +411,8 @@ class HearingCreateUpdateSerializer(
         sections = self._create_or_update_sections(hearing, sections_data)
         self._create_or_update_project(hearing, project_data)
         new_section_ids = set([section.id for section in sections])
-        for section in hearing.sections.exclude(id__in=new_section_ids):
-            for image in section.images.all():
-                image.soft_delete()
-            section.soft_delete()
+        # the images and files of the sections are deleted with them
+        hearing.sections.exclude(id__in=new_section_ids).soft_delete()
 
         return hearing
 
@@ -414,12 +468,16 @@ class HearingCreateUpdateSerializer(
         main_section = self._get_main_section(hearing)
         if not main_section:
             return ""
+        language_codes = self.translation_languages
         translations = {
             t.language_code: t.abstract
             for t in get_translation_list(
-                main_section, language_codes=self.Meta.translation_lang
+                main_section,
+                language_codes=language_codes or self.translation_lang,
             )
         }
+        if language_codes is not None:
+            return pick_translation(translations, language_codes)
         abstract = {}
         for lang_code, translation in translations.items():
             if translation:
@@ -467,6 +525,42 @@ class HearingCreateUpdateSerializer(
         return data
 
 
+def hearing_section_queryset(request, language_codes):
+    """
+    Sections with everything the sections of a hearing detail are serialized with.
+
+    :param request: the request, which decides the visible images and files
+    :param language_codes: language codes of the translations, or None for all
+    """
+    return Section.objects.select_related("type").prefetch_related(
+        translations_prefetch(Section, language_codes),
+        Prefetch(
+            "polls",
+            SectionPoll.objects.prefetch_related(
+                translations_prefetch(SectionPoll, language_codes),
+                Prefetch(
+                    "options",
+                    SectionPollOption.objects.prefetch_related(
+                        translations_prefetch(SectionPollOption, language_codes)
+                    ),
+                ),
+            ),
+        ),
+        Prefetch(
+            "images",
+            image_qs_for_request(request).prefetch_related(
+                translations_prefetch(SectionImage, language_codes)
+            ),
+        ),
+        Prefetch(
+            "files",
+            file_qs_for_request(request).prefetch_related(
+                translations_prefetch(SectionFile, language_codes)
+            ),
+        ),
+    )
+
+
 class HearingSerializer(serializers.ModelSerializer, TranslatableSerializer):
     labels = LabelSerializer(many=True, read_only=True)
     sections = serializers.SerializerMethodField()
@@ -508,6 +602,17 @@ class HearingSerializer(serializers.ModelSerializer, TranslatableSerializer):
         translation_lang = [lang["code"] for lang in settings.PARLER_LANGUAGES[None]]
 
     def _get_main_section(self, hearing):
+        sections = getattr(hearing, "section_list", None)
+        if sections is not None:
+            # the main section is one of the sections of the hearing detail
+            return next(
+                (
+                    section
+                    for section in sections
+                    if section.type.identifier == InitialSectionType.MAIN
+                ),
+                None,
+            )
         prefetched_mains = getattr(hearing, "main_section_list", [])
         return prefetched_mains[0] if prefetched_mains else hearing.get_main_section()
 
@@ -515,12 +620,16 @@ class HearingSerializer(serializers.ModelSerializer, TranslatableSerializer):
         main_section = self._get_main_section(hearing)
         if not main_section:
             return ""
+        language_codes = self.translation_languages
         translations = {
             t.language_code: t.abstract
             for t in get_translation_list(
-                main_section, language_codes=self.Meta.translation_lang
+                main_section,
+                language_codes=language_codes or self.translation_lang,
             )
         }
+        if language_codes is not None:
+            return pick_translation(translations, language_codes)
         abstract = {}
         for lang_code, translation in translations.items():
             if translation:
@@ -528,36 +637,23 @@ class HearingSerializer(serializers.ModelSerializer, TranslatableSerializer):
         return abstract
 
     def get_sections(self, hearing):
-        request = self.context["request"]
-        queryset = hearing.sections.select_related("type").prefetch_related(
-            "translations",
-            Prefetch(
-                "polls",
-                SectionPoll.objects.prefetch_related(
-                    "translations",
-                    Prefetch(
-                        "options",
-                        SectionPollOption.objects.prefetch_related("translations"),
-                    ),
-                ),
-            ),
-            Prefetch(
-                "images", image_qs_for_request(request).prefetch_related("translations")
-            ),
-            Prefetch(
-                "files", file_qs_for_request(request).prefetch_related("translations")
-            ),
-        )
+        sections = getattr(hearing, "section_list", None)
+        if sections is None:
+            sections = hearing_section_queryset(
+                self.context["request"], self.translation_languages
+            ).filter(hearing=hearing)
         if not hearing.closed:
-            queryset = queryset.exclude(
-                type__identifier=InitialSectionType.CLOSURE_INFO
-            )
+            sections = [
+                section
+                for section in sections
+                if section.type.identifier != InitialSectionType.CLOSURE_INFO
+            ]
 
         serializer = SectionFieldSerializer(many=True, read_only=True)
         serializer.bind(
             "sections", self
         )  # this is needed to get context in the serializer
-        return serializer.to_representation(queryset)
+        return serializer.to_representation(sections)
 
     def get_main_image(self, hearing):
         main_section = self._get_main_section(hearing)
@@ -609,13 +705,46 @@ class HearingListSerializer(HearingSerializer):
         request = self.context.get("request", None)
         if request:
             accepted_renderer = getattr(request, "accepted_renderer", None)
-            if not request.GET.get("include", None) == "geojson" and not isinstance(
+            if "geojson" not in get_include_list(request) and not isinstance(
                 accepted_renderer, GeoJSONRenderer
             ):
                 fields.pop("geojson")
         return fields
 
 
+class HearingCardListSerializer(HearingListSerializer):
+    """
+    Hearing list serializer for hearings fetched with their HearingCards.
+
+    The data of the card is set to the hearing before it is serialized, so the
+    output is the same as with HearingListSerializer. Hearings without a card
+    are serialized from the database.
+    """
+
+    @cached_property
+    def _visible_phase_hearing_ids(self):
+        # the hearings in the project phases of the whole page at once
+        hearings = self.parent.instance if self.parent is not None else [self.instance]
+        hearing_ids = get_card_phase_hearing_ids(
+            hearing.card for hearing in hearings if getattr(hearing, "card", None)
+        )
+        if not hearing_ids:
+            return set()
+        return set(
+            filter_by_hearing_visible(
+                Hearing.objects.with_unpublished().filter(pk__in=hearing_ids),
+                self.context["request"],
+                hearing_lookup="",
+            ).values_list("pk", flat=True)
+        )
+
+    def to_representation(self, hearing):
+        card = getattr(hearing, "card", None)
+        if card is not None:
+            restore_hearing_card(hearing, card, self._visible_phase_hearing_ids)
+        return super().to_representation(hearing)
+
+
 class HearingMapSerializer(serializers.ModelSerializer, TranslatableSerializer):
     geojson = GeoJSONField()
 
@@ -641,13 +770,21 @@ class HearingMapSerializer(serializers.ModelSerializer, TranslatableSerializer):
             "Supports filtering by various parameters including status, "
             "labels, and dates."
         ),
-        parameters=(HEARING_ORDERING_PARAM + BBOX_PARAM + INCLUDE_PARAM),
+        parameters=(
+            HEARING_ORDERING_PARAM
+            + BBOX_PARAM
+            + INCLUDE_PARAM
+            + SPARSE_FIELDSET_PARAMS
+            + LANG_PARAM
+        ),
     ),
     retrieve=extend_schema(
         summary="Get hearing details",
         description=(
             "Retrieve detailed information about a specific hearing by ID or slug. "
-            "Unpublished hearings require preview code or admin access."
+            "Unpublished hearings require preview code or admin access. "
+            "Related data can be included in the same response with 'include', "
+            "in which case it is returned in 'included'."
         ),
         parameters=[
             OpenApiParameter(
@@ -656,7 +793,33 @@ class HearingMapSerializer(serializers.ModelSerializer, TranslatableSerializer):
                 description="Preview code for unpublished hearings",
                 location=OpenApiParameter.QUERY,
             ),
-        ],
+            OpenApiParameter(
+                "include",
+                OpenApiTypes.STR,
+                description=(
+                    "Comma separated list of the data to include: "
+                    "'sections.comments' for the first comments of each section, "
+                    "'user_state' for the votes, poll answers and following of "
+                    "the current user, or hearing fields left out of 'fields', "
+                    "e.g. 'contact_persons'"
+                ),
+                location=OpenApiParameter.QUERY,
+            ),
+        ]
+        + SPARSE_FIELDSET_PARAMS
+        + LANG_PARAM,
+    ),
+    batch=extend_schema(
+        summary="Get many hearings by ID",
+        description=(
+            "Retrieve the hearings with the given IDs or slugs in one request. "
+            "The hearings are returned in the order of the IDs, and the IDs of "
+            "hearings that do not exist or are not visible are listed in "
+            "'missing'. At most BATCH_MAX_IDS IDs can be given."
+        ),
+        parameters=INCLUDE_PARAM + SPARSE_FIELDSET_PARAMS + LANG_PARAM,
+        request=BatchRequestSerializer,
+        responses=batch_response("HearingBatchResponse", HearingListSerializer),
     ),
     create=extend_schema(
         summary="Create new hearing",
@@ -711,7 +874,15 @@ class HearingMapSerializer(serializers.ModelSerializer, TranslatableSerializer):
         },
     ),
 )
-class HearingViewSet(AdminsSeeUnpublishedMixin, AuditLogApiView, viewsets.ModelViewSet):
+class HearingViewSet(
+    BatchRetrieveMixin,
+    GeoJSONStreamingMixin,
+    SparseFieldsetMixin,
+    CompiledListSerializerMixin,
+    AdminsSeeUnpublishedMixin,
+    AuditLogApiView,
+    viewsets.ModelViewSet,
+):
     """
     API endpoint for managing participatory democracy hearings.
 
@@ -737,70 +908,135 @@ class HearingViewSet(AdminsSeeUnpublishedMixin, AuditLogApiView, viewsets.ModelV
     ordering = ("-created_at",)
     filterset_class = HearingFilterSet
 
+    @cached_property
+    def serves_hearing_cards(self):
+        """
+        Whether the list is served from the HearingCards.
+
+        Superusers see unpublished images and hearings, which the cards leave
+        out, so their lists are always built from the database.
+        """
+        return (
+            self.action in HEARING_LIST_ACTIONS
+            and settings.HEARING_CARDS
+            and not self.request.user.is_superuser
+            and not getattr(self, "swagger_fake_view", False)
+        )
+
     def get_serializer_class(self, *args, **kwargs):
-        if self.action == "list":
-            return HearingListSerializer
+        if self.serves_hearing_cards:
+            if settings.COMPILED_READ_SERIALIZERS:
+                return get_compiled_serializer_class(HearingCardListSerializer)
+            return HearingCardListSerializer
+        if self.action in HEARING_LIST_ACTIONS:
+            return super().get_serializer_class()
         if self.action in ("create", "update", "partial_update"):
             return HearingCreateUpdateSerializer
         return HearingSerializer
 
     def get_queryset(self):
-        if self.action == "list":
-            base_hearing_qs = (
-                filter_by_hearing_visible(
-                    Hearing.objects.with_unpublished(), self.request, hearing_lookup=""
-                )
-                .select_related("organization")
-                .prefetch_related("translations")
+        if self.action in ("poll_results", "poll_crosstab", "comment_clusters"):
+            # only the visibility of the hearing is checked
+            return Hearing.objects.with_unpublished()
+        if self.serves_hearing_cards:
+            # everything else the list shows is read from the cards
+            return filter_by_hearing_visible(
+                Hearing.objects.with_unpublished(), self.request, hearing_lookup=""
+            ).select_related("card")
+
+        is_requested = self.is_field_requested
+        language_codes = get_translation_languages(self.request)
+        if self.action in HEARING_LIST_ACTIONS:
+            hearing_qs = filter_by_hearing_visible(
+                Hearing.objects.with_unpublished(), self.request, hearing_lookup=""
             )
-            hearing_qs = base_hearing_qs.prefetch_related(
-                Prefetch(
-                    "project_phase",
-                    ProjectPhase.objects.prefetch_related(
-                        Prefetch(
-                            "project",
-                            Project.objects.all().prefetch_related(
-                                "translations",
-                                Prefetch(
-                                    "phases",
-                                    ProjectPhase.objects.prefetch_related(
-                                        Prefetch("hearings", base_hearing_qs),
-                                        "translations",
+            if is_requested("project"):
+                base_hearing_qs = hearing_qs.select_related(
+                    "organization"
+                ).prefetch_related(translations_prefetch(Hearing, language_codes))
+                hearing_qs = hearing_qs.prefetch_related(
+                    Prefetch(
+                        "project_phase",
+                        ProjectPhase.objects.prefetch_related(
+                            Prefetch(
+                                "project",
+                                prefetch_translations(
+                                    Project.objects.all(), language_codes
+                                ).prefetch_related(
+                                    Prefetch(
+                                        "phases",
+                                        prefetch_translations(
+                                            ProjectPhase.objects.prefetch_related(
+                                                Prefetch("hearings", base_hearing_qs)
+                                            ),
+                                            language_codes,
+                                        ),
                                     ),
                                 ),
                             ),
                         ),
                     ),
-                ),
-            )
+                )
 
         else:
-            hearing_qs = (
-                Hearing.objects.with_unpublished()
-                .select_related("organization", "project_phase__project")
-                .prefetch_related("translations")
+            hearing_qs = Hearing.objects.with_unpublished()
+            if is_requested("project"):
+                hearing_qs = hearing_qs.select_related("project_phase__project")
+
+        if is_requested("organization"):
+            hearing_qs = hearing_qs.select_related("organization")
+        if any(map(is_requested, Hearing._parler_meta.get_all_fields())):
+            hearing_qs = hearing_qs.prefetch_related(
+                translations_prefetch(Hearing, language_codes)
             )
 
-        qs = hearing_qs.prefetch_related(
-            Prefetch(
-                "sections",
-                Section.objects.filter(type__identifier="main").prefetch_related(
-                    Prefetch("translations", to_attr="translation_list"),
-                    Prefetch(
-                        "images",
-                        image_qs_for_request(self.request)
-                        .filter(section__type__identifier="main")
-                        .prefetch_related("translations"),
+        # the main section is used by these fields only
+        main_section_prefetches = []
+        if is_requested("abstract"):
+            main_section_prefetches.append(
+                translations_prefetch(
+                    Section, language_codes, to_attr="translation_list"
+                )
+            )
+        if is_requested("main_image"):
+            main_section_prefetches.append(
+                Prefetch(
+                    "images",
+                    image_qs_for_request(self.request)
+                    .filter(section__type__identifier="main")
+                    .prefetch_related(
+                        translations_prefetch(SectionImage, language_codes)
                     ),
-                ),
-                to_attr="main_section_list",
-            ),
-            Prefetch(
-                "labels",
-                Label.objects.prefetch_related("translations"),
-            ),
-        )
-        return qs
+                )
+            )
+        if self.action in HEARING_DETAIL_ACTIONS and is_requested("sections"):
+            # load the sections once, the main section is picked from them
+            hearing_qs = hearing_qs.prefetch_related(
+                Prefetch(
+                    "sections",
+                    hearing_section_queryset(self.request, language_codes),
+                    to_attr="section_list",
+                )
+            )
+        elif main_section_prefetches or is_requested("default_to_fullscreen"):
+            hearing_qs = hearing_qs.prefetch_related(
+                Prefetch(
+                    "sections",
+                    Section.objects.filter(type__identifier="main").prefetch_related(
+                        *main_section_prefetches
+                    ),
+                    to_attr="main_section_list",
+                )
+            )
+
+        if is_requested("labels"):
+            hearing_qs = hearing_qs.prefetch_related(
+                Prefetch(
+                    "labels",
+                    prefetch_translations(Label.objects.all(), language_codes),
+                )
+            )
+        return hearing_qs
 
     def get_object(self):
         id_or_slug = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
@@ -828,6 +1064,23 @@ class HearingViewSet(AdminsSeeUnpublishedMixin, AuditLogApiView, viewsets.ModelV
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        data = self.get_serializer(instance).data
+        sections = getattr(instance, "section_list", None)
+        if sections is None:
+            sections = instance.sections.all()
+        included = get_hearing_includes(request, instance, sections)
+        if included:
+            data["included"] = included
+        return response.Response(data)
+
+    def filter_batch_queryset(self, queryset, ids):
+        return queryset.filter(Q(pk__in=ids) | Q(slug__in=ids))
+
+    def get_batch_keys(self, obj):
+        return (obj.pk, obj.slug)
+
     @extend_schema(
         summary="Follow a hearing",
         description=(
@@ -934,6 +1187,120 @@ class HearingViewSet(AdminsSeeUnpublishedMixin, AuditLogApiView, viewsets.ModelV
         )
         return report.get_response()
 
+    @extend_schema(
+        summary="Get poll results",
+        description=(
+            "Retrieve the answer counts of all the polls of the hearing and "
+            "their options. The response may be cached for "
+            "POLL_RESULTS_MAX_AGE seconds."
+        ),
+        responses={200: POLL_RESULTS_RESPONSE},
+    )
+    @action(detail=True, methods=["get"], url_path="polls/results")
+    def poll_results(self, request, pk=None):
+        hearing = self.get_object()
+        results = response.Response(get_hearing_poll_results(hearing))
+        # results of hearings visible to everyone can be cached by shared caches
+        patch_cache_control(
+            results,
+            max_age=settings.POLL_RESULTS_MAX_AGE,
+            **(
+                {"public": True}
+                if hearing.is_visible_for(AnonymousUser())
+                else {"private": True}
+            ),
+        )
+        return results
+
+    @extend_schema(
+        summary="Cross-tabulate poll answers",
+        description=(
+            "Count the comments that answered each option of the polls of the "
+            "hearing, split by the answers to another poll or by a comment "
+            "attribute. The counts may be POLL_CROSSTAB_CACHE_TIMEOUT seconds old."
+        ),
+        parameters=POLL_CROSSTAB_PARAMS,
+        responses={200: POLL_CROSSTAB_RESPONSE},
+    )
+    @action(detail=True, methods=["get"], url_path="polls/crosstab")
+    def poll_crosstab(self, request, pk=None):
+        hearing = self.get_object()
+        polls = SectionPoll.objects.filter(
+            section__hearing=hearing, section__deleted=False
+        )
+        params = PollCrosstabQuerySerializer(
+            data=request.query_params, context={"polls": polls}
+        )
+        params.is_valid(raise_exception=True)
+        return response.Response(
+            get_poll_crosstab("hearing:%s" % hearing.pk, polls, params.validated_data)
+        )
+
+    @extend_schema(
+        summary="List near duplicate comments",
+        description=(
+            "Group the comments of the hearing into clusters of near duplicates, "
+            "e.g. lightly edited copies of the same text, the largest first. "
+            "Only for the admins of the organization of the hearing."
+        ),
+        parameters=COMMENT_CLUSTERS_PARAMS,
+        responses={
+            200: COMMENT_CLUSTERS_RESPONSE,
+            403: OpenApiResponse(
+                description="Not authorized to moderate the comments of the hearing"
+            ),
+        },
+    )
+    @action(detail=True, methods=["get"], url_path="comments/clusters")
+    def comment_clusters(self, request, pk=None):
+        hearing = self.get_object()
+        user = request.user
+        if not (
+            user.is_superuser
+            or (
+                user.is_authenticated
+                and hearing.organization in user.admin_organizations.all()
+            )
+        ):
+            return response.Response(
+                {"status": "You don't have authorization to moderate this hearing"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        comments = SectionComment.objects.filter(section__hearing=hearing)
+        threshold = settings.COMMENT_NEAR_DUPLICATE_THRESHOLD
+        comment_id = request.query_params.get("comment")
+        if comment_id:
+            try:
+                comment = comments.get(pk=comment_id)
+            except (SectionComment.DoesNotExist, ValueError):
+                raise ValidationError({"comment": ["Invalid comment ID."]})
+            duplicates = find_near_duplicates(comments, comment, threshold)
+            clusters = [sorted([comment.pk, *duplicates])] if duplicates else []
+        else:
+            clusters = get_near_duplicate_clusters(comments, threshold)
+
+        comment_data = {
+            data["id"]: data
+            for data in comments.filter(
+                pk__in=[pk for cluster in clusters for pk in cluster]
+            ).values(
+                "id", "section", "created_at", "author_name", "published", "content"
+            )
+        }
+        return response.Response(
+            {
+                "hearing": hearing.pk,
+                "clusters": [
+                    {
+                        "size": len(cluster),
+                        "comments": [comment_data[pk] for pk in cluster],
+                    }
+                    for cluster in clusters
+                ],
+            }
+        )
+
     @extend_schema(
         summary="Get hearings as map data",
         description=(
@@ -0,0 +1,133 @@
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from django.urls import reverse
+
+from audit_log.utils import add_audit_logged_object_ids
+from democracy.models import SectionComment, SectionPollAnswer
+from democracy.views.comment import select_and_prefetch_comment_data
+from democracy.views.section_comment import SectionCommentSerializer
+from democracy.views.utils import get_include_list
+
+# ordering of the included comments, the same as in the links to their next pages
+SECTION_COMMENT_ORDERING = "-created_at"
+
+
+def get_section_comment_pages(request, section_ids, limit):
+    """
+    Return the first page of the comments of each section.
+
+    The pages of all the sections are fetched in one query, which numbers the
+    comments of each section and returns at most `limit` of them per section.
+
+    :param request: the request, which decides the visible comments
+    :param section_ids: IDs of the sections
+    :param limit: maximum number of comments per section
+    :return: dict of {section ID: {"count", "next", "results"}}
+    """
+    user = request.user
+    queryset = SectionComment.objects.everything().filter(section__in=section_ids)
+    if not (user.is_authenticated and user.is_superuser):
+        queryset = queryset.exclude(published=False)
+    queryset = (
+        queryset.annotate(
+            section_position=Window(
+                RowNumber(),
+                partition_by=F("section_id"),
+                order_by=(SECTION_COMMENT_ORDERING, "-pk"),
+            ),
+            section_comment_count=Window(Count("pk"), partition_by=F("section_id")),
+        )
+        .filter(section_position__lte=limit)
+        .order_by("section_id", "section_position")
+    )
+    queryset = select_and_prefetch_comment_data(queryset, lambda field_name: True)
+
+    comments_by_section = defaultdict(list)
+    for comment in queryset:
+        comments_by_section[comment.section_id].append(comment)
+    add_audit_logged_object_ids(
+        request, [c for comments in comments_by_section.values() for c in comments]
+    )
+
+    serializer = SectionCommentSerializer(many=True, context={"request": request})
+    list_url = request.build_absolute_uri(reverse("comment-list"))
+    pages = {}
+    for section_id in section_ids:
+        comments = comments_by_section[section_id]
+        count = comments[0].section_comment_count if comments else 0
+        next_url = None
+        if count > limit:
+            next_url = "%s?%s" % (
+                list_url,
+                urlencode(
+                    {
+                        "section": section_id,
+                        "ordering": SECTION_COMMENT_ORDERING,
+                        "limit": limit,
+                        "offset": limit,
+                    }
+                ),
+            )
+        pages[section_id] = {
+            "count": count,
+            "next": next_url,
+            "results": serializer.to_representation(comments),
+        }
+    return pages
+
+
+def get_user_state(request, hearing):
+    """
+    Return what the user has done in the hearing, or None for anonymous users.
+
+    The keys are named like in the user data (`UserDataSerializer`), but only
+    cover the given hearing.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return None
+    return {
+        "followed": hearing.followers.filter(pk=user.pk).exists(),
+        "voted_section_comments": list(
+            user.voted_democracy_sectioncomment.filter(
+                section__hearing=hearing
+            ).values_list("pk", flat=True)
+        ),
+        "answered_questions": list(
+            SectionPollAnswer.objects.filter(
+                comment__created_by=user, option__poll__section__hearing=hearing
+            )
+            .values_list("option__poll_id", flat=True)
+            .distinct()
+        ),
+    }
+
+
+def get_hearing_includes(request, hearing, sections):
+    """
+    Return the data included in the hearing detail with `?include=`.
+
+    `sections.comments` includes the first page of the comments of each section
+    and `user_state` what the user has done in the hearing. Fields of the
+    hearing can be included too, see `SparseFieldsetMixin`.
+
+    :param request: the request
+    :param hearing: the hearing
+    :param sections: the sections of the hearing in the response
+    :return: dict of the included data, empty if nothing is included
+    """
+    includes = get_include_list(request)
+    included = {}
+    if "sections.comments" in includes:
+        included["section_comments"] = get_section_comment_pages(
+            request,
+            [section.pk for section in sections],
+            settings.HEARING_INCLUDE_COMMENT_LIMIT,
+        )
+    if "user_state" in includes:
+        included["user_state"] = get_user_state(request, hearing)
+    return included
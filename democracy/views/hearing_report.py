@@ -4,8 +4,7 @@ import re
 
 import xlsxwriter
 from django.conf import settings
-from django.db.models import F, Prefetch
-from django.db.models.functions import Coalesce
+from django.db.models import Prefetch
 from django.http import HttpResponse
 from xlsxwriter.utility import xl_rowcol_to_cell
 
@@ -209,10 +208,8 @@ class HearingReport(object):
                     "poll_answers__option__poll",
                     "label__translations",
                 )
-                .annotate(
-                    parent_created_at=Coalesce(F("comment__created_at"), "created_at")
-                )
-                .order_by("-parent_created_at", "created_at")
+                # the newest threads first, each with its replies in order
+                .order_by("-root__created_at", "root_id", "path")
             )
         ]
         for comment in comments:
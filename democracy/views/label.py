@@ -9,7 +9,12 @@ from rest_framework import mixins, permissions, response, serializers, status, v
 from audit_log.views import AuditLogApiView
 from democracy.models import Label
 from democracy.pagination import DefaultLimitPagination
-from democracy.views.utils import TranslatableSerializer
+from democracy.views.openapi import LANG_PARAM
+from democracy.views.utils import (
+    TranslatableSerializer,
+    get_translation_languages,
+    prefetch_translations,
+)
 
 
 class LabelFilterSet(django_filters.rest_framework.FilterSet):
@@ -34,10 +39,12 @@ class LabelSerializer(serializers.ModelSerializer, TranslatableSerializer):
     list=extend_schema(
         summary="List labels",
         description="Retrieve paginated list of labels used for categorizing hearings.",
+        parameters=LANG_PARAM,
     ),
     retrieve=extend_schema(
         summary="Get label details",
         description="Retrieve detailed information about a specific label.",
+        parameters=LANG_PARAM,
     ),
     create=extend_schema(
         summary="Create label",
@@ -64,12 +71,17 @@ class LabelViewSet(
     """
 
     serializer_class = LabelSerializer
-    queryset = Label.objects.all().prefetch_related("translations")
+    queryset = Label.objects.all()
     pagination_class = DefaultLimitPagination
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = LabelFilterSet
 
+    def get_queryset(self):
+        return prefetch_translations(
+            super().get_queryset(), get_translation_languages(self.request)
+        )
+
     def create(self, request):
         if not request.user or not request.user.get_default_organization():
             return response.Response(
@@ -0,0 +1,212 @@
+import django_filters
+from django.conf import settings
+from django.db.models import Q
+from drf_spectacular.utils import extend_schema, extend_schema_view, inline_serializer
+from rest_framework import mixins, permissions, response, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.viewsets import GenericViewSet
+
+from audit_log.enums import Operation
+from audit_log.utils import add_audit_logged_object_ids, set_audit_log_operation
+from audit_log.views import AuditLogApiView
+from democracy.models import SectionComment
+from democracy.pagination import ModerationQueuePagination
+from democracy.utils.comment_moderation import MODERATION_OPERATIONS, moderate_comments
+from democracy.views.section_comment import CommentFilterSet
+
+MODERATION_QUEUE_STATUSES = {
+    # both conditions match the partial indexes of SectionComment
+    "flagged": Q(flagged_at__isnull=False),
+    "unpublished": Q(published=False),
+}
+
+
+class ModerationQueueFilterSet(django_filters.rest_framework.FilterSet):
+    hearing = django_filters.CharFilter(
+        field_name="section__hearing__id",
+        help_text="Filter the comments of this hearing",
+    )
+    status = django_filters.ChoiceFilter(
+        choices=[(key, key) for key in MODERATION_QUEUE_STATUSES],
+        method="filter_status",
+        help_text=(
+            "List only the flagged or the unpublished comments, "
+            "by default both are listed"
+        ),
+    )
+
+    class Meta:
+        model = SectionComment
+        fields = ["hearing", "status"]
+
+    def filter_status(self, queryset, name, value):
+        return queryset.filter(MODERATION_QUEUE_STATUSES[value])
+
+
+class ModerationQueueCommentSerializer(serializers.ModelSerializer):
+    hearing = serializers.CharField(source="section.hearing_id", read_only=True)
+    flagged = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SectionComment
+        fields = [
+            "id",
+            "hearing",
+            "section",
+            "comment",
+            "content",
+            "author_name",
+            "language_code",
+            "created_at",
+            "n_votes",
+            "published",
+            "moderated",
+            "flagged",
+            "flagged_at",
+        ]
+
+    def get_flagged(self, obj) -> bool:
+        return bool(obj.flagged_at)
+
+
+class BulkModerationSerializer(serializers.Serializer):
+    operation = serializers.ChoiceField(choices=MODERATION_OPERATIONS)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+    filter = serializers.DictField(
+        required=False,
+        help_text=(
+            "Filter of the comments as in the comment list, "
+            'e.g. {"hearing": "abc", "created_at__gt": "2024-01-01T00:00"}'
+        ),
+    )
+
+    def validate_ids(self, ids):
+        max_ids = settings.BATCH_MAX_IDS
+        if len(ids) > max_ids:
+            raise serializers.ValidationError(
+                "At most %d IDs can be moderated at once, use a filter instead."
+                % max_ids
+            )
+        return ids
+
+    def validate(self, data):
+        if ("ids" in data) == ("filter" in data):
+            raise serializers.ValidationError(
+                "Either the IDs or the filter of the comments must be given."
+            )
+        return data
+
+
+def get_moderated_comments(user, queryset):
+    """
+    Limit the comments to the hearings of the organizations the user is an admin of.
+    """
+    if user.is_superuser:
+        return queryset
+    return queryset.filter(
+        section__hearing__organization__in=user.admin_organizations.all()
+    )
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List the comments waiting for moderation",
+        description=(
+            "Retrieve the flagged and the unpublished comments in the hearings of "
+            "the organizations the user is an admin of, the oldest first. "
+            "The list is paginated with cursors: follow the 'next' link to get "
+            "the next page."
+        ),
+    ),
+)
+class ModerationQueueViewSet(mixins.ListModelMixin, AuditLogApiView, GenericViewSet):
+    """
+    API endpoint for the moderation queue.
+
+    Lists the comments that are flagged or not yet published in the hearings
+    the user may moderate. Users who aren't admins of any organization get an
+    empty list.
+    """
+
+    serializer_class = ModerationQueueCommentSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = ModerationQueuePagination
+    filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
+    filterset_class = ModerationQueueFilterSet
+
+    def get_queryset(self):
+        queryset = SectionComment.objects.filter(
+            MODERATION_QUEUE_STATUSES["flagged"]
+            | MODERATION_QUEUE_STATUSES["unpublished"]
+        ).select_related("section")
+        return get_moderated_comments(self.request.user, queryset)
+
+
+class CommentModerationViewSet(GenericViewSet):
+    """
+    API endpoint for moderating many comments at once.
+
+    Users can only moderate the comments in the hearings of the organizations
+    they are admins of; the other comments are left untouched.
+    """
+
+    serializer_class = BulkModerationSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_queryset(self):
+        return get_moderated_comments(
+            self.request.user, SectionComment.objects.everything()
+        )
+
+    @extend_schema(
+        summary="Moderate many comments",
+        description=(
+            "Flag, unflag, pin, unpin, delete or restore the comments with the "
+            "given IDs or matching the given filter. Deleting comments deletes "
+            "their poll answers and images too, and restoring them restores the "
+            "answers and images deleted with them. Returns the IDs of the "
+            "comments that were changed."
+        ),
+        responses=inline_serializer(
+            name="BulkModerationResponse",
+            fields={
+                "operation": serializers.CharField(),
+                "ids": serializers.ListField(child=serializers.IntegerField()),
+            },
+        ),
+    )
+    def create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        operation = serializer.validated_data["operation"]
+
+        comments = self.get_queryset()
+        if "ids" in serializer.validated_data:
+            comments = comments.filter(pk__in=serializer.validated_data["ids"])
+        else:
+            filterset = CommentFilterSet(
+                data=serializer.validated_data["filter"],
+                queryset=comments,
+                request=request,
+            )
+            if not filterset.is_valid():
+                raise ValidationError({"filter": filterset.errors})
+            if not any(
+                value not in (None, "", [])
+                for value in filterset.form.cleaned_data.values()
+            ):
+                raise ValidationError(
+                    {"filter": ["The filter must limit the comments to moderate."]}
+                )
+            comments = filterset.qs
+
+        changed = moderate_comments(comments, operation, user=request.user)
+        add_audit_logged_object_ids(request, changed)
+        set_audit_log_operation(
+            request, Operation.DELETE if operation == "delete" else Operation.UPDATE
+        )
+        return response.Response(
+            {"operation": operation, "ids": [comment.pk for comment in changed]}
+        )
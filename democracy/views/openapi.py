@@ -48,6 +48,31 @@ INCLUDE_PARAM = [
     ),
 ]
 
+SPARSE_FIELDSET_PARAMS = [
+    OpenApiParameter(
+        "fields",
+        OpenApiTypes.STR,
+        description="Comma separated list of the fields to return (e.g., 'id,title')",
+    ),
+    OpenApiParameter(
+        "omit",
+        OpenApiTypes.STR,
+        description="Comma separated list of the fields to leave out",
+    ),
+]
+
+LANG_PARAM = [
+    OpenApiParameter(
+        "lang",
+        OpenApiTypes.STR,
+        description=(
+            "Comma separated list of languages in order of preference "
+            "(e.g., 'sv,fi'). Translated fields contain only the first language "
+            "the text exists in."
+        ),
+    ),
+]
+
 # ============================================================================
 # Comment-Related Parameters
 # ============================================================================
@@ -68,10 +93,94 @@ COMMENT_FILTER_PARAMS = [
     ),
 ]
 
+COMMENT_THREAD_PARAMS = [
+    OpenApiParameter(
+        "depth",
+        OpenApiTypes.INT,
+        description=(
+            "Number of reply levels to return, at most COMMENT_THREAD_MAX_DEPTH"
+        ),
+    ),
+    OpenApiParameter(
+        "flat",
+        OpenApiTypes.BOOL,
+        description=(
+            "Return the comments as a flat list in thread order instead of "
+            "nesting the replies in 'replies'"
+        ),
+    ),
+]
+
+COMMENT_CHANGES_PARAMS = [
+    OpenApiParameter(
+        "since",
+        OpenApiTypes.STR,
+        description=(
+            "Cursor returned by the previous request; the comments changed "
+            "after it are returned. Without it, all the comments are returned"
+        ),
+    ),
+    OpenApiParameter(
+        "limit",
+        OpenApiTypes.INT,
+        description="Number of changes to return, at most COMMENT_CHANGES_LIMIT",
+    ),
+]
+
 COMMON_COMMENT_PARAMS = (
-    COMMENT_FILTER_PARAMS + COMMENT_ORDERING_PARAM + BBOX_PARAM + INCLUDE_PARAM
+    COMMENT_FILTER_PARAMS
+    + COMMENT_ORDERING_PARAM
+    + BBOX_PARAM
+    + INCLUDE_PARAM
+    + SPARSE_FIELDSET_PARAMS
+    + [
+        OpenApiParameter(
+            "threaded",
+            OpenApiTypes.BOOL,
+            description=(
+                "Return the comments that are not replies with their replies, "
+                "see 'depth' and 'flat'. GeoJSON is always returned as a flat "
+                "list of features"
+            ),
+        ),
+    ]
+    + COMMENT_THREAD_PARAMS
 )
 
+POLL_CROSSTAB_PARAMS = [
+    OpenApiParameter(
+        "poll",
+        OpenApiTypes.INT,
+        description="Cross-tabulate only the answers to this poll",
+    ),
+    OpenApiParameter(
+        "by",
+        OpenApiTypes.STR,
+        description=(
+            "Split the counts by the answers to another poll (poll:<poll ID>) "
+            "or by the label, language_code or registered of the comments"
+        ),
+    ),
+    OpenApiParameter(
+        "created_at__gt",
+        OpenApiTypes.DATETIME,
+        description="Count the comments created after this date",
+    ),
+    OpenApiParameter(
+        "created_at__lt",
+        OpenApiTypes.DATETIME,
+        description="Count the comments created before this date",
+    ),
+] + BBOX_PARAM
+
+COMMENT_CLUSTERS_PARAMS = [
+    OpenApiParameter(
+        "comment",
+        OpenApiTypes.INT,
+        description="Return only the cluster of the near duplicates of this comment",
+    ),
+]
+
 # ============================================================================
 # Common Response Serializers
 # ============================================================================
@@ -84,3 +193,101 @@ RESPONSE_WITH_STATUS = inline_serializer(
     name="StatusResponse",
     fields={"status": serializers.CharField()},
 )
+
+
+def batch_response(name, serializer_class):
+    """
+    Response of a batch action: the serialized objects and the missing IDs.
+    """
+    return inline_serializer(
+        name=name,
+        fields={
+            "results": serializer_class(many=True),
+            "missing": serializers.ListField(child=serializers.CharField()),
+        },
+    )
+
+
+def changes_response(name, serializer_class):
+    """
+    Response of a changes feed: the changed objects and the cursor to continue from.
+    """
+    return inline_serializer(
+        name=name,
+        fields={
+            "results": serializer_class(many=True),
+            "cursor": serializers.CharField(allow_null=True),
+            "more": serializers.BooleanField(),
+        },
+    )
+
+
+POLL_RESULTS_RESPONSE = inline_serializer(
+    name="HearingPollResults",
+    fields={
+        "hearing": serializers.CharField(),
+        "polls": inline_serializer(
+            name="PollResult",
+            many=True,
+            fields={
+                "id": serializers.IntegerField(),
+                "section": serializers.CharField(),
+                "type": serializers.CharField(),
+                "n_answers": serializers.IntegerField(),
+                "options": inline_serializer(
+                    name="PollOptionResult",
+                    many=True,
+                    fields={
+                        "id": serializers.IntegerField(),
+                        "n_answers": serializers.IntegerField(),
+                    },
+                ),
+            },
+        ),
+    },
+)
+
+
+POLL_CROSSTAB_RESPONSE = inline_serializer(
+    name="PollCrosstab",
+    fields={
+        "by": serializers.CharField(allow_null=True),
+        "results": inline_serializer(
+            name="PollCrosstabCell",
+            many=True,
+            fields={
+                "poll": serializers.IntegerField(),
+                "option": serializers.IntegerField(),
+                "value": serializers.CharField(allow_null=True),
+                "count": serializers.IntegerField(),
+            },
+        ),
+    },
+)
+
+
+COMMENT_CLUSTERS_RESPONSE = inline_serializer(
+    name="CommentClusters",
+    fields={
+        "hearing": serializers.CharField(),
+        "clusters": inline_serializer(
+            name="CommentCluster",
+            many=True,
+            fields={
+                "size": serializers.IntegerField(),
+                "comments": inline_serializer(
+                    name="ClusteredComment",
+                    many=True,
+                    fields={
+                        "id": serializers.IntegerField(),
+                        "section": serializers.CharField(),
+                        "created_at": serializers.DateTimeField(),
+                        "author_name": serializers.CharField(),
+                        "published": serializers.BooleanField(),
+                        "content": serializers.CharField(),
+                    },
+                ),
+            },
+        ),
+    },
+)
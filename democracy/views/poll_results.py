@@ -0,0 +1,183 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import (
+    BooleanField,
+    CharField,
+    Count,
+    ExpressionWrapper,
+    F,
+    Q,
+    Value,
+)
+from munigeo.api import build_bbox_filter, srid_to_srs
+from rest_framework import serializers
+
+from democracy.models import SectionPoll, SectionPollAnswer, SectionPollOption
+
+# comment attributes the answers can be cross-tabulated by
+CROSSTAB_COMMENT_DIMENSIONS = {
+    "label": F("comment__label_id"),
+    "language_code": F("comment__language_code"),
+    "registered": ExpressionWrapper(
+        Q(comment__created_by__isnull=False), output_field=BooleanField()
+    ),
+}
+CROSSTAB_POLL_DIMENSION_PREFIX = "poll:"
+
+
+def get_hearing_poll_results(hearing):
+    """
+    Return the answer counts of the polls of the hearing.
+
+    The counts are read from the counters of the polls and options, which are
+    kept up to date when answers are saved, so no answers are read.
+
+    :param hearing: the hearing
+    :return: dict of the hearing ID and its polls with their option counts
+    """
+    polls = list(
+        SectionPoll.objects.filter(section__hearing=hearing, section__deleted=False)
+        .order_by("section__ordering", "section_id", "ordering", "pk")
+        .values("id", "section_id", "type", "n_answers")
+    )
+    options_by_poll = {poll["id"]: [] for poll in polls}
+    for option in (
+        SectionPollOption.objects.filter(poll__in=options_by_poll)
+        .order_by("ordering", "pk")
+        .values("id", "poll_id", "n_answers")
+    ):
+        options_by_poll[option.pop("poll_id")].append(option)
+
+    return {
+        "hearing": hearing.pk,
+        "polls": [
+            {
+                "id": poll["id"],
+                "section": poll["section_id"],
+                "type": poll["type"],
+                "n_answers": poll["n_answers"],
+                "options": options_by_poll[poll["id"]],
+            }
+            for poll in polls
+        ],
+    }
+
+
+class PollCrosstabQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of the poll cross-tabulation.
+
+    Validated with the polls the cross-tabulation may cover in the context as
+    `polls`.
+    """
+
+    poll = serializers.IntegerField(required=False)
+    by = serializers.CharField(required=False)
+    created_at__gt = serializers.DateTimeField(required=False)
+    created_at__lt = serializers.DateTimeField(required=False)
+    bbox = serializers.CharField(required=False)
+    srid = serializers.CharField(required=False)
+
+    def _check_poll(self, poll_id):
+        if not self.context["polls"].filter(pk=poll_id).exists():
+            raise serializers.ValidationError("Poll %s does not exist here." % poll_id)
+        return poll_id
+
+    def validate_poll(self, poll):
+        return self._check_poll(poll)
+
+    def validate_by(self, by):
+        if by in CROSSTAB_COMMENT_DIMENSIONS:
+            return by
+        if by.startswith(CROSSTAB_POLL_DIMENSION_PREFIX):
+            poll_id = by[len(CROSSTAB_POLL_DIMENSION_PREFIX) :]
+            if poll_id.isdigit():
+                self._check_poll(int(poll_id))
+                return by
+        raise serializers.ValidationError(
+            "Give one of %s or %s<poll ID>."
+            % (", ".join(CROSSTAB_COMMENT_DIMENSIONS), CROSSTAB_POLL_DIMENSION_PREFIX)
+        )
+
+
+def _get_crosstab_cache_key(scope, params):
+    key_data = json.dumps([scope, params], sort_keys=True, default=str)
+    return "poll_crosstab:%s" % hashlib.sha256(key_data.encode()).hexdigest()
+
+
+def get_poll_crosstab(scope, polls, params):
+    """
+    Cross-tabulate the answers to the polls by another poll or a comment attribute.
+
+    Counts the comments that have answered each option, split by the answer to
+    another poll (`by=poll:<ID>`) or by the label, language or registration of
+    the comments. The counts are computed with one grouped query and kept in
+    the cache for POLL_CROSSTAB_CACHE_TIMEOUT seconds.
+
+    :param scope: identifier of the hearing or section the polls are from,
+                  e.g. "hearing:<ID>"
+    :param polls: queryset of the polls the cross-tabulation may cover
+    :param params: validated `PollCrosstabQuerySerializer` data
+    :return: dict of the dimension and the counts as a list of
+             {"poll", "option", "value", "count"}, where `value` is the value of
+             the dimension, e.g. the option of the other poll
+    """
+    cache = caches[settings.POLL_CROSSTAB_CACHE_ALIAS]
+    cache_key = _get_crosstab_cache_key(scope, params)
+    crosstab = cache.get(cache_key)
+    if crosstab is not None:
+        return crosstab
+
+    if "poll" in params:
+        polls = polls.filter(pk=params["poll"])
+    # only the comments the comment list shows to everyone
+    answers = SectionPollAnswer.objects.filter(
+        option__poll__in=polls, comment__deleted=False, comment__published=True
+    )
+    if "created_at__gt" in params:
+        answers = answers.filter(comment__created_at__gt=params["created_at__gt"])
+    if "created_at__lt" in params:
+        answers = answers.filter(comment__created_at__lt=params["created_at__lt"])
+    if "bbox" in params:
+        answers = answers.filter(
+            **build_bbox_filter(
+                srid_to_srs(params.get("srid")), params["bbox"], "comment__geometry"
+            )
+        )
+
+    by = params.get("by")
+    if by is None:
+        answers = answers.annotate(value=Value(None, output_field=CharField()))
+    elif by in CROSSTAB_COMMENT_DIMENSIONS:
+        answers = answers.annotate(value=CROSSTAB_COMMENT_DIMENSIONS[by])
+    else:
+        # the other answers of the same comment, joined once by this filter
+        answers = answers.filter(
+            comment__poll_answers__option__poll=by[
+                len(CROSSTAB_POLL_DIMENSION_PREFIX) :
+            ],
+            comment__poll_answers__deleted=False,
+        ).annotate(value=F("comment__poll_answers__option_id"))
+
+    counts = (
+        answers.values("option__poll_id", "option_id", "value")
+        .annotate(count=Count("comment", distinct=True))
+        .order_by("option__poll_id", "option_id", "value")
+    )
+    crosstab = {
+        "by": by,
+        "results": [
+            {
+                "poll": row["option__poll_id"],
+                "option": row["option_id"],
+                "value": row["value"],
+                "count": row["count"],
+            }
+            for row in counts
+        ],
+    }
+    cache.set(cache_key, crosstab, settings.POLL_CROSSTAB_CACHE_TIMEOUT)
+    return crosstab
@@ -5,10 +5,14 @@ from rest_framework.exceptions import ValidationError
 
 from democracy.models import Hearing, Project, ProjectPhase
 from democracy.pagination import DefaultLimitPagination
+from democracy.views.openapi import LANG_PARAM
 from democracy.views.utils import (
     NestedPKRelatedField,
     TranslatableSerializer,
     filter_by_hearing_visible,
+    get_translation_languages,
+    prefetch_translations,
+    translations_prefetch,
 )
 
 
@@ -177,7 +181,9 @@ class ProjectCreateUpdateSerializer(
         ]
         # existing phases missing from updated phases are to be deleted
         deleted_phases = set(existing_phases.values()) - set(updated_phases)
-        [phase.soft_delete() for phase in deleted_phases]
+        project.phases.filter(
+            pk__in=[phase.pk for phase in deleted_phases]
+        ).soft_delete()
         return project
 
     def _create_phase(self, phase_data, project):
@@ -200,6 +206,7 @@ class ProjectCreateUpdateSerializer(
             "Retrieve paginated list of all projects. "
             "Projects contain multiple phases, which can have associated hearings."
         ),
+        parameters=LANG_PARAM,
     ),
     retrieve=extend_schema(
         summary="Get project details",
@@ -207,6 +214,7 @@ class ProjectCreateUpdateSerializer(
             "Retrieve detailed information about a specific project, "
             "including all phases and associated hearings."
         ),
+        parameters=LANG_PARAM,
     ),
 )
 class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
@@ -219,11 +227,20 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
     """
 
     serializer_class = ProjectSerializer
-    queryset = Project.objects.prefetch_related(
-        "translations",
-        "phases",
-        "phases__translations",
-        Prefetch("phases__hearings", queryset=Hearing.objects.with_unpublished()),
-        "phases__hearings__translations",
-    )
+    queryset = Project.objects.all()
     pagination_class = DefaultLimitPagination
+
+    def get_queryset(self):
+        language_codes = get_translation_languages(self.request)
+        return prefetch_translations(
+            super().get_queryset(), language_codes
+        ).prefetch_related(
+            Prefetch(
+                "phases",
+                prefetch_translations(ProjectPhase.objects.all(), language_codes),
+            ),
+            Prefetch("phases__hearings", queryset=Hearing.objects.with_unpublished()),
+            translations_prefetch(
+                Hearing, language_codes, "phases__hearings__translations"
+            ),
+        )
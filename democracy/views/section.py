@@ -17,7 +17,8 @@ from drf_spectacular.utils import (
     extend_schema_view,
 )
 from easy_thumbnails.files import get_thumbnailer
-from rest_framework import permissions, serializers, viewsets
+from rest_framework import permissions, response, serializers, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import ParseError, PermissionDenied, ValidationError
 
 from audit_log.views import AuditLogApiView
@@ -33,17 +34,30 @@ from democracy.models import (
 )
 from democracy.pagination import DefaultLimitPagination
 from democracy.utils.drf_enum_field import EnumField
+from democracy.utils.registry import section_types
 from democracy.views.base import (
     AdminsSeeUnpublishedMixin,
     BaseFileSerializer,
     BaseImageSerializer,
+    CompiledListSerializerMixin,
+    SparseFieldsetMixin,
 )
+from democracy.views.openapi import (
+    LANG_PARAM,
+    POLL_CROSSTAB_PARAMS,
+    POLL_CROSSTAB_RESPONSE,
+    SPARSE_FIELDSET_PARAMS,
+)
+from democracy.views.poll_results import PollCrosstabQuerySerializer, get_poll_crosstab
 from democracy.views.utils import (
     Base64FileField,
     Base64ImageField,
+    RegistrySlugRelatedField,
     TranslatableSerializer,
     compare_serialized,
     filter_by_hearing_visible,
+    get_translation_languages,
+    translations_prefetch,
 )
 
 # Section-specific OpenAPI parameters
@@ -230,8 +244,7 @@ class SectionPollSerializer(serializers.ModelSerializer, TranslatableSerializer)
             serializer = option_data.pop("serializer")
             option = serializer.save(poll=poll, ordering=option_data["ordering"])
             new_option_ids.add(option.id)
-        for option in poll.options.exclude(id__in=new_option_ids):
-            option.soft_delete()
+        poll.options.exclude(id__in=new_option_ids).soft_delete()
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -301,8 +314,8 @@ class SectionCreateUpdateSerializer(
     """
 
     id = serializers.CharField(required=False)
-    type = serializers.SlugRelatedField(
-        slug_field="identifier", queryset=SectionType.objects.all()
+    type = RegistrySlugRelatedField(
+        section_types, slug_field="identifier", queryset=SectionType.objects.all()
     )
     commenting = EnumField(enum_type=Commenting)
     voting = EnumField(enum_type=Commenting)
@@ -443,8 +456,7 @@ class SectionCreateUpdateSerializer(
             image = serializer.save(section=section)
             new_image_ids.add(image.id)
 
-        for image in section.images.exclude(id__in=new_image_ids):
-            image.soft_delete()
+        section.images.exclude(id__in=new_image_ids).soft_delete()
 
         return section
 
@@ -456,8 +468,7 @@ class SectionCreateUpdateSerializer(
             file = serializer.save(section=section)
             new_file_ids.add(file.id)
 
-        for file in section.files.exclude(id__in=new_file_ids):
-            file.soft_delete()
+        section.files.exclude(id__in=new_file_ids).soft_delete()
 
         return section
 
@@ -507,8 +518,7 @@ class SectionCreateUpdateSerializer(
             serializer = poll_data.pop("serializer")
             poll = serializer.save(section=section, ordering=poll_data["ordering"])
             new_poll_ids.add(poll.id)
-        for poll in section.polls.exclude(id__in=new_poll_ids):
-            poll.soft_delete()
+        section.polls.exclude(id__in=new_poll_ids).soft_delete()
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -528,15 +538,22 @@ class SectionCreateUpdateSerializer(
             "Retrieve all sections belonging to a specific hearing. "
             "Sections contain the content structure of a hearing."
         ),
+        parameters=SPARSE_FIELDSET_PARAMS + LANG_PARAM,
     ),
     retrieve=extend_schema(
         summary="Get section details",
         description=(
             "Retrieve detailed information about a specific section within a hearing."
         ),
+        parameters=SPARSE_FIELDSET_PARAMS + LANG_PARAM,
     ),
 )
-class SectionViewSet(AdminsSeeUnpublishedMixin, viewsets.ReadOnlyModelViewSet):
+class SectionViewSet(
+    SparseFieldsetMixin,
+    CompiledListSerializerMixin,
+    AdminsSeeUnpublishedMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     """
     API endpoint for hearing sections.
 
@@ -553,39 +570,38 @@ class SectionViewSet(AdminsSeeUnpublishedMixin, viewsets.ReadOnlyModelViewSet):
         return Hearing.objects.get_by_id_or_slug(id_or_slug)
 
     def get_queryset(self):
-        queryset = (
-            super()
-            .get_queryset()
-            .filter(hearing=self.hearing)
-            .select_related("type")
-            .prefetch_related(
-                "translations",
-                Prefetch(
-                    "polls",
-                    SectionPoll.objects.prefetch_related(
-                        "translations",
-                        Prefetch(
-                            "options",
-                            SectionPollOption.objects.prefetch_related("translations"),
-                        ),
-                    ),
-                ),
-                Prefetch(
-                    "images",
-                    image_qs_for_request(self.request).prefetch_related("translations"),
-                ),
-                Prefetch(
-                    "files",
-                    file_qs_for_request(self.request).prefetch_related("translations"),
-                ),
-            )
-        )
+        queryset = super().get_queryset().filter(hearing=self.hearing)
+        if self.action != "poll_crosstab":
+            queryset = prefetch_requested_section_fields(self, queryset)
         if not self.hearing.closed:
             queryset = queryset.exclude(
                 type__identifier=InitialSectionType.CLOSURE_INFO
             )
         return queryset
 
+    @extend_schema(
+        summary="Cross-tabulate poll answers",
+        description=(
+            "Count the comments that answered each option of the polls of the "
+            "section, split by the answers to another poll of the section or by "
+            "a comment attribute. The counts may be POLL_CROSSTAB_CACHE_TIMEOUT "
+            "seconds old."
+        ),
+        parameters=POLL_CROSSTAB_PARAMS,
+        responses={200: POLL_CROSSTAB_RESPONSE},
+    )
+    @action(detail=True, methods=["get"], url_path="polls/crosstab")
+    def poll_crosstab(self, request, hearing_pk=None, pk=None):
+        section = self.get_object()
+        polls = section.polls.all()
+        params = PollCrosstabQuerySerializer(
+            data=request.query_params, context={"polls": polls}
+        )
+        params.is_valid(raise_exception=True)
+        return response.Response(
+            get_poll_crosstab("section:%s" % section.pk, polls, params.validated_data)
+        )
+
 
 class RootSectionImageSerializer(
     ThumbnailImageSerializer, SectionImageCreateUpdateSerializer
@@ -1031,6 +1047,58 @@ def file_qs_for_request(request):
     return SectionFile.objects.public()
 
 
+def prefetch_requested_section_fields(view, queryset):
+    """
+    Select and prefetch the related data of the section fields the view returns.
+
+    Translations are only fetched in the languages requested with `?lang=`.
+
+    :param view: view with `SparseFieldsetMixin`
+    """
+    is_requested = view.is_field_requested
+    language_codes = get_translation_languages(view.request)
+    if any(map(is_requested, ("type", "type_name_singular", "type_name_plural"))):
+        queryset = queryset.select_related("type")
+    if any(map(is_requested, Section._parler_meta.get_all_fields())):
+        queryset = queryset.prefetch_related(
+            translations_prefetch(Section, language_codes)
+        )
+    if is_requested("questions"):
+        queryset = queryset.prefetch_related(
+            Prefetch(
+                "polls",
+                SectionPoll.objects.prefetch_related(
+                    translations_prefetch(SectionPoll, language_codes),
+                    Prefetch(
+                        "options",
+                        SectionPollOption.objects.prefetch_related(
+                            translations_prefetch(SectionPollOption, language_codes)
+                        ),
+                    ),
+                ),
+            )
+        )
+    if is_requested("images"):
+        queryset = queryset.prefetch_related(
+            Prefetch(
+                "images",
+                image_qs_for_request(view.request).prefetch_related(
+                    translations_prefetch(SectionImage, language_codes)
+                ),
+            )
+        )
+    if is_requested("files"):
+        queryset = queryset.prefetch_related(
+            Prefetch(
+                "files",
+                file_qs_for_request(view.request).prefetch_related(
+                    translations_prefetch(SectionFile, language_codes)
+                ),
+            )
+        )
+    return queryset
+
+
 # root level Section endpoint
 @extend_schema_view(
     list=extend_schema(
@@ -1039,13 +1107,20 @@ def file_qs_for_request(request):
             "Retrieve paginated list of all sections across all hearings. "
             "Can be filtered by hearing or section type."
         ),
+        parameters=SPARSE_FIELDSET_PARAMS + LANG_PARAM,
     ),
     retrieve=extend_schema(
         summary="Get section details",
         description="Retrieve detailed information about a specific section.",
+        parameters=SPARSE_FIELDSET_PARAMS + LANG_PARAM,
     ),
 )
-class RootSectionViewSet(AdminsSeeUnpublishedMixin, viewsets.ReadOnlyModelViewSet):
+class RootSectionViewSet(
+    SparseFieldsetMixin,
+    CompiledListSerializerMixin,
+    AdminsSeeUnpublishedMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     """
     Root-level API endpoint for sections across all hearings.
 
@@ -1058,24 +1133,7 @@ class RootSectionViewSet(AdminsSeeUnpublishedMixin, viewsets.ReadOnlyModelViewSe
     filterset_class = SectionFilterSet
 
     def get_queryset(self):
-        queryset = (
-            super()
-            .get_queryset()
-            .select_related("type")
-            .prefetch_related(
-                "translations",
-                "polls__translations",
-                "polls__options__translations",
-                Prefetch(
-                    "images",
-                    image_qs_for_request(self.request).prefetch_related("translations"),
-                ),
-                Prefetch(
-                    "files",
-                    file_qs_for_request(self.request).prefetch_related("translations"),
-                ),
-            )
-        )
+        queryset = prefetch_requested_section_fields(self, super().get_queryset())
         queryset = filter_by_hearing_visible(queryset, self.request)
 
         n = now()
@@ -3,6 +3,8 @@ from urllib.parse import urljoin
 import django_filters
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
 from django.db.transaction import atomic
 from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
@@ -12,22 +14,34 @@ from drf_spectacular.utils import (
     extend_schema_view,
 )
 from rest_framework import filters, response, serializers, status
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.relations import PrimaryKeyRelatedField
 from rest_framework.serializers import as_serializer_error
 from rest_framework.settings import api_settings
 
+from audit_log.utils import add_audit_logged_object_ids
 from democracy.enums import Commenting
 from democracy.models import (
     Label,
     Section,
     SectionComment,
-    SectionPoll,
-    SectionPollAnswer,
-    SectionPollOption,
 )
 from democracy.models.section import CommentImage
 from democracy.pagination import DefaultLimitPagination
+from democracy.renderers import GeoJSONRenderer
+from democracy.utils.comment_threads import (
+    arrange_comment_threads,
+    filter_comment_threads,
+    flatten_comment_threads,
+)
+from democracy.utils.poll_answers import (
+    create_poll_answers,
+    get_answer_option_ids,
+    update_poll_answers,
+)
+from democracy.utils.registry import labels
+from democracy.views.base import BatchRequestSerializer, BatchRetrieveMixin
 from democracy.views.comment import (
     COMMENT_FIELDS,
     BaseCommentSerializer,
@@ -40,7 +54,13 @@ from democracy.views.comment_image import (
 from democracy.views.label import LabelSerializer
 from democracy.views.openapi import (
     AUTHORIZATION_CODE_PARAM,
+    COMMENT_CHANGES_PARAMS,
+    COMMENT_FILTER_PARAMS,
+    COMMENT_THREAD_PARAMS,
     COMMON_COMMENT_PARAMS,
+    SPARSE_FIELDSET_PARAMS,
+    batch_response,
+    changes_response,
 )
 from democracy.views.utils import (
     GeoJSONField,
@@ -58,6 +78,7 @@ class SectionCommentCreateUpdateSerializer(serializers.ModelSerializer):
 
     label = NestedPKRelatedField(
         queryset=Label.objects.all(),
+        registry=labels,
         serializer=LabelSerializer,
         required=False,
         allow_null=True,
@@ -225,6 +246,7 @@ class SectionCommentSerializer(BaseCommentSerializer):
             "comment",
             "comments",
             "n_comments",
+            "n_replies_total",
             "pinned",
             "reply_to",
             "creator_email",
@@ -314,7 +336,7 @@ class SectionCommentSerializer(BaseCommentSerializer):
         if settings.HEARING_REPORT_PUBLIC_AUTHOR_NAMES and user_is_staff:
             return data
         else:
-            del data["creator_email"]
+            data.pop("creator_email", None)
             return data
 
 
@@ -330,7 +352,7 @@ class SectionCommentSerializer(BaseCommentSerializer):
     retrieve=extend_schema(
         summary="Get comment details",
         description="Retrieve detailed information about a specific comment.",
-        parameters=AUTHORIZATION_CODE_PARAM,
+        parameters=AUTHORIZATION_CODE_PARAM + SPARSE_FIELDSET_PARAMS,
     ),
     create=extend_schema(
         summary="Create comment",
@@ -398,84 +420,71 @@ class SectionCommentViewSet(BaseCommentViewSet):
     )
     ordering_fields = ("created_at", "n_votes")
 
-    def _check_single_choice_poll(self, answer):
-        if (
-            len(answer["answers"]) > 1
-            and SectionPoll.objects.get(id=answer["question"]).type
-            == SectionPoll.TYPE_SINGLE_CHOICE
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get("threaded") != "true" or isinstance(
+            request.accepted_renderer, GeoJSONRenderer
         ):
+            # GeoJSON features can't be nested, so they are listed as usual
+            return super().list(request, *args, **kwargs)
+
+        roots = self.filter_queryset(self.get_queryset()).filter(comment__isnull=True)
+        page = self.paginate_queryset(roots)
+        if page is not None:
+            return self.get_paginated_response(self.get_threads(page))
+        return response.Response(self.get_threads(roots))
+
+    def get_threads(self, roots):
+        """
+        Serialize the threads of replies starting from the given comments.
+
+        The replies of each comment are nested in its `replies`, or with
+        `?flat=true` the comments of the threads are returned as a flat list in
+        thread order. Every comment has its `depth` in the thread.
+        """
+        params = self.request.query_params
+        max_depth = settings.COMMENT_THREAD_MAX_DEPTH
+        try:
+            depth = int(params.get("depth", max_depth))
+        except ValueError:
+            raise ValidationError({"depth": _("Depth must be an integer.")})
+        if not 0 <= depth <= max_depth:
             raise ValidationError(
-                {"answers": [_("A single choice poll may not have several answers.")]}
+                {"depth": _("Depth must be between 0 and %d.") % max_depth}
             )
 
-    def _check_can_vote(self, answer):
-        if not answer["answers"]:
-            return None
+        queryset = filter_comment_threads(
+            self.get_queryset(), roots, depth, settings.COMMENT_THREAD_MAX_COMMENTS
+        )
+        roots = arrange_comment_threads(list(queryset), [root.pk for root in roots])
+        comments = flatten_comment_threads(roots)
+        add_audit_logged_object_ids(self.request, comments)
+
+        serializer = self.get_serializer(many=True).child
+        if params.get("flat") == "true":
+            return [
+                dict(serializer.to_representation(comment), depth=comment.thread_depth)
+                for comment in comments
+            ]
+
+        def to_representation(comment):
+            data = serializer.to_representation(comment)
+            data["depth"] = comment.thread_depth
+            data["replies"] = [to_representation(c) for c in comment.thread_replies]
+            return data
 
-        # Authenticated users can only have one answer per poll.
-        if self.request.user.is_authenticated:
-            poll_answers = SectionPollAnswer.objects.filter(
-                option__poll=answer["question"], comment__created_by=self.request.user
-            )
-            if poll_answers:
-                raise ValidationError({"answers": [_("You have already voted.")]})
+        return [to_representation(root) for root in roots]
+
+    def get_answer_option_ids(self):
+        return get_answer_option_ids(self.request.data.get("answers", []))
 
     def create_related(self, request, instance=None):
         answers = request.data.pop("answers", [])
-        for answer in answers:
-            self._check_single_choice_poll(answer)
-            self._check_can_vote(answer)
-
-            for option_id in answer["answers"]:
-                try:
-                    option = SectionPollOption.objects.filter(
-                        poll=answer["question"]
-                    ).get(pk=option_id)
-                    SectionPollAnswer.objects.create(comment=instance, option=option)
-                except SectionPollOption.DoesNotExist:
-                    raise ValidationError(
-                        {
-                            "option": [
-                                _(
-                                    'Invalid id "{id}" - option does not exist in this poll.'  # noqa: E501
-                                ).format(id=option_id)
-                            ]
-                        }
-                    )
+        create_poll_answers(instance, answers, user=request.user)
         super().create_related(request, instance=instance)
 
     def update_related(self, request, instance=None):
         answers = request.data.pop("answers", [])
-        for answer in answers:
-            self._check_single_choice_poll(answer)
-
-            option_ids = []
-            for option_id in answer["answers"]:
-                try:
-                    option = SectionPollOption.objects.filter(
-                        poll=answer["question"]
-                    ).get(pk=option_id)
-                    option_ids.append(option.pk)
-                    if not SectionPollAnswer.objects.filter(
-                        comment=instance, option=option
-                    ).exists():
-                        SectionPollAnswer.objects.create(
-                            comment=instance, option=option
-                        )
-                except SectionPollOption.DoesNotExist:
-                    raise ValidationError(
-                        {
-                            "option": [
-                                _(
-                                    'Invalid id "{id}" - option does not exist in this poll.'  # noqa: E501
-                                ).format(id=option_id)
-                            ]
-                        }
-                    )
-            for section_poll_answer in SectionPollAnswer.objects.filter(
-                option__poll=answer["question"], comment=instance
-            ).exclude(option_id__in=option_ids):
-                section_poll_answer.soft_delete()
+        update_poll_answers(instance, answers)
         super().update_related(request, instance=instance)
 
     def get_comment_parent_id(self):
@@ -597,7 +606,7 @@ class RootSectionCommentSerializer(SectionCommentSerializer):
 
     def to_representation(self, instance):
         ret = super().to_representation(instance)
-        if self.context.get("remove_author_name"):
+        if self.context.get("remove_author_name") and "author_name" in ret:
             ret["author_name"] = None
         return ret
 
@@ -613,7 +622,16 @@ class RootSectionCommentCreateUpdateSerializer(SectionCommentCreateUpdateSeriali
         fields = SectionCommentCreateUpdateSerializer.Meta.fields + ["hearing"]
 
 
+class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    pass
+
+
 class CommentFilterSet(django_filters.rest_framework.FilterSet):
+    id__in = NumberInFilter(
+        field_name="id",
+        lookup_expr="in",
+        help_text="Filter by comment ID (comma-separated for multiple)",
+    )
     hearing = django_filters.CharFilter(
         field_name="section__hearing__id",
         help_text="Filter by hearing ID",
@@ -665,6 +683,30 @@ class CommentFilterSet(django_filters.rest_framework.FilterSet):
         return queryset.none()
 
 
+# the oldest transaction still running; every change made by the transactions
+# before it is committed or rolled back for good
+SNAPSHOT_XMIN_SQL = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+
+def format_changes_cursor(comment):
+    """
+    Return the cursor of the changes feed pointing right after the comment.
+
+    The cursor is the ID of the transaction that last changed the comment and
+    the ID of the comment, e.g. "7312_42".
+    """
+    return "%d_%d" % (comment.change_xid, comment.pk)
+
+
+def parse_changes_cursor(value):
+    """
+    :return: tuple of (transaction ID, comment ID)
+    :raises ValueError: if the cursor is not valid
+    """
+    xid, _sep, pk = value.partition("_")
+    return int(xid), int(pk)
+
+
 # root level SectionComment endpoint
 @extend_schema_view(
     list=extend_schema(
@@ -679,7 +721,20 @@ class CommentFilterSet(django_filters.rest_framework.FilterSet):
     retrieve=extend_schema(
         summary="Get comment details",
         description="Retrieve detailed information about a specific comment.",
-        parameters=AUTHORIZATION_CODE_PARAM,
+        parameters=AUTHORIZATION_CODE_PARAM + SPARSE_FIELDSET_PARAMS,
+    ),
+    batch=extend_schema(
+        summary="Get many comments by ID",
+        description=(
+            "Retrieve the comments with the given IDs in one request. "
+            "The comments are returned in the order of the IDs, and the IDs of "
+            "comments that do not exist or are not visible are listed in "
+            "'missing'. Author names are removed as in the unfiltered list. "
+            "At most BATCH_MAX_IDS IDs can be given."
+        ),
+        parameters=SPARSE_FIELDSET_PARAMS,
+        request=BatchRequestSerializer,
+        responses=batch_response("CommentBatchResponse", RootSectionCommentSerializer),
     ),
     create=extend_schema(
         summary="Create comment (root endpoint)",
@@ -730,7 +785,7 @@ class CommentFilterSet(django_filters.rest_framework.FilterSet):
         },
     ),
 )
-class CommentViewSet(SectionCommentViewSet):
+class CommentViewSet(BatchRetrieveMixin, SectionCommentViewSet):
     """
     Root-level API endpoint for comments across all hearings.
 
@@ -743,6 +798,9 @@ class CommentViewSet(SectionCommentViewSet):
     edit_serializer_class = RootSectionCommentCreateUpdateSerializer
     pagination_class = DefaultLimitPagination
     filterset_class = CommentFilterSet
+    sparse_fieldset_actions = SectionCommentViewSet.sparse_fieldset_actions + (
+        "changes",
+    )
 
     @property
     def _is_filtered(self):
@@ -762,7 +820,7 @@ class CommentViewSet(SectionCommentViewSet):
         context = super().get_serializer_context()
 
         if (
-            self.action == "list"
+            self.action in ("list", "batch", "changes")
             and not self._is_filtered
             and not bool(
                 hasattr(self.request.user, "get_default_organization")
@@ -772,6 +830,82 @@ class CommentViewSet(SectionCommentViewSet):
             context["remove_author_name"] = True
         return context
 
+    @extend_schema(
+        summary="Get comment thread",
+        description=(
+            "Retrieve a comment with its replies, their replies and so on. "
+            "The replies are nested in 'replies' or, with 'flat', returned as a "
+            "flat list in thread order, and every comment has its 'depth' in "
+            "the thread. At most COMMENT_THREAD_MAX_COMMENTS comments are "
+            "returned; compare 'n_comments' to the returned replies to find "
+            "the comments with more replies."
+        ),
+        parameters=COMMENT_THREAD_PARAMS,
+    )
+    @action(detail=True, methods=["get"])
+    def thread(self, request, pk=None):
+        threads = self.get_threads([self.get_object()])
+        if request.query_params.get("flat") == "true":
+            return response.Response(threads)
+        return response.Response(threads[0])
+
+    @extend_schema(
+        summary="List the changed comments",
+        description=(
+            "Retrieve the comments created, edited, voted, flagged, deleted or "
+            "restored after the 'since' cursor, the oldest change first. "
+            "Pass the returned 'cursor' as 'since' to get the next changes; "
+            "'more' tells whether there are more changes already. Deleted "
+            "comments are returned with 'deleted' set, and unpublished comments "
+            "are not returned, as in the comment list. Changes are returned once "
+            "all the transactions started before them have finished, so that "
+            "changes committed out of order are not skipped. Author names are "
+            "removed as in the unfiltered list."
+        ),
+        parameters=COMMENT_CHANGES_PARAMS
+        + COMMENT_FILTER_PARAMS
+        + SPARSE_FIELDSET_PARAMS,
+        responses=changes_response(
+            "CommentChangesResponse", RootSectionCommentSerializer
+        ),
+    )
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        since = request.query_params.get("since")
+        if since:
+            try:
+                xid, pk = parse_changes_cursor(since)
+            except (ValueError, OverflowError):
+                raise ValidationError({"since": ["Invalid cursor."]})
+        try:
+            limit = int(
+                request.query_params.get("limit", settings.COMMENT_CHANGES_LIMIT)
+            )
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+        limit = max(1, min(limit, settings.COMMENT_CHANGES_LIMIT))
+
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            change_xid__lt=RawSQL(SNAPSHOT_XMIN_SQL, [])
+        )
+        if since:
+            queryset = queryset.filter(
+                Q(change_xid__gt=xid) | Q(change_xid=xid, id__gt=pk)
+            )
+        comments = list(queryset.order_by("change_xid", "id")[: limit + 1])
+        more = len(comments) > limit
+        comments = comments[:limit]
+        add_audit_logged_object_ids(request, comments)
+
+        serializer = self.get_serializer(comments, many=True)
+        return response.Response(
+            {
+                "results": serializer.data,
+                "cursor": format_changes_cursor(comments[-1]) if comments else since,
+                "more": more,
+            }
+        )
+
     def get_queryset(self):
         """Returns all root-level comments, including deleted ones"""
 
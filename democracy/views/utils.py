@@ -1,51 +1,154 @@
 import base64
 import json
 from collections import OrderedDict
+from functools import cache
 from operator import attrgetter
 
 from django.conf import settings
 from django.contrib.gis.gdal.error import GDALException
-from django.contrib.gis.geos import GeometryCollection, GEOSGeometry
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
 from django.core.files.base import ContentFile
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from django.utils.crypto import get_random_string
+from django.utils.functional import cached_property
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from munigeo.api import build_bbox_filter, srid_to_srs
 from rest_framework import serializers
 from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.fields import SkipField
 from rest_framework.filters import BaseFilterBackend
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.relations import (
     MANY_RELATION_KWARGS,
     ManyRelatedField,
+    PKOnlyObject,
     PrimaryKeyRelatedField,
 )
 from rest_framework.utils import encoders
 
+from democracy.utils.geo import ValidatedGeoJSON, parse_geojson_geometry
+from democracy.utils.translations import is_translation_cached, load_translations
+
 
 def get_translation_list(obj, language_codes=None):
     """
     This method uses translation_list attribute created by Prefetch to obtain translations without database hit.
 
+    Without the attribute, prefetched or cached translations are used if available.
+
     :param obj: Any translated object that may have had Prefetch('translations', to_attr='translation_list') done
     :param language_codes: Iterable containing the languages to return
-    :return: QuerySet or list containing the desired translations, if not the default
+    :return: list containing the desired translations
     """  # noqa: E501
     if language_codes is None:
         language_codes = [lang["code"] for lang in settings.PARLER_LANGUAGES[None]]
-    prefetched_translations = getattr(obj, "translation_list", [])
-    filtered_prefetched = [
+    translations = getattr(obj, "translation_list", [])
+    if not translations:
+        load_translations([obj])
+        translations = obj.translations.all()
+    return [
         translation
-        for translation in prefetched_translations
+        for translation in translations
         if translation.language_code in language_codes
     ]
-    return (
-        filtered_prefetched
-        if prefetched_translations
-        else obj.translations.filter(language_code__in=language_codes)
+
+
+def get_translation_languages(request):
+    """
+    Return the languages requested with the `lang` query parameter.
+
+    `lang` is a comma separated list of language codes in order of preference,
+    e.g. `?lang=sv,fi` returns Swedish texts and falls back to Finnish ones.
+
+    :param request: DRF request or None
+    :return: list of language codes, or None if all languages are returned
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    value = request.GET.get("lang")
+    if not value:
+        return None
+    supported = [lang["code"] for lang in settings.PARLER_LANGUAGES[None]]
+    language_codes = []
+    for lang in value.split(","):
+        lang = lang.strip()
+        if lang not in supported:
+            raise ValidationError(
+                {
+                    "lang": _(
+                        "%(lang)s is not a supported language (%(allowed)s)"
+                        % {"lang": lang, "allowed": supported}
+                    )
+                }
+            )
+        if lang not in language_codes:
+            language_codes.append(lang)
+    return language_codes
+
+
+def get_include_list(request):
+    """
+    Return the names given in the `include` query parameter.
+
+    `include` is a comma separated list, e.g. `?include=geojson,user_state`.
+
+    :param request: DRF request or None
+    :return: set of the included names
+    """
+    if request is None:
+        return set()
+    value = request.GET.get("include") or ""
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def prefetch_translations(queryset, language_codes):
+    """
+    Prefetch the translations of the queryset's instances.
+
+    Models in the shared translation cache are left out, their translations are
+    read from the cache when the instances are serialized.
+
+    :param queryset: QuerySet of a translated model
+    :param language_codes: language codes, or None for all languages
+    """
+    if is_translation_cached(queryset.model):
+        return queryset
+    return queryset.prefetch_related(
+        translations_prefetch(queryset.model, language_codes)
     )
 
 
+def translations_prefetch(model, language_codes, lookup="translations", to_attr=None):
+    """
+    Prefetch the translations of `model` instances in the given languages.
+
+    :param model: the translated model at the end of the lookup
+    :param language_codes: language codes, or None for all languages
+    :param lookup: prefetch lookup of the translations
+    :param to_attr: optional attribute to prefetch the translations into
+    :rtype: Prefetch
+    """
+    queryset = model._parler_meta.root_model.objects.all()
+    if language_codes is not None:
+        queryset = queryset.filter(language_code__in=language_codes)
+    return Prefetch(lookup, queryset, to_attr=to_attr)
+
+
+def pick_translation(values, language_codes):
+    """
+    Pick the first non-empty value in the order of `language_codes`.
+
+    :param values: dict of values by language code
+    :param language_codes: language codes in order of preference
+    :return: dict with the picked value keyed by its language, or an empty dict
+    """
+    for lang in language_codes:
+        if values.get(lang):
+            return {lang: values[lang]}
+    return {}
+
+
 def compare_serialized(a, b):
     a = json.dumps(a, cls=encoders.JSONEncoder, sort_keys=True)
     b = json.dumps(b, cls=encoders.JSONEncoder, sort_keys=True)
@@ -108,6 +211,9 @@ class NestedPKRelatedField(PrimaryKeyRelatedField):
 
     The keyword argument 'expanded' defines whether the nested object is expanded or not.
     Default serializing is expanded=false.
+
+    The keyword argument 'registry' gives a ModelRegistry the related objects are
+    looked up from instead of the queryset.
     """  # noqa: E501
 
     invalid_format_error = _(
@@ -120,6 +226,7 @@ class NestedPKRelatedField(PrimaryKeyRelatedField):
     def __init__(self, *args, **kwargs):
         self.related_serializer = kwargs.pop("serializer", None)
         self.expanded = bool(kwargs.pop("expanded", False))
+        self.registry = kwargs.pop("registry", None)
         super(NestedPKRelatedField, self).__init__(*args, **kwargs)
 
     def use_pk_only_optimization(self):
@@ -149,16 +256,42 @@ class NestedPKRelatedField(PrimaryKeyRelatedField):
                 raise ValidationError(self.missing_id_error % {"data": value})
             return None
 
+        if self.registry is not None:
+            if isinstance(id, bool):
+                self.fail("incorrect_type", data_type=type(id).__name__)
+            try:
+                return self.registry.get(pk=id)
+            except ObjectDoesNotExist:
+                self.fail("does_not_exist", pk_value=id)
+            except (TypeError, ValueError):
+                self.fail("incorrect_type", data_type=type(id).__name__)
         return super().to_internal_value(id)
 
 
+class RegistrySlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField that looks the related objects up from a ModelRegistry.
+
+    The slug field must be one of the lookup fields of the registry.
+    """
+
+    def __init__(self, registry, **kwargs):
+        self.registry = registry
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            return self.registry.get(**{self.slug_field: data})
+        except ObjectDoesNotExist:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=str(data))
+        except (TypeError, ValueError):
+            self.fail("invalid")
+
+
 class GeoJSONField(serializers.JSONField):
     def to_internal_value(self, data):
         if not data:
             return None
-        geometry = data.get("geometry", None) or data
-        gc = GeometryCollection()
-
         if "type" not in data:
             raise ValidationError(
                 'Invalid geojson format. "type" field is required. Got %(data)s'
@@ -183,19 +316,14 @@ class GeoJSONField(serializers.JSONField):
             )
 
         try:
-            if data.get("features"):
-                for feature in data.get("features"):
-                    feature_geometry = feature.get("geometry")
-                    feature_geos = GEOSGeometry(json.dumps(feature_geometry))
-                    gc.append(feature_geos)
-
-            else:
-                GEOSGeometry(json.dumps(geometry))
-
+            geometry = parse_geojson_geometry(data)
         except GDALException:
             raise ValidationError("Invalid geojson format: %(data)s" % {"data": data})
 
-        return super(GeoJSONField, self).to_internal_value(data)
+        data = super(GeoJSONField, self).to_internal_value(data)
+        # carry the parsed geometry along so that the model does not need to
+        # parse the same data again on save
+        return ValidatedGeoJSON(data, geometry)
 
 
 class GeometryBboxFilterBackend(BaseFilterBackend):
@@ -270,69 +398,104 @@ class Base64FileField(serializers.FileField):
         raise ValidationError(_('Invalid content. Expected "data:application"'))
 
 
+@cache
+def get_translation_options(serializer_class):
+    """
+    Return the translated fields and languages of a TranslatableSerializer class.
+
+    Computed once per serializer class instead of for every serializer instance.
+
+    :return: tuple of the translated field names and the translation languages
+    """
+    meta = serializer_class.Meta
+    translated_fields = tuple(
+        field
+        for field in meta.model._parler_meta._fields_to_model
+        if field in meta.fields
+    )
+    translation_lang = getattr(meta, "translation_lang", None) or [
+        lang["code"] for lang in settings.PARLER_LANGUAGES[None]
+    ]
+    return translated_fields, tuple(translation_lang)
+
+
 class TranslatableSerializer(serializers.Serializer):
     """
     A serializer for translated fields.
 
-    translated_fields must be declared in the Meta class.
-    By default, translation languages obtained from settings, but can be overriden
-    by defining translation_lang in the Meta class.
+    The translated fields are the fields of Meta.fields that are translated in the
+    model. By default, translation languages obtained from settings, but can be
+    overriden by defining translation_lang in the Meta class.
 
     Translated fields may be provided either as JSON objects or stringified JSON objects. This means the
     serializer may be used for both JSON and multipart request formatting.
     """  # noqa: E501
 
-    def __init__(self, *args, **kwargs):
-        self.Meta.translated_fields = [
-            field
-            for field in self.Meta.model._parler_meta._fields_to_model
-            if field in self.Meta.fields
-        ]
-        non_translated_fields = [
-            field
-            for field in self.Meta.fields
-            if field not in self.Meta.translated_fields
-        ]
-        self.Meta.fields = non_translated_fields
-        super(TranslatableSerializer, self).__init__(*args, **kwargs)
-        self.Meta.fields = non_translated_fields + self.Meta.translated_fields
-        if not hasattr(self.Meta, "translation_lang"):
-            self.Meta.translation_lang = [
-                lang["code"] for lang in settings.PARLER_LANGUAGES[None]
-            ]
+    @property
+    def translated_fields(self):
+        return get_translation_options(type(self))[0]
+
+    @property
+    def translation_lang(self):
+        return get_translation_options(type(self))[1]
+
+    @property
+    def _readable_fields(self):
+        # translated fields are read from the translations in to_representation
+        translated_fields = self.translated_fields
+        for field in super()._readable_fields:
+            if field.field_name not in translated_fields:
+                yield field
 
     def _update_lang(self, ret, field, value, lang_code):
-        if not ret.get(field) or isinstance(ret[field], str):
-            ret[field] = {}
         if value:
             ret[field][lang_code] = value
         return ret
 
     def to_representation(self, instance):
         ret = super(TranslatableSerializer, self).to_representation(instance)
+        translated_fields = [
+            field for field in self.translated_fields if field in self.fields
+        ]
+        if not translated_fields:
+            # the translated fields have been left out, e.g. with `?fields=`
+            return ret
+
+        language_codes = self.translation_languages
+        # uses prefetched or cached translations when available
+        load_translations([instance])
         # enforce consistent order of translations in the API
-        if "translations" in (
-            cache := getattr(instance, "_prefetched_objects_cache", {})
-        ):
-            translations = [translation for translation in cache["translations"]]
-            translations.sort(key=attrgetter("language_code"))
+        translations = sorted(
+            instance.translations.all(), key=attrgetter("language_code")
+        )
 
-        else:
-            translations = instance.translations.filter(
-                language_code__in=self.Meta.translation_lang
-            ).order_by("language_code")
+        if language_codes is not None:
+            for field in translated_fields:
+                ret[field] = pick_translation(
+                    {
+                        translation.language_code: getattr(translation, field)
+                        for translation in translations
+                    },
+                    language_codes,
+                )
+            return ret
 
+        for field in translated_fields:
+            ret[field] = {}
         for translation in translations:
-            for field in self.Meta.translated_fields:
+            for field in translated_fields:
                 self._update_lang(
                     ret, field, getattr(translation, field), translation.language_code
                 )
         return ret
 
+    @cached_property
+    def translation_languages(self):
+        """Languages requested with `?lang=`, or None for all languages."""
+        return get_translation_languages(self.context.get("request"))
+
     def _validate_translated_field(self, field, data):
-        assert field in self.Meta.translated_fields, (
-            "%s is not a translated field" % field
-        )
+        assert field in self.translated_fields, "%s is not a translated field" % field
         if data is None:
             return
         if not isinstance(data, dict):
@@ -343,13 +506,13 @@ class TranslatableSerializer(serializers.Serializer):
                 )
             )
         for lang in data:
-            if lang not in self.Meta.translation_lang:
+            if lang not in self.translation_lang:
                 raise ValidationError(
                     _(
                         "%(lang)s is not a supported languages (%(allowed)s)"
                         % {
                             "lang": lang,
-                            "allowed": self.Meta.translation_lang,
+                            "allowed": list(self.translation_lang),
                         }
                     )
                 )
@@ -360,7 +523,7 @@ class TranslatableSerializer(serializers.Serializer):
         """
         validated_data = super().validate(data)
         errors = OrderedDict()
-        for field in self.Meta.translated_fields:
+        for field in self.translated_fields:
             try:
                 self._validate_translated_field(field, data.get(field, None))
             except ValidationError as e:
@@ -377,7 +540,7 @@ class TranslatableSerializer(serializers.Serializer):
         """
         ret = super(TranslatableSerializer, self).to_internal_value(value)
         errors = {}
-        for field in self.Meta.translated_fields:
+        for field in self.translated_fields:
             v = value.get(field)
             if v:
                 if isinstance(v, str):
@@ -412,7 +575,7 @@ class TranslatableSerializer(serializers.Serializer):
         if not self.instance:
             # forces the translation to be created, since the object cannot be saved
             # without
-            self.validated_data[self.Meta.translated_fields[0]] = ""
+            self.validated_data[self.translated_fields[0]] = ""
         instance = super(TranslatableSerializer, self).save(**kwargs)
         self.save_translations(instance, translated_data)
         instance.save()
@@ -423,7 +586,7 @@ class TranslatableSerializer(serializers.Serializer):
         Separate data of translated fields from other data.
         """
         translated_data = {}
-        for meta in self.Meta.translated_fields:
+        for meta in self.translated_fields:
             translations = self.validated_data.pop(meta, {})
             if translations:
                 translated_data[meta] = translations
@@ -433,10 +596,10 @@ class TranslatableSerializer(serializers.Serializer):
         """
         Save translation data into translation objects.
         """
-        for field in self.Meta.translated_fields:
+        for field in self.translated_fields:
             translations = {}
             if not self.partial:
-                translations = dict.fromkeys(self.Meta.translation_lang, "")
+                translations = dict.fromkeys(self.translation_lang, "")
             translations.update(translated_data.get(field, {}))
 
             for lang_code, value in translations.items():
@@ -445,3 +608,101 @@ class TranslatableSerializer(serializers.Serializer):
                 )
                 setattr(translation, field, value)
         instance.save_translations()
+
+
+def _model_field_getter(field, attname):
+    to_representation = field.to_representation
+
+    def get_value(instance):
+        value = getattr(instance, attname)
+        return None if value is None else to_representation(value)
+
+    return get_value
+
+
+def _field_getter(field):
+    def get_value(instance):
+        attribute = field.get_attribute(instance)
+        check_for_none = (
+            attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+        )
+        return None if check_for_none is None else field.to_representation(attribute)
+
+    return get_value
+
+
+class CompiledSerializerMixin(serializers.Serializer):
+    """
+    Serialize instances through field getters compiled on first use.
+
+    `Serializer.to_representation` resolves the source, callables and relations
+    of every field again for every instance. Here the readable fields are
+    compiled once per serializer: concrete model fields and primary key
+    relations are read straight from the instance, method fields call their
+    method directly and all other fields go through the regular field API.
+
+    The mixin must follow the serializer in the bases, so that it only replaces
+    `Serializer.to_representation` and the overrides of the serializer and its
+    parents keep wrapping it. Use `get_compiled_serializer_class` to create one.
+    """
+
+    @cached_property
+    def _compiled_fields(self):
+        return [
+            (field.field_name, self._compile_field(field))
+            for field in self._readable_fields
+        ]
+
+    def _compile_field(self, field):
+        if type(field) is serializers.SerializerMethodField:
+            return getattr(self, field.method_name)
+
+        model_field = self._get_source_model_field(field)
+        if model_field is not None and model_field.concrete:
+            if (
+                not model_field.is_relation
+                and type(field).get_attribute is serializers.Field.get_attribute
+            ):
+                return _model_field_getter(field, model_field.attname)
+            if (
+                model_field.many_to_one
+                and type(field) is PrimaryKeyRelatedField
+                and field.pk_field is None
+            ):
+                # the pk only representation is the value of the foreign key
+                return attrgetter(model_field.attname)
+
+        return _field_getter(field)
+
+    def _get_source_model_field(self, field):
+        model = getattr(getattr(self, "Meta", None), "model", None)
+        if model is None or len(field.source_attrs) != 1:
+            return None
+        try:
+            return model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+
+    def to_representation(self, instance):
+        ret = {}
+        for field_name, get_value in self._compiled_fields:
+            try:
+                ret[field_name] = get_value(instance)
+            except SkipField:
+                pass
+        return ret
+
+
+@cache
+def get_compiled_serializer_class(serializer_class):
+    """
+    Return a subclass of the serializer using CompiledSerializerMixin.
+
+    The output is the same as that of the serializer, but serializing many
+    instances with one serializer, e.g. a list, is faster.
+    """
+    return type(
+        "Compiled%s" % serializer_class.__name__,
+        (serializer_class, CompiledSerializerMixin),
+        {"__module__": serializer_class.__module__},
+    )
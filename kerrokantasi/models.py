@@ -29,7 +29,13 @@ class User(AbstractUser, SerializableMixin):
     def sectioncomments(self):
         return [
             s.serialize()
-            for s in SectionComment.objects.everything(created_by=self).iterator()
+            for s in SectionComment.objects.everything(created_by=self)
+            .prefetch_related(
+                "images",
+                "poll_answers__option__translations",
+                "poll_answers__option__poll__translations",
+            )
+            .iterator(chunk_size=500)
         ]
 
     def __str__(self):
@@ -30,6 +30,7 @@ env = environ.Env(
     ADMINS=(list, []),
     DATABASE_URL=(str, "postgis:///kerrokantasi"),
     DATABASE_PASSWORD=(str, ""),
+    CACHE_URL=(str, "locmem://"),
     TEST_DATABASE_URL=(str, ""),
     MEDIA_ROOT=(environ.Path(), root("media")),
     STATIC_ROOT=(environ.Path(), root("static")),
@@ -68,6 +69,23 @@ env = environ.Env(
     LOGOUT_REDIRECT_URL=(str, "/admin/"),
     HEARING_REPORT_PUBLIC_AUTHOR_NAMES=(bool, False),
     HEARING_REPORT_THEME=(str, "whitelabel"),
+    FAST_JSON_RENDERER=(bool, False),
+    COMPILED_READ_SERIALIZERS=(bool, False),
+    TRANSLATION_CACHE_MODELS=(list, []),
+    TRANSLATION_CACHE_TIMEOUT=(int, 60 * 60),
+    MODEL_REGISTRY_MAX_AGE=(int, 5 * 60),
+    HEARING_CARDS=(bool, False),
+    BATCH_MAX_IDS=(int, 100),
+    HEARING_INCLUDE_COMMENT_LIMIT=(int, 20),
+    COMMENT_THREAD_MAX_DEPTH=(int, 10),
+    COMMENT_THREAD_MAX_COMMENTS=(int, 500),
+    POLL_RESULTS_MAX_AGE=(int, 5),
+    POLL_CROSSTAB_CACHE_TIMEOUT=(int, 60),
+    LANGUAGE_DETECTION_EAGER=(bool, True),
+    COMMENT_DUPLICATE_WINDOW=(int, 0),
+    COMMENT_DUPLICATE_ACTION=(str, "reject"),
+    COMMENT_NEAR_DUPLICATE_THRESHOLD=(float, 0.6),
+    COMMENT_CHANGES_LIMIT=(int, 500),
     # GDPR API settings
     GDPR_API_QUERY_SCOPE=(str, "gdprquery"),
     GDPR_API_DELETE_SCOPE=(str, "gdprdelete"),
@@ -119,6 +137,10 @@ if env.db("TEST_DATABASE_URL"):
 if env("DATABASE_PASSWORD"):
     DATABASES["default"]["PASSWORD"] = env("DATABASE_PASSWORD")
 
+CACHES = {
+    "default": env.cache("CACHE_URL"),
+}
+
 MEDIA_ROOT = env("MEDIA_ROOT")
 MEDIA_URL = env("MEDIA_URL")
 
@@ -314,7 +336,11 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly"
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        (
+            "democracy.renderers.ORJSONRenderer"
+            if env("FAST_JSON_RENDERER")
+            else "rest_framework.renderers.JSONRenderer"
+        ),
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
     "DEFAULT_VERSION": "1",
@@ -434,6 +460,11 @@ PARLER_ENABLE_CACHING = False
 
 DETECT_LANGS_MIN_PROBA = 0.3
 
+# Detect the languages of comments when they are saved. When False, they are
+# left to the detect_comment_languages management command, which must then be
+# kept running with --loop
+LANGUAGE_DETECTION_EAGER = env("LANGUAGE_DETECTION_EAGER")
+
 FILTERS_NULL_CHOICE_LABEL = "null"
 
 HELUSERS_BACK_CHANNEL_LOGOUT_ENABLED = env("HELUSERS_BACK_CHANNEL_LOGOUT_ENABLED")
@@ -508,6 +539,60 @@ SITE_ID = 1
 HEARING_REPORT_PUBLIC_AUTHOR_NAMES = env("HEARING_REPORT_PUBLIC_AUTHOR_NAMES")
 HEARING_REPORT_THEME = env("HEARING_REPORT_THEME")
 
+COMPILED_READ_SERIALIZERS = env("COMPILED_READ_SERIALIZERS")
+
+# Translations of these models are kept in the cache instead of being fetched
+# from the database on every request
+TRANSLATION_CACHE_MODELS = env("TRANSLATION_CACHE_MODELS")
+TRANSLATION_CACHE_TIMEOUT = env("TRANSLATION_CACHE_TIMEOUT")
+TRANSLATION_CACHE_ALIAS = "default"
+
+# Section types, labels and organizations are served from in-process registries
+# (democracy.utils.registry), whose version is shared through the cache
+MODEL_REGISTRY_MAX_AGE = env("MODEL_REGISTRY_MAX_AGE")
+MODEL_REGISTRY_CACHE_ALIAS = "default"
+
+# Maintain the HearingCard read model and serve the hearing list from it. Run
+# the rebuild_hearing_cards management command after enabling
+HEARING_CARDS = env("HEARING_CARDS")
+
+# Maximum number of IDs the batch endpoints of hearings and comments resolve
+# in one request
+BATCH_MAX_IDS = env("BATCH_MAX_IDS")
+
+# Number of comments per section included in the hearing detail with
+# ?include=sections.comments
+HEARING_INCLUDE_COMMENT_LIMIT = env("HEARING_INCLUDE_COMMENT_LIMIT")
+
+# Limits of the comment threads returned by /v1/comment/{id}/thread/ and the
+# comment lists with ?threaded=true: the number of reply levels and the number
+# of comments in all the returned threads
+COMMENT_THREAD_MAX_DEPTH = env("COMMENT_THREAD_MAX_DEPTH")
+COMMENT_THREAD_MAX_COMMENTS = env("COMMENT_THREAD_MAX_COMMENTS")
+
+# Seconds the poll results of /v1/hearing/{id}/polls/results/ may be cached
+POLL_RESULTS_MAX_AGE = env("POLL_RESULTS_MAX_AGE")
+
+# Seconds the poll cross-tabulations of the polls/crosstab/ endpoints of
+# hearings and sections are kept in the cache
+POLL_CROSSTAB_CACHE_TIMEOUT = env("POLL_CROSSTAB_CACHE_TIMEOUT")
+POLL_CROSSTAB_CACHE_ALIAS = "default"
+
+# A new comment with the same content, location, answers and replied comment as
+# a comment the same registered user wrote in the same section in the last
+# COMMENT_DUPLICATE_WINDOW seconds is a duplicate, which is rejected ("reject")
+# or answered with the earlier comment ("merge") depending on
+# COMMENT_DUPLICATE_ACTION. 0 allows duplicates
+COMMENT_DUPLICATE_WINDOW = env("COMMENT_DUPLICATE_WINDOW")
+COMMENT_DUPLICATE_ACTION = env("COMMENT_DUPLICATE_ACTION")
+
+# Estimated share of common word shingles from which comments are grouped as
+# near duplicates by /v1/hearing/{id}/comments/clusters/
+COMMENT_NEAR_DUPLICATE_THRESHOLD = env("COMMENT_NEAR_DUPLICATE_THRESHOLD")
+
+# Maximum number of comments returned by /v1/comment/changes/ at once
+COMMENT_CHANGES_LIMIT = env("COMMENT_CHANGES_LIMIT")
+
 # GDPR API settings
 GDPR_API_MODEL = "kerrokantasi.User"
 GDPR_API_MODEL_LOOKUP = "uuid"
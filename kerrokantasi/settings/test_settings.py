@@ -10,6 +10,8 @@ OIDC_API_TOKEN_AUTH["REQUIRE_API_SCOPE_FOR_AUTHENTICATION"] = False
 
 TIME_ZONE = "UTC"
 
+LANGUAGE_DETECTION_EAGER = True
+
 AUDIT_LOG = {
     "ENABLED": False,
     "ORIGIN": "kerrokantasi",
@@ -4,6 +4,8 @@ import pytest
 import requests_mock
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -431,3 +433,31 @@ def test_request_is_not_found_thread_locals(user, api_client):
     assert response.status_code == status.HTTP_200_OK
 
     assert getattr(_thread_locals, "request", None) is None
+
+
+@pytest.mark.django_db
+def test_gdpr_query_count_does_not_grow_with_comments(user):
+    hearing = HearingFactory()
+    section = hearing.get_main_section()
+    poll = SectionPollFactory(section=section)
+    hearing.followers.add(user)
+
+    def add_comment():
+        comment = SectionCommentFactory(section=section, created_by=user)
+        SectionPollAnswer.objects.create(
+            comment=comment, created_by=user, option=poll.options.first()
+        )
+        CommentImageFactory(comment=comment, created_by=user)
+
+    add_comment()
+    with CaptureQueriesContext(connection) as one_comment_queries:
+        assert do_query(user, user.uuid).status_code == status.HTTP_200_OK
+
+    for _ in range(5):
+        add_comment()
+    with CaptureQueriesContext(connection) as many_comments_queries:
+        response = do_query(user, user.uuid)
+
+    assert response.status_code == status.HTTP_200_OK
+    _assert_user_data_in_response(response, user)
+    assert len(many_comments_queries) == len(one_comment_queries)